@@ -1,73 +1,117 @@
 from domain.repositorio.product_repo import ProductRepository
 from Infrastructure.cassandra_db import CassandraDB
 from domain.entidades.product_model import Product
+from domain.entidades.product_page import ProductPage
+from Infrastructure.product_cache import ProductCache
+from Infrastructure.product_index import CatalogIndex
+from Infrastructure.search_index import decode_search_token, encode_search_token, search_catalog_from_env
+from observability.tracing import traced
+import logging
+
+logger = logging.getLogger(__name__)
 
 class AdapterProductRepo(ProductRepository):
-    def __init__(self):
+    def __init__(self, cache: ProductCache = None):
         self.database = CassandraDB()
+        self.cache = cache if cache is not None else ProductCache.from_env()
+        # Índice en proceso del catálogo activo para los listados filtrados (se carga en el primer uso)
+        self.catalog_index = CatalogIndex.from_env(self.database.iter_active_products)
+        # Índice de búsqueda por texto (BM25), opcionalmente persistido en SEARCH_INDEX_PATH
+        self.search_index = search_catalog_from_env(self.database.iter_active_products)
 
-    def add_product(self, product: Product):
-        self.database.add_product(product)
+    @traced()
+    def add_product(self, product: Product, trusted_id: bool = False):
+        self.database.add_product(product, trusted_id=trusted_id)
+        self._invalidate(product.productId)
+        self._index_added(product)
         return product
 
+    @traced()
+    def add_products(self, products, trusted_ids):
+        errors = self.database.add_products(products, trusted_ids)
+        for product, error in zip(products, errors):
+            if error is None:
+                self._invalidate(product.productId)
+                self._index_added(product)
+        return errors
+
+    @traced()
     def get_product_by_id(self, product_id: str):
-        data = self.database.get_product_by_id(product_id)
-        if data and "inStock" in data:
-            del data["inStock"]
-        try:
-            return Product(**data) if data else None
-        except Exception as e:
-            return None
+        if self.cache is not None:
+            return self.cache.get_or_load(product_id, self._load_product)
+        return self._load_product(product_id)
 
+    def _load_product(self, product_id: str):
+        # La base de datos devuelve entidades Product (filas inválidas ya descartadas)
+        return self.database.get_product_by_id(product_id)
+
+    @traced()
     def get_all_products(self):
-        import math
-        import logging
-        logger = logging.getLogger(__name__)
-        def clean(prod):
-            prod = dict(prod)
-            prod.pop("inStock", None)
-            for k, v in prod.items():
-                if isinstance(v, float) and math.isnan(v):
-                    prod[k] = None
-                if v == "NaT":
-                    prod[k] = None
-            return prod
-
-        cleaned_products = []
-        for prod in self.database.get_all_products():
-            try:
-                cleaned = clean(prod)
-                logger.debug(f"Attempting to create Product with: {cleaned}")
-                p = Product(**cleaned)
-                cleaned_products.append(p)
-            except Exception as e:
-                logger.error(f"Skipping product due to error: {e}. Data: {cleaned}")
-                continue
-        logger.info(f"Total products returned: {len(cleaned_products)}")
-        return cleaned_products
-    
+        products = self.database.get_all_products()
+        logger.info(f"Total products returned: {len(products)}")
+        return products
+
+    @traced()
     def get_products_by_user_id(self, user_id: str):
-        import math
-        def clean(prod):
-            prod = dict(prod)
-            prod.pop("inStock", None)
-            for k, v in prod.items():
-                if isinstance(v, float) and math.isnan(v):
-                    prod[k] = None
-                if v == "NaT":
-                    prod[k] = None
-            return prod
-
-        cleaned_products = []
-        for prod in self.database.get_products_by_user_id(user_id):
-            try:
-                cleaned = clean(prod)
-                p = Product(**cleaned)
-                cleaned_products.append(p)
-            except Exception as e:
-                # Skip invalid products and continue processing
-                continue
-        return cleaned_products
-    
+        return self.database.get_products_by_user_id(user_id)
+
+    @traced()
+    def get_all_products_page(self, limit: int, page_token=None):
+        products, next_token = self.database.get_all_products_page(limit, page_token)
+        return ProductPage(items=products, nextPageToken=next_token)
+
+    @traced()
+    def get_products_by_user_id_page(self, user_id: str, limit: int, page_token=None):
+        products, next_token = self.database.get_products_by_user_id_page(user_id, limit, page_token)
+        return ProductPage(items=products, nextPageToken=next_token)
+
+    @traced()
+    def find_products(self, query, limit=None, page_token=None):
+        products, next_token = self.catalog_index.get().query(query, limit, page_token)
+        return ProductPage(items=products, nextPageToken=next_token)
+
+    @traced()
+    def search_products(self, text, query=None, limit=20, page_token=None):
+        offset = decode_search_token(page_token) if page_token else 0
+        products, more = self.search_index.get().search(text, query, limit, offset)
+        return ProductPage(items=products, nextPageToken=encode_search_token(offset + limit) if more else None)
+
+    @traced()
+    def iter_all_products(self):
+        yield from self.database.iter_active_products()
+
+    @traced()
+    def update_product(self, product_id: str):
+        updated = self.database.update_product(product_id)
+        self._invalidate(product_id)
+        self._apply_to_indexes(lambda index: index.remove(product_id))
+        return updated
+
+    @traced()
     def update_image_url(self, product_id, image_url):
-        self.database.update_image_url(product_id, image_url)
\ No newline at end of file
+        self.database.update_image_url(product_id, image_url)
+        self._invalidate(product_id)
+        self._apply_to_indexes(lambda index: index.replace(product_id, imageUrl=image_url))
+
+    @traced()
+    def update_image_variants(self, product_id, variants):
+        self.database.update_image_variants(product_id, variants)
+        self._invalidate(product_id)
+        self._apply_to_indexes(lambda index: index.replace(product_id, imageVariants=dict(variants)))
+
+    def close(self):
+        if self.cache is not None:
+            self.cache.close()
+        self.database.disconnect()
+
+    def _index_added(self, product: Product):
+        if product.isActive:
+            self._apply_to_indexes(lambda index: index.add(product))
+
+    def _apply_to_indexes(self, change):
+        self.catalog_index.apply(change)
+        self.search_index.apply(change)
+
+    def _invalidate(self, product_id: str):
+        if self.cache is not None:
+            self.cache.invalidate(product_id)
@@ -0,0 +1,162 @@
+"""
+Async Cassandra Reads (Infrastructure Layer)
+asyncio bridge over the driver's execute_async ResponseFutures, used by the
+ASGI serving mode. The driver already runs requests on its own I/O thread;
+aexecute only hands each result back to the event loop, so one process can
+keep many queries in flight without blocking a thread per request.
+
+Writes are not duplicated here: the async routes run the synchronous write
+path (batches, LWT, image storage) in a worker thread.
+"""
+
+import asyncio
+import logging
+from typing import List, Optional, Sequence, Tuple
+
+from cassandra import InvalidRequest
+from cassandra.protocol import ProtocolException
+
+from domain.entidades.product_model import Product
+from Infrastructure.cassandra_db import CassandraDB, decode_page_token, encode_page_token
+from Infrastructure.cassandra_profiles import BULK_SCAN_PROFILE, POINT_READ_PROFILE
+from Infrastructure.cassandra_rows import PRODUCT_PROFILE
+
+logger = logging.getLogger(__name__)
+
+
+def _resolve(future: asyncio.Future, value) -> None:
+    if not future.done():  # the awaiting request may have been cancelled
+        future.set_result(value)
+
+
+def _reject(future: asyncio.Future, exc: BaseException) -> None:
+    if not future.done():
+        future.set_exception(exc)
+
+
+def aexecute(session, statement, params: Optional[Sequence] = None,
+             execution_profile=PRODUCT_PROFILE, paging_state: Optional[bytes] = None,
+             all_pages: bool = True) -> "asyncio.Future[Tuple[list, Optional[bytes]]]":
+    """
+    Runs statement with session.execute_async and returns an asyncio future
+    resolving to (rows, paging_state).
+
+    With all_pages=True every page is fetched (following has_more_pages);
+    otherwise only the first page and its paging_state are returned.
+    """
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+    response = session.execute_async(
+        statement, params, execution_profile=execution_profile, paging_state=paging_state
+    )
+    rows: list = []
+
+    def on_page(page):
+        # Runs on the driver's I/O thread; any failure here must still settle the future
+        try:
+            rows.extend(page)
+            if all_pages and response.has_more_pages:
+                response.start_fetching_next_page()
+            else:
+                # The page has settled, so result() returns its ResultSet without blocking
+                next_state = response.result().paging_state
+                loop.call_soon_threadsafe(_resolve, future, (rows, next_state))
+        except Exception as exc:
+            loop.call_soon_threadsafe(_reject, future, exc)
+
+    def on_error(exc):
+        loop.call_soon_threadsafe(_reject, future, exc)
+
+    response.add_callbacks(on_page, on_error)
+    return future
+
+
+class AsyncCassandraDB:
+    """
+    Coroutine versions of the CassandraDB product reads.
+
+    Features:
+    - Shares the CassandraDB session and prepared statements
+    - Catalog shards queried concurrently with asyncio.gather
+    - Same page tokens and error contract as the sync methods
+    """
+
+    def __init__(self, database: CassandraDB):
+        self.database = database
+
+    @property
+    def session(self):
+        return self.database.session
+
+    def _prepared(self, name: str):
+        return self.database.connection.prepared(name)
+
+    async def get_product_by_id(self, product_id: str) -> Optional[Product]:
+        try:
+            rows, _ = await aexecute(self.session, self._prepared("select_product_by_id"), [product_id],
+                                     execution_profile=POINT_READ_PROFILE, all_pages=False)
+            return rows[0] if rows else None
+        except Exception as e:
+            logger.error(f"Failed to get product {product_id}: {str(e)}")
+            raise Exception(f"Database error while retrieving product: {str(e)}")
+
+    async def get_all_products(self) -> List[Product]:
+        try:
+            statement = self._prepared("select_active_products")
+            results = await asyncio.gather(*(
+                aexecute(self.session, statement, [shard], execution_profile=BULK_SCAN_PROFILE)
+                for shard in range(self.database.connection.catalog_shards)
+            ))
+            return [product for rows, _ in results for product in rows]
+        except Exception as e:
+            logger.error(f"Failed to get all products: {str(e)}")
+            raise Exception(f"Database error while retrieving products: {str(e)}")
+
+    async def get_products_by_user_id(self, user_id: str) -> List[Product]:
+        try:
+            rows, _ = await aexecute(self.session, self._prepared("select_products_by_user"), [user_id])
+            return rows
+        except Exception as e:
+            logger.error(f"Failed to get products for user {user_id}: {str(e)}")
+            raise Exception(f"Database error while retrieving user's products: {str(e)}")
+
+    async def get_all_products_page(self, limit: int, page_token: Optional[str] = None) -> Tuple[List[Product], Optional[str]]:
+        """Async CassandraDB.get_all_products_page (shards walked in order)"""
+        shard, paging_state = decode_page_token(page_token) if page_token else (0, None)
+        shards = self.database.connection.catalog_shards
+        if shard >= shards:
+            raise ValueError("page_token inválido")
+        try:
+            statement = self._prepared("select_active_products")
+            products = []
+            while shard < shards and len(products) < limit:
+                bound = statement.bind([shard])
+                bound.fetch_size = limit - len(products)
+                rows, paging_state = await aexecute(self.session, bound, paging_state=paging_state, all_pages=False)
+                products.extend(rows)
+                if not paging_state:
+                    shard += 1
+            next_token = encode_page_token(shard, paging_state) if shard < shards else None
+            return products, next_token
+        except (InvalidRequest, ProtocolException) as e:
+            logger.warning(f"Rejected page token for active products: {str(e)}")
+            raise ValueError("page_token inválido")
+        except Exception as e:
+            logger.error(f"Failed to get products page: {str(e)}")
+            raise Exception(f"Database error while retrieving products: {str(e)}")
+
+    async def get_products_by_user_id_page(self, user_id: str, limit: int, page_token: Optional[str] = None) -> Tuple[List[Product], Optional[str]]:
+        """Async CassandraDB.get_products_by_user_id_page"""
+        _, paging_state = decode_page_token(page_token) if page_token else (0, None)
+        try:
+            bound = self._prepared("select_products_by_user").bind([user_id])
+            bound.fetch_size = limit
+            rows, paging_state = await aexecute(self.session, bound, paging_state=paging_state, all_pages=False)
+            next_token = encode_page_token(0, paging_state) if paging_state else None
+            return rows, next_token
+        except (InvalidRequest, ProtocolException) as e:
+            logger.warning(f"Rejected page token for user {user_id}: {str(e)}")
+            raise ValueError("page_token inválido")
+        except Exception as e:
+            logger.error(f"Failed to get products page for user {user_id}: {str(e)}")
+            raise Exception(f"Database error while retrieving user's products: {str(e)}")
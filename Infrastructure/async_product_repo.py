@@ -0,0 +1,66 @@
+"""
+Async Product Repository (Infrastructure Layer)
+Read side of AdapterProductRepo as coroutines for the ASGI serving mode.
+Point lookups go through the same ProductCache, so both serving modes share
+cache entries and invalidations.
+"""
+
+import asyncio
+from typing import AsyncIterator
+
+from domain.entidades.product_model import Product
+from domain.entidades.product_page import ProductPage
+from Infrastructure.adapterProductRepo import AdapterProductRepo
+from Infrastructure.async_cassandra_db import AsyncCassandraDB
+from observability.tracing import traced
+
+
+class AsyncAdapterProductRepo:
+    """
+    Async reads on top of an AdapterProductRepo (whose write methods stay synchronous).
+    """
+
+    def __init__(self, repo: AdapterProductRepo):
+        self.repo = repo
+        self.cache = repo.cache
+        self.database = AsyncCassandraDB(repo.database)
+
+    @traced()
+    async def get_product_by_id(self, product_id: str):
+        if self.cache is not None:
+            return await self.cache.aget_or_load(product_id, self.database.get_product_by_id)
+        return await self.database.get_product_by_id(product_id)
+
+    @traced()
+    async def get_all_products(self):
+        return await self.database.get_all_products()
+
+    @traced()
+    async def get_products_by_user_id(self, user_id: str):
+        return await self.database.get_products_by_user_id(user_id)
+
+    @traced()
+    async def get_all_products_page(self, limit: int, page_token=None) -> ProductPage:
+        products, next_token = await self.database.get_all_products_page(limit, page_token)
+        return ProductPage(items=products, nextPageToken=next_token)
+
+    @traced()
+    async def get_products_by_user_id_page(self, user_id: str, limit: int, page_token=None) -> ProductPage:
+        products, next_token = await self.database.get_products_by_user_id_page(user_id, limit, page_token)
+        return ProductPage(items=products, nextPageToken=next_token)
+
+    @traced()
+    async def find_products(self, query, limit=None, page_token=None) -> ProductPage:
+        # The first call loads the catalog index (blocking), so keep it off the event loop
+        return await asyncio.to_thread(self.repo.find_products, query, limit, page_token)
+
+    @traced()
+    async def iter_all_products(self, page_size: int = 500) -> AsyncIterator[Product]:
+        """Streams the active catalog page by page (memory bounded by page_size)"""
+        page_token = None
+        while True:
+            products, page_token = await self.database.get_all_products_page(page_size, page_token)
+            for product in products:
+                yield product
+            if page_token is None:
+                break
@@ -0,0 +1,51 @@
+"""
+Backfill of the query-specific product tables (Infrastructure Layer)
+Copies existing active products into products_by_user and active_products_by_shard
+so the read paths no longer need the ALLOW FILTERING scans over secondary indexes.
+
+Usage:
+    python -m Infrastructure.backfill_query_tables [--page-size 500] [--concurrency 32] [--drop-indexes]
+"""
+
+import argparse
+import logging
+
+from Infrastructure.cassandra_db import CassandraDB
+
+logger = logging.getLogger(__name__)
+
+# Secondary indexes created by previous versions of the schema
+LEGACY_INDEXES = ("products_active_idx", "products_user_id_idx")
+
+
+def drop_legacy_indexes(database: CassandraDB) -> None:
+    """
+    Drops the low-cardinality secondary indexes that served the old
+    ALLOW FILTERING queries. Only run once every worker reads from the query tables.
+    """
+    for index_name in LEGACY_INDEXES:
+        database.session.execute(f"DROP INDEX IF EXISTS {index_name}")
+        logger.info(f"Dropped index {index_name}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backfill products_by_user and active_products_by_shard")
+    parser.add_argument("--page-size", type=int, default=500, help="Rows fetched per page from products")
+    parser.add_argument("--concurrency", type=int, default=32, help="Maximum in-flight write batches")
+    parser.add_argument("--drop-indexes", action="store_true", help="Drop legacy secondary indexes after the backfill")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    database = CassandraDB()
+    try:
+        copied = database.backfill_query_tables(page_size=args.page_size, concurrency=args.concurrency)
+        print(f"✅ {copied} productos activos copiados a las tablas de consulta")
+        if args.drop_indexes:
+            drop_legacy_indexes(database)
+            print("🧹 Índices secundarios antiguos eliminados")
+    finally:
+        database.disconnect()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,351 @@
+"""
+Cache Backends (Infrastructure Layer)
+Storage backends for ProductCache. The in-memory backend keeps entries inside
+the worker process; the Redis backend shares them between every gunicorn worker
+and pod and broadcasts invalidations over pub/sub so all near caches drop
+stale entries after a write in any worker.
+
+An in-process fake of the Redis backend is included so the shared behaviour
+(multi-worker hits and cross-worker invalidation) can be tested without a server.
+"""
+
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+INVALIDATION_CHANNEL = "productos:cache:invalidate"
+
+
+class LRUTTLCache:
+    """
+    Thread-safe mapping with a maximum size and per-entry expiry.
+
+    Features:
+    - Least recently used entry is evicted when max_entries is reached
+    - Expired entries are dropped lazily on access
+    - Injectable clock for deterministic tests
+    """
+
+    def __init__(self, max_entries: int, ttl: float, clock: Callable[[], float] = time.monotonic,
+                 on_evict: Optional[Callable[[], None]] = None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._clock = clock
+        self._on_evict = on_evict
+        self._data: "OrderedDict[Any, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key) -> Tuple[bool, Any]:
+        """
+        Returns (found, value). Expired entries count as not found.
+        """
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return False, None
+            expires_at, value = entry
+            if expires_at <= self._clock():
+                del self._data[key]
+                return False, None
+            self._data.move_to_end(key)
+            return True, value
+
+    def set(self, key, value, ttl: Optional[float] = None) -> None:
+        """Stores value for ttl seconds (defaults to the cache TTL)"""
+        expires_at = self._clock() + (self.ttl if ttl is None else ttl)
+        evicted = 0
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                evicted += 1
+        if evicted and self._on_evict:
+            for _ in range(evicted):
+                self._on_evict()
+
+    def delete(self, key) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class CacheBackend(ABC):
+    """
+    Key-value storage used by ProductCache.
+
+    shared = True means values leave the process, so ProductCache stores them
+    serialized (bytes) and keeps a short-lived local near cache in front.
+    """
+
+    shared = False
+    # False while invalidations from other workers may be missed (near caches are bypassed)
+    subscribed = True
+
+    @abstractmethod
+    def get(self, key: str) -> Tuple[bool, Any]:
+        pass
+
+    @abstractmethod
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        pass
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        pass
+
+    def publish_invalidation(self, key: str) -> None:
+        """Notifies every other worker that key changed (no-op for local backends)"""
+
+    def subscribe_invalidations(self, callback: Callable[[str], None]) -> None:
+        """Registers callback(key) for invalidations published by any worker"""
+
+    def clear(self) -> None:
+        """Drops every entry (test cleanup)"""
+
+    def close(self) -> None:
+        """Releases connections and background threads"""
+
+
+class InMemoryCacheBackend(CacheBackend):
+    """Per-process LRU/TTL storage; the default backend"""
+
+    shared = False
+
+    def __init__(self, max_entries: int, ttl: float, clock: Callable[[], float] = time.monotonic,
+                 on_evict: Optional[Callable[[], None]] = None):
+        self._entries = LRUTTLCache(max_entries, ttl, clock=clock, on_evict=on_evict)
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        return self._entries.get(key)
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        self._entries.set(key, value, ttl=ttl)
+
+    def delete(self, key: str) -> None:
+        self._entries.delete(key)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Shared backend for any server speaking the Redis protocol (Redis, Valkey, KeyDB...).
+    Requires the optional redis package (pip install redis).
+
+    Every operation treats an outage as a cache miss, including startup: the
+    pub/sub subscription is made by a background thread that retries with
+    backoff until the server is reachable, so the service starts without Redis.
+    """
+
+    shared = True
+
+    def __init__(self, url: str, key_prefix: str = "productos:product:",
+                 channel: str = INVALIDATION_CHANNEL, socket_timeout: float = 0.25,
+                 retry_delay: float = 1.0, max_retry_delay: float = 30.0):
+        try:
+            import redis
+        except ImportError:
+            raise ImportError("PRODUCT_CACHE_BACKEND=redis requires the redis package: pip install redis")
+        self._client = redis.Redis.from_url(
+            url, socket_timeout=socket_timeout, socket_connect_timeout=socket_timeout
+        )
+        # Pub/sub blocks on reads, so it gets its own connection without a read timeout
+        self._pubsub_client = redis.Redis.from_url(url, socket_connect_timeout=socket_timeout)
+        self._prefix = key_prefix
+        self._channel = channel
+        self._pubsub = None
+        self._listener = None
+        self._callbacks: List[Callable[[str], None]] = []
+        self._retry_delay = retry_delay
+        self._max_retry_delay = max_retry_delay
+        self._subscriber = None
+        self._closed = threading.Event()
+        self._subscribe_lock = threading.Lock()
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        try:
+            value = self._client.get(self._prefix + key)
+        except Exception as e:
+            # A cache outage must not take the read path down: behave as a miss
+            logger.warning(f"Redis cache get failed: {str(e)}")
+            return False, None
+        return (value is not None), value
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        try:
+            self._client.set(self._prefix + key, value, px=max(1, int(ttl * 1000)))
+        except Exception as e:
+            logger.warning(f"Redis cache set failed: {str(e)}")
+
+    def delete(self, key: str) -> None:
+        try:
+            self._client.delete(self._prefix + key)
+        except Exception as e:
+            logger.warning(f"Redis cache delete failed: {str(e)}")
+
+    def publish_invalidation(self, key: str) -> None:
+        try:
+            self._client.publish(self._channel, key)
+        except Exception as e:
+            logger.warning(f"Redis invalidation publish failed: {str(e)}")
+
+    def subscribe_invalidations(self, callback: Callable[[str], None]) -> None:
+        """Registers callback and subscribes in the background (retried while Redis is down)"""
+        self._callbacks.append(callback)
+        with self._subscribe_lock:
+            if self._subscriber is None and not self._closed.is_set():
+                self._subscriber = threading.Thread(
+                    target=self._subscribe_until_connected, name="redis-cache-subscriber", daemon=True
+                )
+                self._subscriber.start()
+
+    @property
+    def subscribed(self) -> bool:
+        return self._listener is not None
+
+    def _subscribe_until_connected(self) -> None:
+        delay = self._retry_delay
+        while not self._closed.is_set():
+            try:
+                pubsub = self._pubsub_client.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(**{self._channel: self._dispatch})
+            except Exception as e:
+                logger.warning(f"Redis invalidation subscribe failed, retrying in {delay:.0f}s: {str(e)}")
+                self._closed.wait(delay)
+                delay = min(delay * 2, self._max_retry_delay)
+                continue
+            with self._subscribe_lock:
+                if self._closed.is_set():
+                    pubsub.close()
+                    return
+                self._pubsub = pubsub
+                self._listener = pubsub.run_in_thread(
+                    sleep_time=0.5, daemon=True, exception_handler=self._on_listener_error
+                )
+            logger.info("Redis invalidation listener subscribed")
+            return
+
+    def clear(self) -> None:
+        try:
+            keys = list(self._client.scan_iter(match=self._prefix + "*", count=500))
+            if keys:
+                self._client.delete(*keys)
+        except Exception as e:
+            logger.warning(f"Redis cache clear failed: {str(e)}")
+
+    def close(self) -> None:
+        with self._subscribe_lock:
+            self._closed.set()
+            if self._listener is not None:
+                self._listener.stop()
+                self._listener = None
+            if self._pubsub is not None:
+                self._pubsub.close()
+        self._pubsub_client.close()
+        self._client.close()
+
+    def _dispatch(self, message) -> None:
+        key = message["data"]
+        if isinstance(key, bytes):
+            key = key.decode("utf-8")
+        for callback in self._callbacks:
+            callback(key)
+
+    @staticmethod
+    def _on_listener_error(error, pubsub, thread) -> None:
+        logger.warning(f"Redis invalidation listener error: {str(error)}")
+
+
+class FakeRedisServer:
+    """
+    In-process stand-in for a Redis server: string keys with expiry plus pub/sub channels.
+    Share one instance between several FakeRedisCacheBackend objects to simulate workers.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self._clock = clock
+        self._data: Dict[str, Tuple[float, Any]] = {}
+        self._subscribers: Dict[str, List[Callable[[str], None]]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= self._clock():
+                del self._data[key]
+                return None
+            return value
+
+    def set(self, key: str, value, ttl: float) -> None:
+        with self._lock:
+            self._data[key] = (self._clock() + ttl, value)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self, prefix: str) -> None:
+        with self._lock:
+            for key in [key for key in self._data if key.startswith(prefix)]:
+                del self._data[key]
+
+    def publish(self, channel: str, message: str) -> int:
+        with self._lock:
+            subscribers = list(self._subscribers.get(channel, ()))
+        for callback in subscribers:
+            callback(message)
+        return len(subscribers)
+
+    def subscribe(self, channel: str, callback: Callable[[str], None]) -> None:
+        with self._lock:
+            self._subscribers.setdefault(channel, []).append(callback)
+
+
+class FakeRedisCacheBackend(CacheBackend):
+    """Shared backend over a FakeRedisServer; same semantics as RedisCacheBackend"""
+
+    shared = True
+
+    def __init__(self, server: FakeRedisServer, key_prefix: str = "productos:product:",
+                 channel: str = INVALIDATION_CHANNEL):
+        self._server = server
+        self._prefix = key_prefix
+        self._channel = channel
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        value = self._server.get(self._prefix + key)
+        return (value is not None), value
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        self._server.set(self._prefix + key, value, ttl)
+
+    def delete(self, key: str) -> None:
+        self._server.delete(self._prefix + key)
+
+    def clear(self) -> None:
+        self._server.clear(self._prefix)
+
+    def publish_invalidation(self, key: str) -> None:
+        self._server.publish(self._channel, key)
+
+    def subscribe_invalidations(self, callback: Callable[[str], None]) -> None:
+        self._server.subscribe(self._channel, callback)
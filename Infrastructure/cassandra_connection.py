@@ -1,11 +1,18 @@
 """
 Cassandra Database Connection and Configuration
-Handles connection to Cassandra cluster and keyspace setup
+Handles connection to Cassandra cluster; the schema itself is managed by
+Infrastructure/migrations.py
 """
 
 from cassandra.cluster import Cluster
 from cassandra.auth import PlainTextAuthProvider
 from cassandra.query import SimpleStatement
+from Infrastructure.cassandra_profiles import ClusterTuning
+from Infrastructure.cassandra_request_metrics import DriverRequestMetrics
+from Infrastructure.cassandra_tracing import CqlTracingListener
+from Infrastructure.cassandra_statements import PreparedStatementRegistry
+from Infrastructure.migrations import DEFAULT_REPLICATION, check_schema, migrate
+from observability.tracing import tracing_enabled
 import logging
 import os
 from typing import Optional
@@ -25,49 +32,81 @@ class CassandraConnection:
         self.port = int(os.getenv('CASSANDRA_PORT', '9042'))
         self.username = os.getenv('CASSANDRA_USERNAME')
         self.password = os.getenv('CASSANDRA_PASSWORD')
+        self.catalog_shards = int(os.getenv('CASSANDRA_CATALOG_SHARDS', '16'))
+        self.statements = PreparedStatementRegistry()
+        # Load balancing, execution profiles, compression and pools (CASSANDRA_* env)
+        self.tuning = ClusterTuning.from_env()
+        self.auto_migrate = os.getenv('CASSANDRA_AUTO_MIGRATE', 'false').lower() == 'true'
+        # productos_cassandra_* metrics for every request sent by the driver
+        self.request_metrics = os.getenv('CASSANDRA_REQUEST_METRICS', 'true').lower() == 'true'
+        self.schema_version: Optional[int] = None
+        self.last_error: Optional[str] = None
         
+    def open_cluster_session(self):
+        """
+        Builds the Cluster and opens a session without selecting the keyspace
+        (used by connect and by the migrations command)
+        """
+        # Setup authentication if credentials provided
+        auth_provider = None
+        if self.username and self.password:
+            auth_provider = PlainTextAuthProvider(
+                username=self.username, 
+                password=self.password
+            )
+        
+        # Create cluster connection with timeout
+        self._cluster = Cluster(
+            contact_points=self.hosts,
+            port=self.port,
+            auth_provider=auth_provider,
+            connect_timeout=10,  # 10 second connection timeout
+            control_connection_timeout=10,  # 10 second control connection timeout
+            **self.tuning.cluster_kwargs()
+        )
+        self.tuning.apply_pool_settings(self._cluster)
+        
+        # Create session with timeout
+        print(f"🔗 Connecting to Cassandra at {self.hosts}:{self.port}...")
+        self._session = self._cluster.connect()
+        print("✅ Cassandra session established")
+        return self._session
+
     def connect(self) -> bool:
         """
         Establishes connection to Cassandra cluster
         Returns True if successful, False otherwise
+
+        No DDL runs here: the schema is created by the migrations command and
+        this only checks its version (one read). CASSANDRA_AUTO_MIGRATE=true
+        applies pending migrations instead, for local development.
         """
         try:
-            # Setup authentication if credentials provided
-            auth_provider = None
-            if self.username and self.password:
-                auth_provider = PlainTextAuthProvider(
-                    username=self.username, 
-                    password=self.password
-                )
-            
-            # Create cluster connection with timeout
-            self._cluster = Cluster(
-                contact_points=self.hosts,
-                port=self.port,
-                auth_provider=auth_provider,
-                connect_timeout=10,  # 10 second connection timeout
-                control_connection_timeout=10  # 10 second control connection timeout
-            )
-            
-            # Create session with timeout
-            print(f"🔗 Connecting to Cassandra at {self.hosts}:{self.port}...")
-            self._session = self._cluster.connect()
-            print("✅ Cassandra session established")
+            session = self.open_cluster_session()
+            if self.request_metrics:
+                session.add_request_init_listener(DriverRequestMetrics(self.statements.name_for))
+            if tracing_enabled():
+                # One CLIENT span per CQL request made inside a sampled trace
+                session.add_request_init_listener(CqlTracingListener(self.statements.name_for, self.keyspace))
             
-            # Create keyspace if it doesn't exist
-            self._create_keyspace()
+            if self.auto_migrate:
+                migrate(session, self.keyspace, replication=os.getenv("CASSANDRA_REPLICATION", DEFAULT_REPLICATION))
             
-            # Use the keyspace
-            self._session.set_keyspace(self.keyspace)
+            # Use the keyspace and verify the schema version
+            session.set_keyspace(self.keyspace)
+            self.schema_version = check_schema(session, self.keyspace)
             
-            # Create tables if they don't exist
-            self._create_tables()
+            # Prepare all CQL statements once for this session
+            self.statements.prepare_all(session)
             
-            logger.info(f"Successfully connected to Cassandra cluster at {self.hosts}")
+            logger.info(f"Successfully connected to Cassandra cluster at {self.hosts} (schema v{self.schema_version})")
             return True
             
         except Exception as e:
             logger.error(f"Failed to connect to Cassandra: {str(e)}")
+            self.last_error = str(e)
+            # Do not leak the cluster's I/O threads on a failed attempt
+            self.disconnect()
             return False
     
     def disconnect(self):
@@ -78,6 +117,8 @@ class CassandraConnection:
             self._session.shutdown()
         if self._cluster:
             self._cluster.shutdown()
+        self._session = None
+        self._cluster = None
         logger.info("Disconnected from Cassandra")
     
     def get_session(self):
@@ -89,64 +130,12 @@ class CassandraConnection:
                 raise ConnectionError("Unable to establish Cassandra connection")
         return self._session
     
-    def _create_keyspace(self):
+    def prepared(self, name: str):
         """
-        Creates the keyspace if it doesn't exist
+        Returns the named prepared statement for the active session.
+        Statements are re-prepared automatically after a reconnect.
         """
-        create_keyspace_query = f"""
-        CREATE KEYSPACE IF NOT EXISTS {self.keyspace}
-        WITH REPLICATION = {{
-            'class': 'SimpleStrategy',
-            'replication_factor': 1
-        }}
-        """
-        self._session.execute(create_keyspace_query)
-        logger.info(f"Keyspace '{self.keyspace}' ready")
-    
-    def _create_tables(self):
-        """
-        Creates the products table if it doesn't exist
-        """
-        create_products_table = """
-        CREATE TABLE IF NOT EXISTS products (
-            product_id TEXT PRIMARY KEY,
-            name TEXT,
-            category TEXT,
-            price DOUBLE,
-            original_price DOUBLE,
-            unit TEXT,
-            image_url TEXT,
-            stock INT,
-            origin TEXT,
-            description TEXT,
-            user_id TEXT,
-            created_at DATE,
-            updated_at DATE,
-            is_active BOOLEAN,
-            is_organic BOOLEAN,
-            is_best_seller BOOLEAN,
-            free_shipping BOOLEAN
-        )
-        """
-        
-        # Create secondary indexes for common queries
-        
-        create_active_index = """
-        CREATE INDEX IF NOT EXISTS products_active_idx 
-        ON products (is_active)
-        """
-        
-        create_user_id_index = """
-        CREATE INDEX IF NOT EXISTS products_user_id_idx
-        ON products (user_id)
-        """
-
-        session = self.get_session()
-        session.execute(create_products_table)
-        session.execute(create_user_id_index)
-        session.execute(create_active_index)
-        
-        logger.info("Products table and indexes created successfully")
+        return self.statements.get(self.get_session(), name)
 
 # Global connection instance
 _cassandra_connection = None
@@ -159,3 +148,12 @@ def get_cassandra_connection() -> CassandraConnection:
     if _cassandra_connection is None:
         _cassandra_connection = CassandraConnection()
     return _cassandra_connection
+
+def reset_cassandra_connection() -> None:
+    """
+    Drops the singleton without shutting it down. Called in a freshly forked
+    worker: the inherited cluster's sockets and I/O threads belong to the parent,
+    so the next get_cassandra_connection() opens a new session in this process.
+    """
+    global _cassandra_connection
+    _cassandra_connection = None
@@ -1,19 +1,74 @@
 """
 Cassandra Database Operations (Infrastructure Layer)
 Implements CRUD operations using Cassandra for high scalability and performance.
-Handles data persistence, querying, and JSON serialization for the Product entity.
+Handles data persistence and querying for the Product entity. Reads run on the
+product execution profiles (see cassandra_profiles), whose row factory returns
+Product entities: point_read for lookups by ID, bulk_scan for full catalog scans
+and products for the rest.
 """
 
 from domain.entidades.product_model import Product
 from Infrastructure.cassandra_connection import get_cassandra_connection
+from Infrastructure.cassandra_profiles import BULK_SCAN_PROFILE, POINT_READ_PROFILE
+from Infrastructure.cassandra_rows import PRODUCT_PROFILE
 from datetime import date, datetime
+import base64
+import binascii
 import logging
-from typing import List, Optional, Dict, Any
-from cassandra import ConsistencyLevel
-from cassandra.query import SimpleStatement
+import os
+import time
+import zlib
+from typing import List, Optional, Dict, Any, Tuple, Iterator
+from cassandra import ConsistencyLevel, InvalidRequest
+from cassandra.protocol import ProtocolException
+from cassandra.concurrent import execute_concurrent, execute_concurrent_with_args
+from cassandra.query import BatchStatement, BatchType
 
 logger = logging.getLogger(__name__)
 
+# How add_product guards against duplicate product IDs:
+# - "lwt":   atomic INSERT ... IF NOT EXISTS (default)
+# - "check": read-before-write (legacy, not atomic)
+# - "trust": like "lwt", but server-generated PROD- IDs skip the duplicate check entirely
+CREATE_MODES = ("lwt", "check", "trust")
+
+# Attempts at writing the query-table copies of a row already inserted with IF NOT EXISTS
+QUERY_TABLE_WRITE_ATTEMPTS = 3
+QUERY_TABLE_RETRY_DELAY = 0.05
+
+
+def catalog_shard(product_id: str, shards: int) -> int:
+    """
+    Returns the active-catalog shard for a product ID.
+    Uses CRC32 so the shard is stable across processes and Python versions.
+    """
+    return zlib.crc32(product_id.encode("utf-8")) % shards
+
+
+def encode_page_token(shard: int, paging_state: Optional[bytes]) -> str:
+    """
+    Builds the opaque page token returned to clients.
+    Format: urlsafe base64 of a 2-byte shard number followed by the driver paging_state.
+    """
+    raw = shard.to_bytes(2, "big") + (paging_state or b"")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_page_token(token: str) -> Tuple[int, Optional[bytes]]:
+    """
+    Parses a page token produced by encode_page_token.
+    
+    Raises:
+        ValueError: If the token is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+    except (binascii.Error, ValueError):
+        raise ValueError("page_token inválido")
+    if len(raw) < 2:
+        raise ValueError("page_token inválido")
+    return int.from_bytes(raw[:2], "big"), raw[2:] or None
+
 # ===============================
 # CASSANDRA DATABASE OPERATIONS
 # ===============================
@@ -24,8 +79,7 @@ class CassandraDB:
     
     Features:
     - High-performance CRUD operations
-    - JSON serialization support
-    - Automatic date formatting
+    - Rows mapped directly to Product entities (see cassandra_rows)
     - Connection management
     - Error handling and logging
     """
@@ -34,6 +88,9 @@ class CassandraDB:
         """Initialize Cassandra connection and session"""
         self.connection = get_cassandra_connection()
         self.session = None
+        self.create_mode = os.getenv("PRODUCT_CREATE_MODE", "lwt").lower()
+        if self.create_mode not in CREATE_MODES:
+            raise ValueError(f"PRODUCT_CREATE_MODE must be one of {CREATE_MODES}, got '{self.create_mode}'")
         self._ensure_connection()
     
     def _ensure_connection(self):
@@ -47,40 +104,43 @@ class CassandraDB:
     # ===============================
     # CREATE OPERATIONS
     # ===============================
-    def add_product(self, product: Product) -> None:
+    def add_product(self, product: Product, trusted_id: bool = False) -> None:
         """
         Adds a new product to the Cassandra database.
+        The duplicate-ID guard depends on PRODUCT_CREATE_MODE (see CREATE_MODES).
+        
+        With the LWT guard the products row is inserted with IF NOT EXISTS and its
+        query-table copies are written afterwards in one logged batch; otherwise
+        everything goes in a single logged batch. Once the LWT is applied the
+        product exists, so a failing copy is retried and then left for the
+        backfill instead of reporting the create as failed (see _write_query_tables).
         
         Args:
             product (Product): Product entity to be persisted
+            trusted_id (bool): True when productId was generated by the server
             
         Raises:
             ValueError: If product with same ID already exists
             Exception: If database operation fails
         """
         try:
-            # Check for duplicate product ID
-            if self.get_product_by_id(product.productId):
-                raise ValueError("Ya existe un producto con ese ID")
-            
-            # Prepare insert statement
-            insert_query = """
-            INSERT INTO products (
-                product_id, name, category, price, original_price, unit, 
-                image_url, stock, origin, description, user_id, created_at, updated_at,
-                is_active, is_organic, is_best_seller, free_shipping
-            ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-            """
-            
-            values = (
-                product.productId, product.name, product.category, product.price,
-                product.originalPrice, product.unit, product.imageUrl, product.stock,
-                product.origin, product.description, product.user_id, product.createdAt, product.updatedAt,
-                product.isActive, product.isOrganic, product.isBestSeller, product.freeShipping
-            )
+            values = self._product_values(product)
+            
+            if self.create_mode == "trust" and trusted_id and product.productId.startswith("PROD-"):
+                # Server-generated UUID-based IDs: no duplicate check at all
+                self.session.execute(self._insert_batch(values))
+            elif self.create_mode == "check":
+                # Check for duplicate product ID
+                if self.get_product_by_id(product.productId):
+                    raise ValueError("Ya existe un producto con ese ID")
+                self.session.execute(self._insert_batch(values))
+            else:
+                result = self.session.execute(self.connection.prepared("insert_product_if_not_exists"), values)
+                if not result.was_applied:
+                    raise ValueError("Ya existe un producto con ese ID")
+                if product.isActive:
+                    self._write_query_tables(values)
             
-            statement = SimpleStatement(insert_query, consistency_level=ConsistencyLevel.ONE)
-            self.session.execute(statement, values)
             logger.info(f"Product {product.productId} added successfully")
             
         except ValueError:
@@ -89,11 +149,82 @@ class CassandraDB:
             logger.error(f"Failed to add product {product.productId}: {str(e)}")
             raise Exception(f"Database error while adding product: {str(e)}")
 
+    def add_products(self, products: List[Product], trusted_ids: List[bool]) -> List[Optional[str]]:
+        """
+        Adds many products concurrently, honouring PRODUCT_CREATE_MODE for each one.
+        At most CASSANDRA_WRITE_CONCURRENCY requests are in flight at any time.
+        
+        Args:
+            products (List[Product]): Validated product entities
+            trusted_ids (List[bool]): Per product, True when productId was generated by the server
+            
+        Returns:
+            List[Optional[str]]: Per product, None if created or the error message
+        """
+        concurrency = int(os.getenv("CASSANDRA_WRITE_CONCURRENCY", "32"))
+        errors: List[Optional[str]] = [None] * len(products)
+        values = [self._product_values(product) for product in products]
+        
+        # Phase 1: duplicate-ID guard for the products that need it
+        guarded = [
+            i for i, product in enumerate(products)
+            if not (self.create_mode == "trust" and trusted_ids[i] and product.productId.startswith("PROD-"))
+        ]
+        if self.create_mode == "check":
+            lookups = execute_concurrent_with_args(
+                self.session, self.connection.prepared("select_product_by_id"),
+                [(products[i].productId,) for i in guarded],
+                concurrency=concurrency, raise_on_first_error=False
+            )
+            for i, (success, result) in zip(guarded, lookups):
+                if not success:
+                    errors[i] = f"Database error while adding product: {result}"
+                elif result.one():
+                    errors[i] = "Ya existe un producto con ese ID"
+        else:
+            inserts = execute_concurrent_with_args(
+                self.session, self.connection.prepared("insert_product_if_not_exists"),
+                [values[i] for i in guarded],
+                concurrency=concurrency, raise_on_first_error=False
+            )
+            for i, (success, result) in zip(guarded, inserts):
+                if not success:
+                    errors[i] = f"Database error while adding product: {result}"
+                elif not result.was_applied:
+                    errors[i] = "Ya existe un producto con ese ID"
+        
+        # Rows inserted with IF NOT EXISTS only need their query-table copies
+        inserted = set(guarded) if self.create_mode != "check" else set()
+        pending, batches = [], []
+        for i in range(len(products)):
+            if errors[i] is not None or (i in inserted and not products[i].isActive):
+                continue
+            pending.append(i)
+            batches.append((self._insert_batch(values[i], include_products=i not in inserted), None))
+        
+        # Phase 2: logged batches with the rows and their query-table copies
+        results = execute_concurrent(
+            self.session, batches, concurrency=concurrency, raise_on_first_error=False
+        )
+        for i, (success, result) in zip(pending, results):
+            if success:
+                continue
+            if i in inserted:
+                # The products row exists: retry its copies instead of failing the row
+                logger.warning(f"Query-table write for {products[i].productId} failed: {result}")
+                self._write_query_tables(values[i], attempts=QUERY_TABLE_WRITE_ATTEMPTS - 1)
+            else:
+                errors[i] = f"Database error while adding product: {result}"
+        
+        created = sum(1 for error in errors if error is None)
+        logger.info(f"Bulk insert: {created} products added, {len(products) - created} failed")
+        return errors
+
     # ===============================
     # READ OPERATIONS
     # ===============================
     
-    def get_product_by_id(self, product_id: str) -> Optional[Dict[str, Any]]:
+    def get_product_by_id(self, product_id: str) -> Optional[Product]:
         """
         Retrieves a single product by its unique ID.
         
@@ -101,37 +232,35 @@ class CassandraDB:
             product_id (str): Unique product identifier
             
         Returns:
-            Optional[Dict[str, Any]]: Product data as dictionary or None if not found
+            Optional[Product]: Product entity or None if not found
         """
         try:
-            query = "SELECT * FROM products WHERE product_id = %s"
-            statement = SimpleStatement(query, consistency_level=ConsistencyLevel.ONE)
-            result = self.session.execute(statement, [product_id])
-            row = result.one()
-            
-            if row:
-                return self._row_to_dict(row)
-            return None
+            statement = self.connection.prepared("select_product_by_id")
+            return self.session.execute(statement, [product_id], execution_profile=POINT_READ_PROFILE).one()
             
         except Exception as e:
             logger.error(f"Failed to get product {product_id}: {str(e)}")
             raise Exception(f"Database error while retrieving product: {str(e)}")
     
-    def get_all_products(self) -> List[Dict[str, Any]]:
+    def get_all_products(self) -> List[Product]:
         """
         Retrieves all products from the database as long as they are active.
+        Reads every shard of active_products_by_shard concurrently instead of
+        filtering the whole products table.
         
         Returns:
-            List[Dict[str, Any]]: List of all products as dictionaries
+            List[Product]: All active products
         """
         try:
-            query = "SELECT * FROM products WHERE is_active = true ALLOW FILTERING"
-            statement = SimpleStatement(query, consistency_level=ConsistencyLevel.ONE)
-            result = self.session.execute(statement)
+            statement = self.connection.prepared("select_active_products")
+            futures = [
+                self.session.execute_async(statement, [shard], execution_profile=BULK_SCAN_PROFILE)
+                for shard in range(self.connection.catalog_shards)
+            ]
             
             products = []
-            for row in result:
-                products.append(self._row_to_dict(row))
+            for future in futures:
+                products.extend(future.result())
             
             logger.info(f"Retrieved {len(products)} products from database")
             return products
@@ -140,24 +269,20 @@ class CassandraDB:
             logger.error(f"Failed to get all products: {str(e)}")
             raise Exception(f"Database error while retrieving products: {str(e)}")
         
-    def get_products_by_user_id(self, user_id: str) -> List[Dict[str, Any]]:
+    def get_products_by_user_id(self, user_id: str) -> List[Product]:
         """
-        Retrieves all products associated with a specific user ID.
+        Retrieves all active products associated with a specific user ID
+        from the products_by_user partition.
         
         Args:
             user_id (str): User identifier
             
         Returns:
-            List[Dict[str, Any]]: List of products for the user as dictionaries
+            List[Product]: Active products of the user
         """
         try:
-            query = "SELECT * FROM products WHERE user_id = %s AND is_active = true ALLOW FILTERING"
-            statement = SimpleStatement(query, consistency_level=ConsistencyLevel.ONE)
-            result = self.session.execute(statement, [user_id])
-            
-            products = []
-            for row in result:
-                products.append(self._row_to_dict(row))
+            statement = self.connection.prepared("select_products_by_user")
+            products = list(self.session.execute(statement, [user_id], execution_profile=PRODUCT_PROFILE))
             
             logger.info(f"Retrieved {len(products)} products for user {user_id}")
             return products
@@ -165,6 +290,104 @@ class CassandraDB:
         except Exception as e:
             logger.error(f"Failed to get products for user {user_id}: {str(e)}")
             raise Exception(f"Database error while retrieving user's products: {str(e)}")
+    
+    def get_all_products_page(self, limit: int, page_token: Optional[str] = None) -> Tuple[List[Product], Optional[str]]:
+        """
+        Retrieves one page of active products using the driver's native paging.
+        Shards are walked in order; the token records the current shard and its paging_state.
+        
+        Args:
+            limit (int): Maximum number of products in the page
+            page_token (Optional[str]): Token returned by the previous page, None for the first page
+            
+        Returns:
+            Tuple[List[Product], Optional[str]]: Products and the next page token (None when exhausted)
+            
+        Raises:
+            ValueError: If the page token is invalid
+        """
+        shard, paging_state = decode_page_token(page_token) if page_token else (0, None)
+        shards = self.connection.catalog_shards
+        if shard >= shards:
+            raise ValueError("page_token inválido")
+        try:
+            statement = self.connection.prepared("select_active_products")
+            products = []
+            while shard < shards and len(products) < limit:
+                bound = statement.bind([shard])
+                bound.fetch_size = limit - len(products)
+                result = self.session.execute(bound, paging_state=paging_state, execution_profile=PRODUCT_PROFILE)
+                products.extend(result.current_rows)
+                if result.paging_state:
+                    paging_state = result.paging_state
+                else:
+                    shard, paging_state = shard + 1, None
+            
+            next_token = encode_page_token(shard, paging_state) if shard < shards else None
+            return products, next_token
+            
+        except (InvalidRequest, ProtocolException) as e:
+            logger.warning(f"Rejected page token for active products: {str(e)}")
+            raise ValueError("page_token inválido")
+        except Exception as e:
+            logger.error(f"Failed to get products page: {str(e)}")
+            raise Exception(f"Database error while retrieving products: {str(e)}")
+    
+    def get_products_by_user_id_page(self, user_id: str, limit: int, page_token: Optional[str] = None) -> Tuple[List[Product], Optional[str]]:
+        """
+        Retrieves one page of a user's active products using the driver's native paging.
+        
+        Args:
+            user_id (str): User identifier
+            limit (int): Maximum number of products in the page
+            page_token (Optional[str]): Token returned by the previous page, None for the first page
+            
+        Returns:
+            Tuple[List[Product], Optional[str]]: Products and the next page token (None when exhausted)
+            
+        Raises:
+            ValueError: If the page token is invalid
+        """
+        _, paging_state = decode_page_token(page_token) if page_token else (0, None)
+        try:
+            bound = self.connection.prepared("select_products_by_user").bind([user_id])
+            bound.fetch_size = limit
+            result = self.session.execute(bound, paging_state=paging_state, execution_profile=PRODUCT_PROFILE)
+            products = list(result.current_rows)
+            
+            next_token = encode_page_token(0, result.paging_state) if result.paging_state else None
+            return products, next_token
+            
+        except (InvalidRequest, ProtocolException) as e:
+            logger.warning(f"Rejected page token for user {user_id}: {str(e)}")
+            raise ValueError("page_token inválido")
+        except Exception as e:
+            logger.error(f"Failed to get products page for user {user_id}: {str(e)}")
+            raise Exception(f"Database error while retrieving user's products: {str(e)}")
+
+    def iter_active_products(self, page_size: int = 500) -> Iterator[Product]:
+        """
+        Streams every active product shard by shard.
+        The driver fetches the next page only when the current one is consumed,
+        so memory stays bounded by page_size regardless of catalog size.
+        
+        Args:
+            page_size (int): Rows fetched per round trip
+            
+        Yields:
+            Product: Active product entities
+        """
+        try:
+            statement = self.connection.prepared("select_active_products")
+            for shard in range(self.connection.catalog_shards):
+                bound = statement.bind([shard])
+                bound.fetch_size = page_size
+                yield from self.session.execute(bound, execution_profile=BULK_SCAN_PROFILE)
+                    
+        except Exception as e:
+            logger.error(f"Failed to stream products: {str(e)}")
+            raise Exception(f"Database error while streaming products: {str(e)}")
+
     # ===============================
     # DELETE OPERATIONS
     # ===============================
@@ -176,20 +399,17 @@ class CassandraDB:
         """
         try:
             # Get all products with test IDs
-            query = "SELECT product_id FROM products"
-            statement = SimpleStatement(query, consistency_level=ConsistencyLevel.ONE)
+            statement = self.connection.prepared("select_all_product_keys")
             result = self.session.execute(statement)
             
             test_products = []
             for row in result:
                 if row.product_id.startswith('test-'):
-                    test_products.append(row.product_id)
+                    test_products.append((row.product_id, row.user_id))
             
-            # Delete each test product
-            for product_id in test_products:
-                delete_query = "DELETE FROM products WHERE product_id = %s"
-                statement = SimpleStatement(delete_query, consistency_level=ConsistencyLevel.ONE)
-                self.session.execute(statement, [product_id])
+            # Delete each test product together with its query-table copies
+            for product_id, user_id in test_products:
+                self.delete_product(product_id, user_id)
             
             logger.info(f"Cleared {len(test_products)} test products from database")
             
@@ -197,6 +417,19 @@ class CassandraDB:
             logger.error(f"Failed to clear test data: {str(e)}")
             raise Exception(f"Database error while clearing test data: {str(e)}")
     
+    def delete_product(self, product_id: str, user_id: Optional[str]) -> None:
+        """
+        Permanently deletes a product and its query-table copies.
+        
+        Args:
+            product_id (str): ID of the product to delete
+            user_id (Optional[str]): Owner of the product (partition key of products_by_user)
+        """
+        batch = BatchStatement(batch_type=BatchType.LOGGED, consistency_level=ConsistencyLevel.ONE)
+        batch.add(self.connection.prepared("delete_product"), [product_id])
+        self._add_query_table_deletes(batch, product_id, user_id)
+        self.session.execute(batch)
+    
     # ===============================
     # UPDATE OPERATIONS
     # ===============================
@@ -212,13 +445,15 @@ class CassandraDB:
             bool: True if product was updated, False if not found
         """
         try:
-            # Check if product exists first
-            if not self.get_product_by_id(product_id):
+            # Check if product exists first (user_id is needed for products_by_user)
+            product = self.get_product_by_id(product_id)
+            if not product:
                 return False
 
-            query = "UPDATE products SET is_active = false WHERE product_id = %s"
-            statement = SimpleStatement(query, consistency_level=ConsistencyLevel.ONE)
-            self.session.execute(statement, [product_id])
+            batch = BatchStatement(batch_type=BatchType.LOGGED, consistency_level=ConsistencyLevel.ONE)
+            batch.add(self.connection.prepared("deactivate_product"), [product_id])
+            self._add_query_table_deletes(batch, product_id, product.user_id)
+            self.session.execute(batch)
             logger.info(f"Product {product_id} updated successfully")
             return True
             
@@ -226,61 +461,179 @@ class CassandraDB:
             logger.error(f"Failed to update product {product_id}: {str(e)}")
             raise Exception(f"Database error while updating product: {str(e)}")
         
-    def update_image_url(self, product_id, image_url):
-        query = "UPDATE products SET image_url = %s WHERE product_id = %s"
-        self.session.execute(query, (image_url, product_id))
+    def update_image_url(self, product_id: str, image_url: str) -> None:
+        """
+        Updates the image URL of a product in the products table and,
+        for active products, in its query-table copies.
+        
+        Args:
+            product_id (str): ID of the product to update
+            image_url (str): New public URL of the product image
+        """
+        try:
+            self._update_denormalized(product_id, "update_image_url", image_url)
+        except Exception as e:
+            logger.error(f"Failed to update image of product {product_id}: {str(e)}")
+            raise Exception(f"Database error while updating product image: {str(e)}")
+    
+    def update_image_variants(self, product_id: str, variants: Dict[str, str]) -> None:
+        """
+        Stores the URLs of the resized image variants of a product.
+        
+        Args:
+            product_id (str): ID of the product to update
+            variants (Dict[str, str]): Variant name (thumbnail, card, detail) -> public URL
+        """
+        try:
+            self._update_denormalized(product_id, "update_image_variants", variants)
+            logger.info(f"Image variants of product {product_id} updated")
+        except Exception as e:
+            logger.error(f"Failed to update image variants of product {product_id}: {str(e)}")
+            raise Exception(f"Database error while updating image variants: {str(e)}")
+    
+    def _update_denormalized(self, product_id: str, statement_name: str, value) -> None:
+        """
+        Runs the named UPDATE on products and, for active products, the matching
+        <statement_name>_by_user / <statement_name>_active updates in one logged batch.
+        Nothing is written when the product does not exist (UPDATE would create a partial row).
+        """
+        product = self.get_product_by_id(product_id)
+        if not product:
+            logger.warning(f"Skipping {statement_name} for unknown product {product_id}")
+            return
+        batch = BatchStatement(batch_type=BatchType.LOGGED, consistency_level=ConsistencyLevel.ONE)
+        batch.add(self.connection.prepared(statement_name), (value, product_id))
+        if product.isActive:
+            batch.add(
+                self.connection.prepared(f"{statement_name}_by_user"),
+                (value, product.user_id, product_id),
+            )
+            batch.add(
+                self.connection.prepared(f"{statement_name}_active"),
+                (value, catalog_shard(product_id, self.connection.catalog_shards), product_id),
+            )
+        self.session.execute(batch)
+
     # ===============================
-    # UTILITY METHODS
+    # MIGRATION OPERATIONS
     # ===============================
     
-    def _row_to_dict(self, row) -> Dict[str, Any]:
+    def backfill_query_tables(self, page_size: int = 500, concurrency: int = 32) -> int:
         """
-        Converts a Cassandra row to a dictionary compatible with Product model.
-        
-        Features:
-        - Handles date serialization for JSON compatibility
-        - Calculates computed fields (inStock)
-        - Maps database column names to Product field names
+        Copies every active product of the products table into products_by_user
+        and active_products_by_shard. Safe to run several times (inserts are upserts).
         
         Args:
-            row: Cassandra row object
+            page_size (int): Rows fetched per page while scanning products
+            concurrency (int): Maximum in-flight batches
             
         Returns:
-            Dict[str, Any]: Product data as dictionary
-        """
-        def format_date(date_obj):
-            """Convert date objects to ISO format strings for JSON serialization"""
-            if date_obj is None:
-                return None
-            if hasattr(date_obj, 'isoformat'):
-                return date_obj.isoformat()
-            return str(date_obj)
-        
-        # Calculate inStock based on stock quantity
-        stock = row.stock if row.stock is not None else 0
-        in_stock = stock > 0
+            int: Number of active products written to the query tables
+        """
+        try:
+            # fetch_size on a bound statement: the shared prepared statement keeps its default
+            bound = self.connection.prepared("select_all_products").bind([])
+            bound.fetch_size = page_size
+            result = self.session.execute(bound)
+            
+            copied = 0
+            pending = []
+            for row in result:
+                values = tuple(row)
+                if not row.is_active:
+                    continue
+                pending.append((self._insert_batch(values, include_products=False), None))
+                if len(pending) >= page_size:
+                    copied += self._execute_batches(pending, concurrency)
+                    pending = []
+            if pending:
+                copied += self._execute_batches(pending, concurrency)
+            
+            logger.info(f"Backfilled {copied} active products into query tables")
+            return copied
+            
+        except Exception as e:
+            logger.error(f"Failed to backfill query tables: {str(e)}")
+            raise Exception(f"Database error while backfilling query tables: {str(e)}")
+
+    # ===============================
+    # UTILITY METHODS
+    # ===============================
+    
+    @staticmethod
+    def _product_values(product: Product) -> tuple:
+        """Returns the product column values in PRODUCT_COLUMNS order"""
+        return (
+            product.productId, product.name, product.category, product.price,
+            product.originalPrice, product.unit, product.imageUrl, product.stock,
+            product.origin, product.description, product.user_id, product.createdAt, product.updatedAt,
+            product.isActive, product.isOrganic, product.isBestSeller, product.freeShipping,
+            product.imageVariants
+        )
+    
+    def _insert_batch(self, values: tuple, include_products: bool = True) -> BatchStatement:
+        """
+        Builds the logged batch that writes a product row and, when the product
+        is active, its copies in products_by_user and active_products_by_shard.
         
-        return {
-            "productId": row.product_id,
-            "name": row.name,
-            "category": row.category,
-            "price": row.price,
-            "originalPrice": row.original_price,
-            "unit": row.unit,
-            "imageUrl": row.image_url,
-            "stock": stock,
-            "origin": row.origin,
-            "description": row.description,
-            "user_id": row.user_id,
-            "createdAt": format_date(row.created_at),
-            "updatedAt": format_date(row.updated_at),
-            "isActive": row.is_active,
-            "isOrganic": row.is_organic,
-            "isBestSeller": row.is_best_seller,
-            "freeShipping": row.free_shipping,
-            "inStock": in_stock
-        }
+        Args:
+            values (tuple): Column values in PRODUCT_COLUMNS order
+            include_products (bool): Whether to include the products table insert
+        """
+        product_id, is_active = values[0], values[13]
+        batch = BatchStatement(batch_type=BatchType.LOGGED, consistency_level=ConsistencyLevel.ONE)
+        if include_products:
+            batch.add(self.connection.prepared("insert_product"), values)
+        if is_active:
+            batch.add(self.connection.prepared("insert_product_by_user"), values)
+            shard = catalog_shard(product_id, self.connection.catalog_shards)
+            batch.add(self.connection.prepared("insert_active_product"), (shard,) + values)
+        return batch
+    
+    def _write_query_tables(self, values: tuple, attempts: int = QUERY_TABLE_WRITE_ATTEMPTS) -> bool:
+        """
+        Writes the products_by_user / active_products_by_shard copies of a product
+        whose products row is already stored. The batch is an idempotent upsert, so
+        it is retried with a short backoff. If every attempt fails the product still
+        exists (readable by ID, but missing from listings): the error is logged with
+        the repair command and False is returned instead of raising.
+        """
+        product_id = values[0]
+        for attempt in range(1, attempts + 1):
+            try:
+                self.session.execute(self._insert_batch(values, include_products=False))
+                return True
+            except Exception as e:
+                logger.warning(f"Query-table write for {product_id} failed (attempt {attempt}/{attempts}): {str(e)}")
+                if attempt < attempts:
+                    time.sleep(QUERY_TABLE_RETRY_DELAY * 2 ** (attempt - 1))
+        logger.error(
+            f"Product {product_id} was created but is missing from the listing tables; "
+            f"repair with: python -m Infrastructure.backfill_query_tables"
+        )
+        return False
 
+    def _add_query_table_deletes(self, batch: BatchStatement, product_id: str, user_id: Optional[str]) -> None:
+        """Adds the deletes that remove a product from the active-only query tables"""
+        if user_id:
+            batch.add(self.connection.prepared("delete_product_by_user"), (user_id, product_id))
+        shard = catalog_shard(product_id, self.connection.catalog_shards)
+        batch.add(self.connection.prepared("delete_active_product"), (shard, product_id))
+    
+    def _execute_batches(self, statements_and_params: list, concurrency: int) -> int:
+        """Executes batches concurrently and returns how many succeeded"""
+        results = execute_concurrent(
+            self.session, statements_and_params,
+            concurrency=concurrency, raise_on_first_error=False
+        )
+        succeeded = 0
+        for success, result_or_exc in results:
+            if success:
+                succeeded += 1
+            else:
+                logger.error(f"Backfill batch failed: {result_or_exc}")
+        return succeeded
+    
     # ===============================
     # CONNECTION MANAGEMENT
     # ===============================
@@ -0,0 +1,154 @@
+"""
+Cassandra Cluster Tuning (Infrastructure Layer)
+Load balancing, retries, speculative execution, compression and connection
+settings of the driver Cluster, read from environment variables, plus the named
+execution profiles used by the product reads:
+
+- PRODUCT_PROFILE ("products"): interactive reads (listings by user, pages)
+- POINT_READ_PROFILE ("point_read"): single-partition lookups by product_id,
+  short timeout and optional speculative execution to cut tail latency
+- BULK_SCAN_PROFILE ("bulk_scan"): full catalog scans and exports, long timeout
+
+All product profiles keep product_row_factory. Consistency levels stay on the
+prepared statements (cassandra_statements), which take precedence over profiles.
+"""
+
+import logging
+import os
+from typing import Dict, Optional
+
+from cassandra.cluster import EXEC_PROFILE_DEFAULT, ExecutionProfile
+from cassandra.policies import (
+    ConstantSpeculativeExecutionPolicy, DCAwareRoundRobinPolicy, FallthroughRetryPolicy,
+    HostDistance, RetryPolicy, TokenAwarePolicy,
+)
+
+from Infrastructure.cassandra_rows import PRODUCT_PROFILE, product_row_factory
+
+logger = logging.getLogger(__name__)
+
+POINT_READ_PROFILE = "point_read"
+BULK_SCAN_PROFILE = "bulk_scan"
+
+RETRY_POLICIES = {"default": RetryPolicy, "fallthrough": FallthroughRetryPolicy}
+# CASSANDRA_COMPRESSION -> Cluster(compression=...); "auto" uses lz4 or snappy if installed
+COMPRESSION_OPTIONS = {"auto": True, "lz4": "lz4", "snappy": "snappy", "none": False}
+
+
+class ClusterTuning:
+    """
+    Driver client settings for CassandraConnection.
+
+    Features:
+    - Token-aware routing over DC-aware round robin (local DC first)
+    - Named execution profiles with their own timeouts and policies
+    - Constant-delay speculative execution for idempotent point reads
+    - Protocol compression, executor threads and (protocol v1/v2) pool sizes
+    """
+
+    def __init__(self, local_dc: Optional[str] = None, remote_hosts_per_dc: int = 0,
+                 token_aware: bool = True, retry_policy: str = "default",
+                 request_timeout: float = 10.0, point_read_timeout: float = 2.0,
+                 bulk_scan_timeout: float = 60.0, speculative_delay_ms: int = 0,
+                 speculative_max_attempts: int = 2, compression: str = "auto",
+                 protocol_version: Optional[int] = None, executor_threads: int = 2,
+                 core_connections: Optional[int] = None, max_connections: Optional[int] = None):
+        if retry_policy not in RETRY_POLICIES:
+            raise ValueError(f"CASSANDRA_RETRY_POLICY must be one of {tuple(RETRY_POLICIES)}, got '{retry_policy}'")
+        if compression not in COMPRESSION_OPTIONS:
+            raise ValueError(f"CASSANDRA_COMPRESSION must be one of {tuple(COMPRESSION_OPTIONS)}, got '{compression}'")
+        self.local_dc = local_dc
+        self.remote_hosts_per_dc = remote_hosts_per_dc
+        self.token_aware = token_aware
+        self.retry_policy = retry_policy
+        self.request_timeout = request_timeout
+        self.point_read_timeout = point_read_timeout
+        self.bulk_scan_timeout = bulk_scan_timeout
+        self.speculative_delay_ms = speculative_delay_ms
+        self.speculative_max_attempts = speculative_max_attempts
+        self.compression = compression
+        self.protocol_version = protocol_version
+        self.executor_threads = executor_threads
+        self.core_connections = core_connections
+        self.max_connections = max_connections
+
+    @classmethod
+    def from_env(cls) -> "ClusterTuning":
+        def optional_int(name):
+            value = os.getenv(name)
+            return int(value) if value else None
+
+        return cls(
+            local_dc=os.getenv("CASSANDRA_LOCAL_DC") or None,
+            remote_hosts_per_dc=int(os.getenv("CASSANDRA_REMOTE_HOSTS_PER_DC", "0")),
+            token_aware=os.getenv("CASSANDRA_TOKEN_AWARE", "true").lower() == "true",
+            retry_policy=os.getenv("CASSANDRA_RETRY_POLICY", "default").lower(),
+            request_timeout=float(os.getenv("CASSANDRA_REQUEST_TIMEOUT_SECONDS", "10")),
+            point_read_timeout=float(os.getenv("CASSANDRA_POINT_READ_TIMEOUT_SECONDS", "2")),
+            bulk_scan_timeout=float(os.getenv("CASSANDRA_BULK_SCAN_TIMEOUT_SECONDS", "60")),
+            speculative_delay_ms=int(os.getenv("CASSANDRA_SPECULATIVE_DELAY_MS", "0")),
+            speculative_max_attempts=int(os.getenv("CASSANDRA_SPECULATIVE_MAX_ATTEMPTS", "2")),
+            compression=os.getenv("CASSANDRA_COMPRESSION", "auto").lower(),
+            protocol_version=optional_int("CASSANDRA_PROTOCOL_VERSION"),
+            executor_threads=int(os.getenv("CASSANDRA_EXECUTOR_THREADS", "2")),
+            core_connections=optional_int("CASSANDRA_CORE_CONNECTIONS_PER_HOST"),
+            max_connections=optional_int("CASSANDRA_MAX_CONNECTIONS_PER_HOST"),
+        )
+
+    def load_balancing_policy(self):
+        """New policy instance (each execution profile gets its own)"""
+        policy = DCAwareRoundRobinPolicy(local_dc=self.local_dc, used_hosts_per_remote_dc=self.remote_hosts_per_dc)
+        if self.token_aware:
+            # Replicas first, shuffled so hot partitions spread over all their replicas
+            policy = TokenAwarePolicy(policy, shuffle_replicas=True)
+        return policy
+
+    def _profile(self, timeout: float, row_factory=None, speculative_execution_policy=None) -> ExecutionProfile:
+        kwargs = {"row_factory": row_factory} if row_factory is not None else {}
+        return ExecutionProfile(
+            load_balancing_policy=self.load_balancing_policy(),
+            retry_policy=RETRY_POLICIES[self.retry_policy](),
+            request_timeout=timeout,
+            speculative_execution_policy=speculative_execution_policy,
+            **kwargs,
+        )
+
+    def execution_profiles(self) -> Dict[object, ExecutionProfile]:
+        speculative = None
+        if self.speculative_delay_ms > 0:
+            # Only statements marked idempotent are speculated (see IDEMPOTENT_STATEMENTS)
+            speculative = ConstantSpeculativeExecutionPolicy(
+                delay=self.speculative_delay_ms / 1000.0, max_attempts=self.speculative_max_attempts
+            )
+        return {
+            EXEC_PROFILE_DEFAULT: self._profile(self.request_timeout),
+            PRODUCT_PROFILE: self._profile(self.request_timeout, product_row_factory),
+            POINT_READ_PROFILE: self._profile(self.point_read_timeout, product_row_factory, speculative),
+            BULK_SCAN_PROFILE: self._profile(self.bulk_scan_timeout, product_row_factory),
+        }
+
+    def cluster_kwargs(self) -> dict:
+        """Keyword arguments for Cluster(...) besides contact points, port and auth"""
+        kwargs = {
+            "execution_profiles": self.execution_profiles(),
+            "compression": COMPRESSION_OPTIONS[self.compression],
+            "executor_threads": self.executor_threads,
+        }
+        if self.protocol_version is not None:
+            kwargs["protocol_version"] = self.protocol_version
+        return kwargs
+
+    def apply_pool_settings(self, cluster) -> None:
+        """
+        Per-host connection pool sizes. The driver only pools connections for
+        protocol v1/v2; v3+ multiplexes requests over one connection per host.
+        """
+        if self.core_connections is None and self.max_connections is None:
+            return
+        if cluster.protocol_version >= 3:
+            logger.warning("CASSANDRA_*_CONNECTIONS_PER_HOST ignored: protocol v3+ uses one connection per host")
+            return
+        if self.max_connections is not None:
+            cluster.set_max_connections_per_host(HostDistance.LOCAL, self.max_connections)
+        if self.core_connections is not None:
+            cluster.set_core_connections_per_host(HostDistance.LOCAL, self.core_connections)
@@ -0,0 +1,93 @@
+"""
+Cassandra Driver Request Metrics (Infrastructure Layer)
+Request init listener that records every request the driver sends, whatever
+code path issued it (sync reads, execute_async in ASGI mode, batches, bulk
+writes through execute_concurrent).
+
+Metrics (observability/metrics.py):
+- productos_cassandra_requests_total{statement, outcome}
+- productos_cassandra_request_duration_seconds{statement}
+- productos_cassandra_retries_total{statement}
+- productos_stage_duration_seconds{stage="cassandra_query"}
+
+statement is the PreparedStatementRegistry name of a bound statement, "batch"
+for batches and "other" for ad hoc CQL, so label cardinality stays bounded.
+Latency goes from request creation to the first page result, which includes the
+row factory (reported separately as row_mapping); later pages are only counted.
+"""
+
+import logging
+from time import perf_counter
+from typing import Callable, Optional
+
+from cassandra import OperationTimedOut, Timeout, Unavailable
+from cassandra.query import BatchStatement, BoundStatement
+
+from observability.metrics import CASSANDRA_REQUEST_LATENCY, CASSANDRA_REQUESTS, CASSANDRA_RETRIES
+from observability.stages import CASSANDRA_QUERY, observe_stage
+
+logger = logging.getLogger(__name__)
+
+
+def statement_label(query, statement_name: Callable[[str], Optional[str]]) -> str:
+    """Registry name of a bound statement, "batch" or "other" (bounded label values)"""
+    if isinstance(query, BatchStatement):
+        return "batch"
+    if isinstance(query, BoundStatement):
+        return statement_name(query.prepared_statement.query_string) or "other"
+    return "other"
+
+
+def request_outcome(error: Optional[BaseException]) -> str:
+    """success, timeout, unavailable or error"""
+    if error is None:
+        return "success"
+    if isinstance(error, (Timeout, OperationTimedOut)):
+        return "timeout"
+    if isinstance(error, Unavailable):
+        return "unavailable"
+    return "error"
+
+
+class DriverRequestMetrics:
+    """
+    Callable for Session.add_request_init_listener.
+
+    Features:
+    - Per-statement request counts by outcome and latency histograms
+    - Retries decided by the retry policy
+    - Feeds the cassandra_query stage of the request hot path
+
+    Callbacks run on the driver's event loop thread, so they only touch
+    prometheus children (thread-safe) and never block.
+    """
+
+    def __init__(self, statement_name: Callable[[str], Optional[str]]):
+        self._statement_name = statement_name
+
+    def statement_label(self, query) -> str:
+        return statement_label(query, self._statement_name)
+
+    def __call__(self, response_future) -> None:
+        statement = self.statement_label(response_future.query)
+        start = perf_counter()
+        pages = []
+
+        def record(error=None):
+            CASSANDRA_REQUESTS.labels(statement=statement, outcome=request_outcome(error)).inc()
+            if pages:
+                # Following pages of a paged read: fetched lazily while the caller iterates
+                return
+            pages.append(True)
+            elapsed = perf_counter() - start
+            CASSANDRA_REQUEST_LATENCY.labels(statement=statement).observe(elapsed)
+            observe_stage(CASSANDRA_QUERY, elapsed)
+            retries = getattr(response_future, "_query_retries", 0)
+            if retries:
+                CASSANDRA_RETRIES.labels(statement=statement).inc(retries)
+
+        try:
+            response_future.add_callbacks(callback=lambda _rows: record(), errback=record)
+        except Exception as e:
+            # Metrics must never break a request
+            logger.error(f"Could not attach driver metrics callbacks: {str(e)}")
@@ -0,0 +1,208 @@
+"""
+Prepared Statement Registry (Infrastructure Layer)
+Keeps every CQL statement used by the service in one place and prepares them
+once per Cassandra session, so the coordinator does not re-parse the query on
+each request and the driver can route bound statements token-aware.
+"""
+
+from cassandra import ConsistencyLevel
+import logging
+import threading
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Explicit column list instead of SELECT * so prepared result metadata stays
+# valid when new columns are added to the table.
+PRODUCT_COLUMNS = (
+    "product_id, name, category, price, original_price, unit, image_url, stock, "
+    "origin, description, user_id, created_at, updated_at, is_active, is_organic, "
+    "is_best_seller, free_shipping, image_variants"
+)
+_VALUES = "VALUES (" + ", ".join("?" * len(PRODUCT_COLUMNS.split(","))) + ")"
+
+# name -> (CQL, consistency level)
+PRODUCT_STATEMENTS: Dict[str, Tuple[str, int]] = {
+    "insert_product": (
+        f"INSERT INTO products ({PRODUCT_COLUMNS}) {_VALUES}",
+        ConsistencyLevel.ONE,
+    ),
+    "insert_product_if_not_exists": (
+        f"INSERT INTO products ({PRODUCT_COLUMNS}) {_VALUES} IF NOT EXISTS",
+        ConsistencyLevel.ONE,
+    ),
+    "insert_product_by_user": (
+        f"INSERT INTO products_by_user ({PRODUCT_COLUMNS}) {_VALUES}",
+        ConsistencyLevel.ONE,
+    ),
+    "insert_active_product": (
+        f"INSERT INTO active_products_by_shard (shard, {PRODUCT_COLUMNS}) {_VALUES[:-1]}, ?)",
+        ConsistencyLevel.ONE,
+    ),
+    "select_product_by_id": (
+        f"SELECT {PRODUCT_COLUMNS} FROM products WHERE product_id = ?",
+        ConsistencyLevel.ONE,
+    ),
+    "select_active_products": (
+        f"SELECT {PRODUCT_COLUMNS} FROM active_products_by_shard WHERE shard = ?",
+        ConsistencyLevel.ONE,
+    ),
+    "select_products_by_user": (
+        f"SELECT {PRODUCT_COLUMNS} FROM products_by_user WHERE user_id = ?",
+        ConsistencyLevel.ONE,
+    ),
+    "select_all_products": (
+        f"SELECT {PRODUCT_COLUMNS} FROM products",
+        ConsistencyLevel.ONE,
+    ),
+    "select_all_product_keys": (
+        "SELECT product_id, user_id FROM products",
+        ConsistencyLevel.ONE,
+    ),
+    "deactivate_product": (
+        "UPDATE products SET is_active = false WHERE product_id = ?",
+        ConsistencyLevel.ONE,
+    ),
+    "update_image_url": (
+        "UPDATE products SET image_url = ? WHERE product_id = ?",
+        ConsistencyLevel.ONE,
+    ),
+    "update_image_url_by_user": (
+        "UPDATE products_by_user SET image_url = ? WHERE user_id = ? AND product_id = ?",
+        ConsistencyLevel.ONE,
+    ),
+    "update_image_url_active": (
+        "UPDATE active_products_by_shard SET image_url = ? WHERE shard = ? AND product_id = ?",
+        ConsistencyLevel.ONE,
+    ),
+    "update_image_variants": (
+        "UPDATE products SET image_variants = ? WHERE product_id = ?",
+        ConsistencyLevel.ONE,
+    ),
+    "update_image_variants_by_user": (
+        "UPDATE products_by_user SET image_variants = ? WHERE user_id = ? AND product_id = ?",
+        ConsistencyLevel.ONE,
+    ),
+    "update_image_variants_active": (
+        "UPDATE active_products_by_shard SET image_variants = ? WHERE shard = ? AND product_id = ?",
+        ConsistencyLevel.ONE,
+    ),
+    "delete_product": (
+        "DELETE FROM products WHERE product_id = ?",
+        ConsistencyLevel.ONE,
+    ),
+    "delete_product_by_user": (
+        "DELETE FROM products_by_user WHERE user_id = ? AND product_id = ?",
+        ConsistencyLevel.ONE,
+    ),
+    "delete_active_product": (
+        "DELETE FROM active_products_by_shard WHERE shard = ? AND product_id = ?",
+        ConsistencyLevel.ONE,
+    ),
+}
+
+# Statements that can safely be retried or speculatively executed
+IDEMPOTENT_STATEMENTS = {
+    "select_product_by_id",
+    "select_active_products",
+    "select_products_by_user",
+    "select_all_products",
+    "select_all_product_keys",
+    "deactivate_product",
+    "update_image_url",
+    "update_image_url_by_user",
+    "update_image_url_active",
+    "update_image_variants",
+    "update_image_variants_by_user",
+    "update_image_variants_active",
+    "delete_product",
+    "delete_product_by_user",
+    "delete_active_product",
+}
+
+
+class PreparedStatementRegistry:
+    """
+    Registry of named prepared statements bound to a Cassandra session.
+
+    Features:
+    - Statements are prepared once per session (on connect)
+    - Automatic re-preparation when the session changes (reconnect)
+      or after invalidate() is called (schema change)
+    - Thread-safe lazy preparation of statements registered later
+    """
+
+    def __init__(self, statements: Optional[Dict[str, Tuple[str, int]]] = None):
+        self._definitions: Dict[str, Tuple[str, int]] = dict(statements or PRODUCT_STATEMENTS)
+        # CQL -> name, to label driver metrics of bound statements
+        self._names: Dict[str, str] = {query: name for name, (query, _) in self._definitions.items()}
+        self._prepared = {}
+        self._session = None
+        self._lock = threading.Lock()
+
+    def register(self, name: str, query: str, consistency_level=ConsistencyLevel.ONE) -> None:
+        """
+        Registers (or replaces) a named statement.
+
+        Args:
+            name (str): Statement name used by the database layer
+            query (str): CQL with ? placeholders
+            consistency_level: Consistency level for executions of the statement
+        """
+        with self._lock:
+            self._definitions[name] = (query, consistency_level)
+            self._names[query] = name
+            self._prepared.pop(name, None)
+
+    def prepare_all(self, session) -> None:
+        """
+        Prepares every registered statement against the given session.
+        Called by CassandraConnection.connect() once the keyspace and tables exist.
+        """
+        with self._lock:
+            self._session = session
+            self._prepared = {}
+            for name in self._definitions:
+                self._prepare(name)
+        logger.info(f"Prepared {len(self._prepared)} CQL statements")
+
+    def get(self, session, name: str):
+        """
+        Returns the prepared statement for name, preparing it if the session
+        changed since the last preparation or the statement is not prepared yet.
+
+        Raises:
+            KeyError: If no statement with that name is registered
+        """
+        prepared = self._prepared.get(name)
+        if prepared is not None and session is self._session:
+            return prepared
+        with self._lock:
+            if session is not self._session:
+                self._session = session
+                self._prepared = {}
+            prepared = self._prepared.get(name)
+            if prepared is None:
+                prepared = self._prepare(name)
+            return prepared
+
+    def name_for(self, query: str) -> Optional[str]:
+        """Registered name of a CQL string, or None if it is not a registry statement"""
+        return self._names.get(query)
+
+    def invalidate(self) -> None:
+        """
+        Drops every prepared statement so they are prepared again on next use.
+        Must be called after schema changes on the tables used by the statements.
+        """
+        with self._lock:
+            self._prepared = {}
+        logger.info("Prepared statement registry invalidated")
+
+    def _prepare(self, name: str):
+        query, consistency_level = self._definitions[name]
+        prepared = self._session.prepare(query)
+        prepared.consistency_level = consistency_level
+        prepared.is_idempotent = name in IDEMPOTENT_STATEMENTS
+        self._prepared[name] = prepared
+        return prepared
@@ -0,0 +1,71 @@
+"""
+Cassandra Query Tracing (Infrastructure Layer)
+Request init listener that opens a CLIENT span for every CQL request created
+inside a sampled trace (observability/tracing.py), whatever code path issued it.
+
+Span attributes:
+- db.system = cassandra, db.name = keyspace
+- db.statement.name: PreparedStatementRegistry name, "batch" or "other"
+- db.cassandra.rows_returned: rows in the first page
+- db.cassandra.coordinator and db.cassandra.retries
+
+Requests created outside a sampled trace (background jobs, the follow-up
+requests execute_concurrent sends from the driver's event loop thread) get no
+span, so tracing never creates orphan root spans for them.
+"""
+
+import logging
+from typing import Callable, Optional
+
+from Infrastructure.cassandra_request_metrics import statement_label
+from observability.tracing import CLIENT, current_span, get_tracer
+
+logger = logging.getLogger(__name__)
+
+
+class CqlTracingListener:
+    """Callable for Session.add_request_init_listener (registered when TRACING_ENABLED=true)"""
+
+    def __init__(self, statement_name: Callable[[str], Optional[str]], keyspace: str):
+        self._statement_name = statement_name
+        self.keyspace = keyspace
+
+    def __call__(self, response_future) -> None:
+        parent = current_span()
+        if parent is None or not parent.sampled:
+            return
+        name = statement_label(response_future.query, self._statement_name)
+        span = get_tracer().start_span(f"CQL {name}", CLIENT, {
+            "db.system": "cassandra",
+            "db.name": self.keyspace,
+            "db.statement.name": name,
+        }, parent=parent)
+
+        def on_success(rows):
+            if span.end_ns is not None:
+                # Following pages reuse the same future
+                return
+            try:
+                span.set_attribute("db.cassandra.rows_returned", len(rows))
+            except TypeError:
+                pass
+            self._finish(span, response_future)
+
+        def on_error(error):
+            span.record_exception(error)
+            self._finish(span, response_future)
+
+        try:
+            response_future.add_callbacks(callback=on_success, errback=on_error)
+        except Exception as e:
+            logger.error(f"Could not attach tracing callbacks: {str(e)}")
+
+    @staticmethod
+    def _finish(span, response_future) -> None:
+        coordinator = getattr(response_future, "coordinator_host", None)
+        if coordinator is not None:
+            span.set_attribute("db.cassandra.coordinator", str(coordinator))
+        retries = getattr(response_future, "_query_retries", 0)
+        if retries:
+            span.set_attribute("db.cassandra.retries", retries)
+        span.end()
@@ -0,0 +1,131 @@
+"""
+Image Processing Pipeline (Infrastructure Layer)
+Produces resized, metadata-free variants of uploaded product images in a
+background worker pool, so the create request only waits for the raw upload.
+
+Variants (longest side in pixels): thumbnail 160, card 480, detail 1200,
+encoded as WebP by default and named <productId>-<variant>-<hash><ext> so they
+can be served as immutable. Requires the optional Pillow package; without it
+the pipeline is disabled and products keep only the original image.
+"""
+
+from concurrent.futures import Future, ThreadPoolExecutor
+import hashlib
+import io
+import logging
+import os
+from typing import Callable, Dict, Optional
+
+from Infrastructure.local_image_storage import HASH_LENGTH
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # Pillow is optional
+    Image = None
+    ImageOps = None
+
+logger = logging.getLogger(__name__)
+
+VARIANT_SIZES = {
+    "thumbnail": 160,
+    "card": 480,
+    "detail": 1200,
+}
+
+FORMAT_EXTENSIONS = {"WEBP": ".webp", "AVIF": ".avif", "JPEG": ".jpg"}
+
+
+class ImagePipeline:
+    """
+    Background resizer for product images.
+
+    Features:
+    - Bounded worker pool (IMAGE_PIPELINE_WORKERS)
+    - EXIF orientation applied, then all metadata (EXIF/GPS/ICC comments) dropped
+    - Never upscales: small originals keep their size
+    - on_variants(product_id, {variant: url}) callback to persist the result
+    """
+
+    def __init__(self, directory: str, base_url: str,
+                 on_variants: Optional[Callable[[str, Dict[str, str]], None]] = None,
+                 workers: int = 2, image_format: str = "WEBP", quality: int = 80):
+        self.directory = directory
+        self.base_url = base_url if base_url.endswith("/") else base_url + "/"
+        self.on_variants = on_variants
+        self.image_format = image_format.upper()
+        self.quality = quality
+        self.enabled = Image is not None
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="image-pipeline") if self.enabled else None
+        if not self.enabled:
+            logger.warning("Pillow is not installed: image variants are disabled")
+        elif self.image_format not in FORMAT_EXTENSIONS:
+            raise ValueError(f"IMAGE_VARIANT_FORMAT must be one of {tuple(FORMAT_EXTENSIONS)}")
+
+    @classmethod
+    def from_env(cls, directory: str, base_url: str,
+                 on_variants: Optional[Callable[[str, Dict[str, str]], None]] = None) -> Optional["ImagePipeline"]:
+        """
+        Builds the pipeline from environment variables.
+        Returns None when IMAGE_PIPELINE_ENABLED is false.
+        """
+        if os.getenv("IMAGE_PIPELINE_ENABLED", "true").lower() != "true":
+            return None
+        return cls(
+            directory, base_url, on_variants=on_variants,
+            workers=int(os.getenv("IMAGE_PIPELINE_WORKERS", "2")),
+            image_format=os.getenv("IMAGE_VARIANT_FORMAT", "WEBP"),
+            quality=int(os.getenv("IMAGE_VARIANT_QUALITY", "80")),
+        )
+
+    def submit(self, product_id: str, source_path: str) -> Optional[Future]:
+        """
+        Queues the generation of every variant of source_path.
+        Returns the Future (resolving to {variant: url}) or None when disabled.
+        """
+        if not self.enabled:
+            return None
+        return self._executor.submit(self._process, product_id, source_path)
+
+    def shutdown(self, wait: bool = True) -> None:
+        if self._executor:
+            self._executor.shutdown(wait=wait)
+
+    def _process(self, product_id: str, source_path: str) -> Dict[str, str]:
+        try:
+            variants = self.generate_variants(product_id, source_path)
+            if self.on_variants:
+                self.on_variants(product_id, variants)
+            return variants
+        except Exception as e:
+            logger.error(f"Image pipeline failed for product {product_id}: {str(e)}")
+            raise
+
+    def generate_variants(self, product_id: str, source_path: str) -> Dict[str, str]:
+        """
+        Writes every variant next to the original under variants/ and returns their URLs.
+        """
+        output_dir = os.path.join(self.directory, "variants")
+        os.makedirs(output_dir, exist_ok=True)
+        extension = FORMAT_EXTENSIONS[self.image_format]
+
+        with Image.open(source_path) as original:
+            image = ImageOps.exif_transpose(original)
+            if image.mode not in ("RGB", "RGBA"):
+                image = image.convert("RGBA" if "A" in image.getbands() else "RGB")
+            if self.image_format == "JPEG" and image.mode == "RGBA":
+                image = image.convert("RGB")
+
+            variants = {}
+            for name, size in VARIANT_SIZES.items():
+                resized = image.copy()
+                resized.thumbnail((size, size), Image.LANCZOS)
+                # Drop any metadata carried over from the original
+                resized.info = {}
+                encoded = io.BytesIO()
+                resized.save(encoded, self.image_format, quality=self.quality, optimize=True)
+                data = encoded.getvalue()
+                filename = f"{product_id}-{name}-{hashlib.sha256(data).hexdigest()[:HASH_LENGTH]}{extension}"
+                with open(os.path.join(output_dir, filename), "wb") as f:
+                    f.write(data)
+                variants[name] = f"{self.base_url}variants/{filename}"
+        return variants
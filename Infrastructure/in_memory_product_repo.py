@@ -0,0 +1,225 @@
+"""
+In-Memory Product Repository (Infrastructure Layer)
+ProductRepository kept entirely in process memory, with the same semantics as
+AdapterProductRepo over Cassandra: duplicate IDs are rejected with the same
+error, listings only return active products, deactivation removes a product
+from every listing while it stays readable by ID, and image updates of unknown
+products are ignored.
+
+Used for test suites and local runs without a cluster, for benchmarks that
+measure pure application overhead (benchmarks/load) and, with
+PRODUCT_REPOSITORY=memory, as the repository of the service itself.
+Nothing is persisted: the catalog lives as long as the process.
+"""
+
+import copy
+import logging
+import threading
+from typing import Dict, Iterator, List, Optional
+
+from domain.entidades.product_model import Product
+from domain.entidades.product_page import ProductPage
+from domain.entidades.product_query import ProductQuery
+from domain.repositorio.product_repo import ProductRepository
+from Infrastructure.product_index import ProductIndex
+from Infrastructure.search_index import SearchIndex, decode_search_token, encode_search_token
+
+logger = logging.getLogger(__name__)
+
+# Unfiltered listing: active products by productId
+_ALL = ProductQuery()
+
+
+class InMemoryProductRepo(ProductRepository):
+    """
+    Thread-safe product repository over a dictionary and a ProductIndex.
+
+    Features:
+    - Hash map by productId with every product, active or not
+    - ProductIndex over the active catalog: user_id, category, origin, organic and
+      free-shipping hash indexes and sorted orders by productId, price and createdAt
+    - SearchIndex (BM25) over the name, category, origin and description of active products
+    - Keyset page tokens, so products created or deactivated between pages never shift the cursor
+    - One RLock around every write, so the map and the index never disagree
+
+    Stored entities are never mutated in place: writes store a copy of the
+    given Product and updates replace it, so products handed out by reads stay
+    consistent snapshots. Callers must treat returned products as read-only.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._products: Dict[str, Product] = {}
+        self._index = ProductIndex()
+        self._search = SearchIndex()
+
+    def _replace(self, product_id: str, **changes) -> bool:
+        """Copy-on-write update of a stored product; False if it does not exist"""
+        with self._lock:
+            current = self._products.get(product_id)
+            if current is None:
+                return False
+            updated = copy.copy(current)
+            for name, value in changes.items():
+                setattr(updated, name, value)
+            self._products[product_id] = updated
+            if updated.isActive:
+                self._index.add(updated)
+                self._search.add(updated)
+            else:
+                self._index.remove(product_id)
+                self._search.remove(product_id)
+            return True
+
+    # ===============================
+    # CREATE OPERATIONS
+    # ===============================
+
+    def add_product(self, product: Product, trusted_id: bool = False) -> Product:
+        """
+        Raises:
+            ValueError: If a product with the same ID already exists
+        """
+        stored = copy.copy(product)
+        with self._lock:
+            if product.productId in self._products:
+                raise ValueError("Ya existe un producto con ese ID")
+            self._products[product.productId] = stored
+            if stored.isActive:
+                self._index.add(stored)
+                self._search.add(stored)
+        return product
+
+    def add_products(self, products: List[Product], trusted_ids: List[bool]) -> List[Optional[str]]:
+        errors: List[Optional[str]] = []
+        with self._lock:
+            for product in products:
+                try:
+                    self.add_product(product)
+                    errors.append(None)
+                except ValueError as e:
+                    errors.append(str(e))
+        created = sum(1 for error in errors if error is None)
+        logger.info(f"Bulk insert: {created} products added, {len(products) - created} failed")
+        return errors
+
+    # ===============================
+    # READ OPERATIONS
+    # ===============================
+
+    def get_product_by_id(self, product_id: str) -> Optional[Product]:
+        return self._products.get(product_id)
+
+    def get_all_products(self) -> List[Product]:
+        return self._index.query(_ALL)[0]
+
+    def get_products_by_user_id(self, user_id: str) -> List[Product]:
+        return self._index.products_by_user(user_id)[0]
+
+    def get_all_products_page(self, limit: int, page_token: Optional[str] = None) -> ProductPage:
+        """
+        Raises:
+            ValueError: If the page token is invalid
+        """
+        products, next_token = self._index.query(_ALL, limit, page_token)
+        return ProductPage(items=products, nextPageToken=next_token)
+
+    def get_products_by_user_id_page(self, user_id: str, limit: int, page_token: Optional[str] = None) -> ProductPage:
+        """
+        Raises:
+            ValueError: If the page token is invalid
+        """
+        products, next_token = self._index.products_by_user(user_id, limit, page_token)
+        return ProductPage(items=products, nextPageToken=next_token)
+
+    def find_products(self, query: ProductQuery, limit: Optional[int] = None,
+                      page_token: Optional[str] = None) -> ProductPage:
+        """
+        Raises:
+            ValueError: If the page token is invalid
+        """
+        products, next_token = self._index.query(query, limit, page_token)
+        return ProductPage(items=products, nextPageToken=next_token)
+
+    def search_products(self, text: str, query: Optional[ProductQuery] = None, limit: int = 20,
+                        page_token: Optional[str] = None) -> ProductPage:
+        """
+        Raises:
+            ValueError: If the page token is invalid
+        """
+        offset = decode_search_token(page_token) if page_token else 0
+        products, more = self._search.search(text, query, limit, offset)
+        return ProductPage(items=products, nextPageToken=encode_search_token(offset + limit) if more else None)
+
+    def iter_all_products(self, page_size: int = 500) -> Iterator[Product]:
+        """Streams the active catalog one keyset page at a time (the lock is not held while the caller consumes)"""
+        page_token = None
+        while True:
+            page = self.get_all_products_page(page_size, page_token)
+            yield from page.items
+            page_token = page.nextPageToken
+            if page_token is None:
+                break
+
+    # ===============================
+    # UPDATE OPERATIONS
+    # ===============================
+
+    def update_product(self, product_id: str) -> bool:
+        """Deactivates a product; False if it does not exist"""
+        updated = self._replace(product_id, isActive=False)
+        if updated:
+            logger.info(f"Product {product_id} updated successfully")
+        return updated
+
+    def update_image_url(self, product_id: str, image_url: str) -> None:
+        if not self._replace(product_id, imageUrl=image_url):
+            logger.warning(f"Skipping update_image_url for unknown product {product_id}")
+
+    def update_image_variants(self, product_id: str, variants: Dict[str, str]) -> None:
+        if not self._replace(product_id, imageVariants=dict(variants)):
+            logger.warning(f"Skipping update_image_variants for unknown product {product_id}")
+
+    def clear(self) -> None:
+        """Removes every product (test cleanup)"""
+        with self._lock:
+            self._products.clear()
+            self._index = ProductIndex()
+            self._search = SearchIndex()
+
+    def __len__(self) -> int:
+        return len(self._products)
+
+
+class AsyncInMemoryProductRepo:
+    """
+    Read side of InMemoryProductRepo as coroutines for the ASGI serving mode
+    (same interface as AsyncAdapterProductRepo). Reads never block on I/O,
+    so they run inline on the event loop.
+    """
+
+    def __init__(self, repo: InMemoryProductRepo):
+        self.repo = repo
+
+    async def get_product_by_id(self, product_id: str):
+        return self.repo.get_product_by_id(product_id)
+
+    async def get_all_products(self):
+        return self.repo.get_all_products()
+
+    async def get_products_by_user_id(self, user_id: str):
+        return self.repo.get_products_by_user_id(user_id)
+
+    async def get_all_products_page(self, limit: int, page_token=None) -> ProductPage:
+        return self.repo.get_all_products_page(limit, page_token)
+
+    async def get_products_by_user_id_page(self, user_id: str, limit: int, page_token=None) -> ProductPage:
+        return self.repo.get_products_by_user_id_page(user_id, limit, page_token)
+
+    async def find_products(self, query: ProductQuery, limit=None, page_token=None) -> ProductPage:
+        return self.repo.find_products(query, limit, page_token)
+
+    async def iter_all_products(self, page_size: int = 500):
+        for product in self.repo.iter_all_products(page_size):
+            yield product
+
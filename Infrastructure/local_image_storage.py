@@ -0,0 +1,106 @@
+"""
+Local Image Storage (Infrastructure Layer)
+Stores uploaded product images under static/catalog and builds their public URLs.
+Resized variants are produced afterwards by the optional ImagePipeline.
+
+Files are named <productId>-<sha256[:12]><ext>, so a URL always maps to the same
+bytes and can be cached by browsers and CDNs as immutable.
+"""
+
+import hashlib
+import logging
+import os
+import re
+import tempfile
+from typing import Tuple
+from werkzeug.utils import secure_filename
+
+from domain.repositorio.image_storage import ImageStorage
+from observability.stages import IMAGE_SAVE, track_stage
+
+logger = logging.getLogger(__name__)
+
+HASH_LENGTH = 12
+_HASHED_NAME = re.compile(r"-[0-9a-f]{%d}\.[A-Za-z0-9]+$" % HASH_LENGTH)
+
+
+def content_hash(path: str, chunk_size: int = 1024 * 1024) -> str:
+    """First HASH_LENGTH hex chars of the SHA-256 of a file, read in chunks"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()[:HASH_LENGTH]
+
+
+def is_content_hashed(filename: str) -> bool:
+    """True for names produced by LocalImageStorage/ImagePipeline (<name>-<hash><ext>)"""
+    return _HASHED_NAME.search(filename) is not None
+
+
+class LocalImageStorage(ImageStorage):
+    """
+    Saves product images on the local filesystem, named after the productId
+    and a hash of their content.
+    """
+
+    def __init__(self, directory: str = None, base_url: str = None, pipeline=None):
+        self.directory = directory or os.getenv("IMAGE_DIRECTORY", os.path.join("static", "catalog"))
+        self.base_url = base_url or os.getenv("IMAGE_BASE_URL", "http://localhost:5000/static/catalog/")
+        if not self.base_url.endswith("/"):
+            self.base_url += "/"
+        self.pipeline = pipeline
+
+    def save(self, product_id: str, image) -> Tuple[str, bool]:
+        """
+        Writes the uploaded file as <product_id>-<hash><ext>.
+        Returns its public URL and whether this call created the file: an
+        identical image already stored under that name is left untouched and
+        reported as not created, so a rollback never deletes a live product's image.
+        """
+        with track_stage(IMAGE_SAVE):
+            ext = os.path.splitext(secure_filename(image.filename or ""))[1]
+            # Unique upload name, so concurrent uploads for the same productId never share a file
+            fd, upload_path = tempfile.mkstemp(dir=self.directory, prefix=f".{product_id}-", suffix=f".upload{ext}")
+            os.close(fd)
+            try:
+                image.save(upload_path)
+                filename = f"{product_id}-{content_hash(upload_path)}{ext}"
+                try:
+                    # link() fails instead of overwriting when the file already exists
+                    os.link(upload_path, os.path.join(self.directory, filename))
+                    created = True
+                except FileExistsError:
+                    created = False
+            finally:
+                os.remove(upload_path)
+        return self.base_url + filename, created
+
+    def delete(self, image_url: str) -> None:
+        """
+        Removes an image saved by this storage. URLs from other origins are ignored.
+        """
+        path = self._path_for(image_url)
+        if path is None:
+            return
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.error(f"Failed to delete image {path}: {str(e)}")
+
+    def process_async(self, product_id: str, image_url: str) -> None:
+        """
+        Hands the stored original to the image pipeline (if configured) to build its variants.
+        """
+        path = self._path_for(image_url)
+        if self.pipeline is not None and path is not None:
+            self.pipeline.submit(product_id, path)
+
+    def _path_for(self, image_url: str):
+        """Maps a URL produced by save() back to its file; None for other origins"""
+        if not image_url or not image_url.startswith(self.base_url):
+            return None
+        filename = secure_filename(image_url[len(self.base_url):])
+        return os.path.join(self.directory, filename)
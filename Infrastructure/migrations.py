@@ -0,0 +1,185 @@
+"""
+Schema Migrations (Infrastructure Layer)
+Versioned Cassandra schema changes, applied by a separate command instead of
+on every process start. Applied versions are recorded in the schema_migrations
+table of the service keyspace; workers only read the latest version on connect
+(check_schema) and refuse to serve while the schema is behind the code.
+
+Usage:
+    python -m Infrastructure.migrations status
+    python -m Infrastructure.migrations migrate [--target N]
+
+Run it from a single place (deploy job, init container) before rolling out
+workers. Every step is idempotent, so re-running after a failure is safe.
+"""
+
+import argparse
+import logging
+import os
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import List, Optional, Tuple
+
+from cassandra import InvalidRequest
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_TABLE = "schema_migrations"
+# Single partition holding every applied version, newest first
+MIGRATIONS_SCOPE = "productos"
+DEFAULT_REPLICATION = "{'class': 'SimpleStrategy', 'replication_factor': 1}"
+
+_PRODUCT_COLUMNS = """
+    product_id TEXT,
+    name TEXT,
+    category TEXT,
+    price DOUBLE,
+    original_price DOUBLE,
+    unit TEXT,
+    image_url TEXT,
+    stock INT,
+    origin TEXT,
+    description TEXT,
+    user_id TEXT,
+    created_at DATE,
+    updated_at DATE,
+    is_active BOOLEAN,
+    is_organic BOOLEAN,
+    is_best_seller BOOLEAN,
+    free_shipping BOOLEAN,
+"""
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    description: str
+    statements: Tuple[str, ...]
+
+
+MIGRATIONS: Tuple[Migration, ...] = (
+    Migration(1, "products table", (
+        f"CREATE TABLE IF NOT EXISTS products ({_PRODUCT_COLUMNS} PRIMARY KEY (product_id))",
+    )),
+    Migration(2, "query tables products_by_user and active_products_by_shard", (
+        f"CREATE TABLE IF NOT EXISTS products_by_user ({_PRODUCT_COLUMNS} PRIMARY KEY ((user_id), product_id))",
+        f"CREATE TABLE IF NOT EXISTS active_products_by_shard (shard INT, {_PRODUCT_COLUMNS} PRIMARY KEY ((shard), product_id))",
+    )),
+    Migration(3, "image_variants column", (
+        "ALTER TABLE products ADD image_variants MAP<TEXT, TEXT>",
+        "ALTER TABLE products_by_user ADD image_variants MAP<TEXT, TEXT>",
+        "ALTER TABLE active_products_by_shard ADD image_variants MAP<TEXT, TEXT>",
+    )),
+)
+
+LATEST_VERSION = MIGRATIONS[-1].version
+
+
+class SchemaVersionError(Exception):
+    """The keyspace schema is older than the version this code needs"""
+
+
+def _already_applied(error: InvalidRequest) -> bool:
+    # ALTER TABLE ... ADD on a column created by an earlier run or by the old startup DDL
+    message = str(error).lower()
+    return "already exist" in message or "conflicts with an existing column" in message
+
+
+def create_keyspace(session, keyspace: str, replication: str = DEFAULT_REPLICATION) -> None:
+    session.execute(f"CREATE KEYSPACE IF NOT EXISTS {keyspace} WITH REPLICATION = {replication}")
+    logger.info(f"Keyspace '{keyspace}' ready")
+
+
+def current_version(session, keyspace: str) -> int:
+    """Latest applied version, or 0 if the keyspace has never been migrated"""
+    try:
+        row = session.execute(
+            f"SELECT version FROM {keyspace}.{MIGRATIONS_TABLE} WHERE scope = %s LIMIT 1",
+            (MIGRATIONS_SCOPE,),
+        ).one()
+    except InvalidRequest:
+        # Keyspace or schema_migrations table does not exist yet
+        return 0
+    if row is None:
+        return 0
+    return row[0]
+
+
+def migrate(session, keyspace: str, target: Optional[int] = None,
+            replication: str = DEFAULT_REPLICATION) -> List[Migration]:
+    """
+    Applies the pending migrations up to target (default: latest) in order.
+    Returns the migrations applied by this call.
+    """
+    target = LATEST_VERSION if target is None else target
+    create_keyspace(session, keyspace, replication)
+    session.set_keyspace(keyspace)
+    session.execute(
+        f"CREATE TABLE IF NOT EXISTS {MIGRATIONS_TABLE} ("
+        "scope TEXT, version INT, description TEXT, applied_at TIMESTAMP, "
+        "PRIMARY KEY ((scope), version)) WITH CLUSTERING ORDER BY (version DESC)"
+    )
+    version = current_version(session, keyspace)
+    applied = []
+    for migration in MIGRATIONS:
+        if migration.version <= version or migration.version > target:
+            continue
+        logger.info(f"Applying migration {migration.version}: {migration.description}")
+        for statement in migration.statements:
+            try:
+                session.execute(statement)
+            except InvalidRequest as e:
+                if not _already_applied(e):
+                    raise
+        session.execute(
+            f"INSERT INTO {MIGRATIONS_TABLE} (scope, version, description, applied_at) VALUES (%s, %s, %s, %s)",
+            (MIGRATIONS_SCOPE, migration.version, migration.description, datetime.now(timezone.utc)),
+        )
+        applied.append(migration)
+    return applied
+
+
+def check_schema(session, keyspace: str) -> int:
+    """
+    Startup check: one single-partition read instead of running DDL.
+
+    Raises:
+        SchemaVersionError: If migrations are pending
+    """
+    version = current_version(session, keyspace)
+    if version < LATEST_VERSION:
+        raise SchemaVersionError(
+            f"Schema version {version} is behind {LATEST_VERSION}: run python -m Infrastructure.migrations migrate"
+        )
+    return version
+
+
+def main():
+    from Infrastructure.cassandra_connection import CassandraConnection
+
+    parser = argparse.ArgumentParser(description="Migraciones del esquema de Cassandra del servicio de productos")
+    parser.add_argument("command", choices=("status", "migrate"))
+    parser.add_argument("--target", type=int, default=None, help="Versión destino (por defecto, la última)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    connection = CassandraConnection()
+    session = connection.open_cluster_session()
+    try:
+        if args.command == "status":
+            version = current_version(session, connection.keyspace)
+            print(f"📋 Esquema en la versión {version} (última disponible: {LATEST_VERSION})")
+            for migration in MIGRATIONS:
+                mark = "✅" if migration.version <= version else "⏳"
+                print(f"  {mark} {migration.version}: {migration.description}")
+        else:
+            replication = os.getenv("CASSANDRA_REPLICATION", DEFAULT_REPLICATION)
+            applied = migrate(session, connection.keyspace, args.target, replication)
+            print(f"✅ {len(applied)} migraciones aplicadas; esquema en la versión "
+                  f"{current_version(session, connection.keyspace)}")
+    finally:
+        connection.disconnect()
+
+
+if __name__ == "__main__":
+    main()
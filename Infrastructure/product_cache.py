@@ -0,0 +1,188 @@
+"""
+Product Cache (Infrastructure Layer)
+Bounded read-through cache placed in front of the product repository for
+point lookups. Supports TTL expiry, LRU eviction, negative caching of unknown
+IDs and explicit invalidation from the write path.
+
+Storage is pluggable (see cache_backends): in-memory per worker, or a shared
+Redis-protocol store with a short-lived local near cache and pub/sub invalidation.
+"""
+
+import copy
+import json
+import logging
+import os
+import threading
+import time
+from typing import Awaitable, Callable, Optional
+
+from domain.entidades.product_model import Product
+from Infrastructure.cache_backends import (
+    CacheBackend, InMemoryCacheBackend, LRUTTLCache, RedisCacheBackend,
+)
+from observability.metrics import CACHE_EVICTIONS, CACHE_HITS, CACHE_MISSES
+
+logger = logging.getLogger(__name__)
+
+# Stored in place of a product to remember that an ID does not exist
+_MISSING = object()
+
+
+class ProductCache:
+    """
+    Read-through cache of Product entities keyed by productId.
+
+    Features:
+    - Negative caching of unknown IDs with a shorter TTL
+    - Returns copies so callers cannot mutate cached entries
+    - Loads racing with an invalidation are not stored (no stale resurrection)
+    - Shared backends: JSON values plus a local near cache kept coherent via pub/sub
+      (bypassed while the invalidation subscription is down)
+    - Hit/miss/eviction counters exported to Prometheus
+    """
+
+    def __init__(self, max_entries: int = 10000, ttl: float = 60.0, negative_ttl: float = 10.0,
+                 name: str = "product", clock: Callable[[], float] = time.monotonic,
+                 backend: Optional[CacheBackend] = None, local_ttl: float = 5.0):
+        self.name = name
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        on_evict = CACHE_EVICTIONS.labels(cache=name).inc
+        self.backend = backend if backend is not None else InMemoryCacheBackend(
+            max_entries, ttl, clock=clock, on_evict=on_evict
+        )
+        # Near cache in front of shared backends; entries live at most local_ttl seconds
+        self._local = None
+        if self.backend.shared and local_ttl > 0:
+            self._local = LRUTTLCache(max_entries, local_ttl, clock=clock, on_evict=on_evict)
+        self._hits = CACHE_HITS.labels(cache=name)
+        self._misses = CACHE_MISSES.labels(cache=name)
+        self._invalidations = 0
+        self._lock = threading.Lock()
+        self.backend.subscribe_invalidations(self._on_remote_invalidation)
+
+    @classmethod
+    def from_env(cls) -> Optional["ProductCache"]:
+        """
+        Builds the cache from environment variables.
+        Returns None when PRODUCT_CACHE_ENABLED is false.
+        PRODUCT_CACHE_BACKEND selects "memory" (default) or "redis".
+        """
+        if os.getenv("PRODUCT_CACHE_ENABLED", "true").lower() != "true":
+            return None
+        backend = None
+        if os.getenv("PRODUCT_CACHE_BACKEND", "memory").lower() == "redis":
+            backend = RedisCacheBackend(os.getenv("PRODUCT_CACHE_REDIS_URL", "redis://localhost:6379/0"))
+        return cls(
+            max_entries=int(os.getenv("PRODUCT_CACHE_MAX_ENTRIES", "10000")),
+            ttl=float(os.getenv("PRODUCT_CACHE_TTL_SECONDS", "60")),
+            negative_ttl=float(os.getenv("PRODUCT_CACHE_NEGATIVE_TTL_SECONDS", "10")),
+            backend=backend,
+            local_ttl=float(os.getenv("PRODUCT_CACHE_LOCAL_TTL_SECONDS", "5")),
+        )
+
+    def get_or_load(self, product_id: str, loader: Callable[[str], Optional[Product]]) -> Optional[Product]:
+        """
+        Returns the cached product or loads it with loader(product_id) and caches the result.
+        None results are cached for negative_ttl seconds.
+        """
+        found, product = self._lookup(product_id)
+        if found:
+            return product
+        generation = self._invalidations
+        product = loader(product_id)
+        self._store(product_id, product, generation)
+        return product
+
+    async def aget_or_load(self, product_id: str, loader: Callable[[str], Awaitable[Optional[Product]]]) -> Optional[Product]:
+        """
+        Async variant of get_or_load for the ASGI mode: loader is a coroutine function.
+        Cache lookups stay synchronous (in memory, or a short-timeout Redis call).
+        """
+        found, product = self._lookup(product_id)
+        if found:
+            return product
+        generation = self._invalidations
+        product = await loader(product_id)
+        self._store(product_id, product, generation)
+        return product
+
+    def invalidate(self, product_id: str) -> None:
+        """Drops a product (or its negative entry) after a write, in every worker"""
+        with self._lock:
+            self._invalidations += 1
+            if self._local is not None:
+                self._local.delete(product_id)
+            self.backend.delete(product_id)
+        self.backend.publish_invalidation(product_id)
+
+    def clear(self) -> None:
+        """Drops every entry (test cleanup); loads in flight are not stored"""
+        with self._lock:
+            self._invalidations += 1
+            if self._local is not None:
+                self._local.clear()
+            self.backend.clear()
+
+    def close(self) -> None:
+        self.backend.close()
+
+    def _lookup(self, product_id: str):
+        """Returns (found, product copy or None) from the near cache or the backend"""
+        if self._local is not None and self.backend.subscribed:
+            found, value = self._local.get(product_id)
+            if found:
+                self._hits.inc()
+                return True, (None if value is _MISSING else copy.copy(value))
+
+        found, value = self.backend.get(product_id)
+        if found:
+            self._hits.inc()
+            value = self._decode(value)
+            self._set_local(product_id, value)
+            return True, (None if value is _MISSING else copy.copy(value))
+
+        self._misses.inc()
+        return False, None
+
+    def _store(self, product_id: str, product: Optional[Product], generation: int) -> None:
+        value = _MISSING if product is None else copy.copy(product)
+        with self._lock:
+            # Skip the store if a write invalidated entries while we were loading
+            if generation == self._invalidations:
+                self.backend.set(product_id, self._encode(value), self._ttl_for(value))
+                self._set_local(product_id, value)
+
+    def _on_remote_invalidation(self, product_id: str) -> None:
+        with self._lock:
+            self._invalidations += 1
+            if self._local is not None:
+                self._local.delete(product_id)
+
+    def _ttl_for(self, value) -> float:
+        return self.negative_ttl if value is _MISSING else self.ttl
+
+    def _set_local(self, product_id: str, value) -> None:
+        # Without the invalidation channel a near copy could outlive a write in another worker
+        if self._local is not None and self.backend.subscribed:
+            self._local.set(product_id, value, ttl=min(self._ttl_for(value), self._local.ttl))
+
+    def _encode(self, value):
+        """Shared backends store JSON bytes; local backends store the entity itself"""
+        if not self.backend.shared:
+            return value
+        if value is _MISSING:
+            return b"null"
+        return json.dumps(value.toDictionary()).encode("utf-8")
+
+    def _decode(self, value):
+        if not self.backend.shared:
+            return value
+        data = json.loads(value)
+        if data is None:
+            return _MISSING
+        data.pop("inStock", None)
+        return Product(**data)
+
+    def __len__(self) -> int:
+        return len(self.backend) if hasattr(self.backend, "__len__") else 0
@@ -0,0 +1,479 @@
+"""
+Product Index (Infrastructure Layer)
+In-process secondary indexes over active Product entities that answer the
+filtered and sorted listings of GET /products (ProductQuery) in time
+proportional to the number of results instead of the catalog size.
+
+ProductIndex holds the indexes; InMemoryProductRepo keeps one over its active
+products and AdapterProductRepo keeps a CatalogIndex: a ProductIndex of the
+active Cassandra catalog, loaded on the first filtered request and rebuilt in
+the background every PRODUCT_INDEX_TTL_SECONDS. Writes made through the same
+process are applied to it immediately; writes from other workers show up after
+the next rebuild.
+"""
+
+import base64
+import binascii
+import bisect
+import copy
+import json
+import logging
+import math
+import os
+import threading
+import time
+import unicodedata
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from domain.entidades.product_model import Product
+from domain.entidades.product_query import ProductQuery
+
+logger = logging.getLogger(__name__)
+
+# Sorted orders: default (productId) and the ProductQuery sort fields
+ORDERS = (None, "price", "createdAt")
+
+
+def normalize_term(value) -> str:
+    """Casefolded text without accents, so "Boyacá" and "boyaca" match"""
+    text = unicodedata.normalize("NFKD", str(value)).casefold()
+    return "".join(c for c in text if not unicodedata.combining(c)).strip()
+
+
+def price_key(product: Product) -> float:
+    """Sort key of the price; missing or NaN prices sort last"""
+    price = product.price
+    if price is None or (isinstance(price, float) and math.isnan(price)):
+        return math.inf
+    return float(price)
+
+
+def created_key(product: Product) -> int:
+    return product.createdAt.toordinal() if product.createdAt is not None else 0
+
+
+def sort_key(field: Optional[str], product: Product):
+    if field == "price":
+        return price_key(product)
+    if field == "createdAt":
+        return created_key(product)
+    return ""
+
+
+def matches_query(product: Product, query: ProductQuery) -> bool:
+    """Filters of the query checked on a single product (sort is ignored)"""
+    if query.category is not None and normalize_term(product.category) != normalize_term(query.category):
+        return False
+    if query.origin is not None and normalize_term(product.origin) != normalize_term(query.origin):
+        return False
+    if query.isOrganic is not None and bool(product.isOrganic) != query.isOrganic:
+        return False
+    if query.freeShipping is not None and bool(product.freeShipping) != query.freeShipping:
+        return False
+    if query.minPrice is not None and price_key(product) < query.minPrice:
+        return False
+    return query.maxPrice is None or price_key(product) <= query.maxPrice
+
+
+def encode_page_token(field: Optional[str], key, product_id: str) -> str:
+    """Opaque keyset token: urlsafe base64 of [sort field, sort key, productId] of the last item"""
+    raw = json.dumps([field, key, product_id], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_page_token(token: str, field: Optional[str]) -> Tuple:
+    """
+    Returns the (sort key, productId) cursor of a token issued for the same sort.
+
+    Raises:
+        ValueError: If the token is malformed or belongs to another sort
+    """
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        token_field, key, product_id = json.loads(raw)
+    except (binascii.Error, ValueError, TypeError):
+        raise ValueError("page_token inválido")
+    if token_field != field or not isinstance(product_id, str):
+        raise ValueError("page_token inválido")
+    return key, product_id
+
+
+class ProductIndex:
+    """
+    Secondary indexes over a set of active products.
+
+    Features:
+    - Hash indexes: productId, user_id (sorted productIds), category and origin
+      (normalized with normalize_term), organic and free-shipping products
+    - Sorted (key, productId) orders by productId, price and createdAt (bisect)
+    - query(): either walks the sort order from the page cursor or sorts the
+      matches of the most selective index, whichever visits fewer entries, and
+      pages with keyset tokens
+    - One RLock around every read and write
+
+    Products are stored as given and never modified; replace() swaps in a copy.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._products: Dict[str, Product] = {}
+        self._by_user: Dict[str, List[str]] = {}
+        self._by_category: Dict[str, Set[str]] = {}
+        self._by_origin: Dict[str, Set[str]] = {}
+        self._organic: Set[str] = set()
+        self._free_shipping: Set[str] = set()
+        self._orders: Dict[Optional[str], List[Tuple]] = {field: [] for field in ORDERS}
+
+    @classmethod
+    def from_products(cls, products: Iterable[Product]) -> "ProductIndex":
+        """Bulk build: appends everything and sorts each order once"""
+        index = cls()
+        for product in products:
+            if product.productId in index._products:
+                continue
+            index._add_hashes(product)
+            index._by_user.setdefault(product.user_id, []).append(product.productId)
+            for field, order in index._orders.items():
+                order.append((sort_key(field, product), product.productId))
+        for order in index._orders.values():
+            order.sort()
+        for user_ids in index._by_user.values():
+            user_ids.sort()
+        return index
+
+    # ===============================
+    # WRITES
+    # ===============================
+
+    def _add_hashes(self, product: Product) -> None:
+        # Every hash index except user_id, whose lists are kept sorted
+        product_id = product.productId
+        self._products[product_id] = product
+        self._by_category.setdefault(normalize_term(product.category), set()).add(product_id)
+        self._by_origin.setdefault(normalize_term(product.origin), set()).add(product_id)
+        if product.isOrganic:
+            self._organic.add(product_id)
+        if product.freeShipping:
+            self._free_shipping.add(product_id)
+
+    def add(self, product: Product) -> None:
+        """Adds a product, replacing the one with the same productId if any"""
+        with self._lock:
+            self.remove(product.productId)
+            self._add_hashes(product)
+            bisect.insort(self._by_user.setdefault(product.user_id, []), product.productId)
+            for field, order in self._orders.items():
+                bisect.insort(order, (sort_key(field, product), product.productId))
+
+    def remove(self, product_id: str) -> Optional[Product]:
+        """Removes a product from every index; returns it, or None if it was not indexed"""
+        with self._lock:
+            product = self._products.pop(product_id, None)
+            if product is None:
+                return None
+            _remove_sorted(self._by_user, product.user_id, product_id)
+            _discard(self._by_category, normalize_term(product.category), product_id)
+            _discard(self._by_origin, normalize_term(product.origin), product_id)
+            self._organic.discard(product_id)
+            self._free_shipping.discard(product_id)
+            for field, order in self._orders.items():
+                entry = (sort_key(field, product), product_id)
+                i = bisect.bisect_left(order, entry)
+                if i < len(order) and order[i] == entry:
+                    del order[i]
+            return product
+
+    def replace(self, product_id: str, **changes) -> Optional[Product]:
+        """Re-indexes a copy of the product with the given field changes; None if it was not indexed"""
+        with self._lock:
+            current = self._products.get(product_id)
+            if current is None:
+                return None
+            updated = copy.copy(current)
+            for name, value in changes.items():
+                setattr(updated, name, value)
+            self.add(updated)
+            return updated
+
+    # ===============================
+    # READS
+    # ===============================
+
+    def get(self, product_id: str) -> Optional[Product]:
+        return self._products.get(product_id)
+
+    def __len__(self) -> int:
+        return len(self._products)
+
+    def products_by_user(self, user_id: str, limit: Optional[int] = None,
+                         page_token: Optional[str] = None) -> Tuple[List[Product], Optional[str]]:
+        """
+        Products of a user ordered by productId, optionally one keyset page.
+
+        Raises:
+            ValueError: If the page token is invalid
+        """
+        cursor = decode_page_token(page_token, None)[1] if page_token else None
+        with self._lock:
+            ids = self._by_user.get(user_id, [])
+            start = bisect.bisect_right(ids, cursor) if cursor is not None else 0
+            end = len(ids) if limit is None else start + limit
+            products = [self._products[product_id] for product_id in ids[start:end]]
+        next_token = None
+        if limit is not None and products and end < len(ids):
+            next_token = encode_page_token(None, "", products[-1].productId)
+        return products, next_token
+
+    def query(self, query: ProductQuery, limit: Optional[int] = None,
+              page_token: Optional[str] = None) -> Tuple[List[Product], Optional[str]]:
+        """
+        Active products matching every filter of the query, in its sort order
+        (ties by productId). With a limit, returns one page and the next token.
+
+        Raises:
+            ValueError: If the page token is invalid
+        """
+        field = query.sort_field
+        cursor = decode_page_token(page_token, field) if page_token else None
+        with self._lock:
+            matches = self._matcher(query)
+            entries = self._orders[field]
+            lo, hi = 0, len(entries)
+            if field == "price":
+                lo, hi = self._price_bounds(query)
+            candidates, selectivity = self._plan(query)
+            # Entries visited when walking the order: a page stops after limit + 1 matches
+            walk = hi - lo if limit is None or selectivity == 0 else min(hi - lo, (limit + 1) / selectivity)
+            if candidates is not None and candidates[0] < walk:
+                # Sorting the matches of the most selective index is cheaper than walking the order
+                entries = sorted(
+                    (sort_key(field, product), product_id)
+                    for product_id in candidates[1]()
+                    if matches(product_id, product := self._products[product_id])
+                )
+                lo, hi = 0, len(entries)
+                filtered = True
+            else:
+                filtered = False
+
+            if cursor is not None:
+                if query.descending:
+                    hi = max(lo, bisect.bisect_left(entries, cursor, lo, hi))
+                else:
+                    lo = min(hi, bisect.bisect_right(entries, cursor, lo, hi))
+
+            products = []
+            positions = range(hi - 1, lo - 1, -1) if query.descending else range(lo, hi)
+            for i in positions:
+                product_id = entries[i][1]
+                product = self._products[product_id]
+                if not filtered and not matches(product_id, product):
+                    continue
+                products.append(product)
+                if limit is not None and len(products) > limit:
+                    break
+
+        next_token = None
+        if limit is not None and len(products) > limit:
+            products = products[:limit]
+            last = products[-1]
+            next_token = encode_page_token(field, sort_key(field, last), last.productId)
+        return products, next_token
+
+    def _price_bounds(self, query: ProductQuery) -> Tuple[int, int]:
+        """[lo, hi) positions of the price range in the price order"""
+        order = self._orders["price"]
+        lo = 0 if query.minPrice is None else bisect.bisect_left(order, (query.minPrice, ""))
+        hi = len(order) if query.maxPrice is None else bisect.bisect_left(order, (math.nextafter(query.maxPrice, math.inf), ""))
+        return lo, hi
+
+    def _plan(self, query: ProductQuery):
+        """
+        Returns ((size, ids loader) of the smallest index holding every match, or None)
+        and the expected fraction of matching entries in the sort order walk, taking
+        the filters as independent.
+        """
+        total = len(self._products) or 1
+        sources = []
+        selectivity = 1.0
+        for ids, wanted in self._set_filters(query):
+            size = len(ids) if wanted else total - len(ids)
+            selectivity *= size / total
+            if wanted:
+                sources.append((len(ids), lambda ids=ids: ids))
+        if (query.minPrice is not None or query.maxPrice is not None) and query.sort_field != "price":
+            lo, hi = self._price_bounds(query)
+            selectivity *= (hi - lo) / total
+            order = self._orders["price"]
+            sources.append((hi - lo, lambda: [product_id for _, product_id in order[lo:hi]]))
+        return (min(sources, key=lambda source: source[0]) if sources else None), selectivity
+
+    def _set_filters(self, query: ProductQuery):
+        """(productIds, wanted) per hash-indexed filter: members if wanted, otherwise non-members"""
+        if query.category is not None:
+            yield self._by_category.get(normalize_term(query.category), ()), True
+        if query.origin is not None:
+            yield self._by_origin.get(normalize_term(query.origin), ()), True
+        if query.isOrganic is not None:
+            yield self._organic, query.isOrganic
+        if query.freeShipping is not None:
+            yield self._free_shipping, query.freeShipping
+
+    def _matcher(self, query: ProductQuery) -> Callable[[str, Product], bool]:
+        """Predicate over (productId, product) checking every filter of the query"""
+        set_filters = list(self._set_filters(query))
+        min_price = -math.inf if query.minPrice is None else query.minPrice
+        max_price = math.inf if query.maxPrice is None else query.maxPrice
+        check_price = query.minPrice is not None or query.maxPrice is not None
+
+        def matches(product_id: str, product: Product) -> bool:
+            for ids, wanted in set_filters:
+                if (product_id in ids) != wanted:
+                    return False
+            return not check_price or min_price <= price_key(product) <= max_price
+
+        return matches
+
+
+class CatalogIndex:
+    """
+    ProductIndex (or another index built by factory, such as the SearchIndex)
+    of the active catalog of a database, rebuilt periodically.
+
+    Features:
+    - Built on first use from loader() (a full scan of the active catalog), or
+      taken from warm_start() (e.g. a snapshot on disk) when it returns one
+    - Stale after ttl seconds: reads keep using the current index while a
+      daemon thread rebuilds it, so only the first filtered request waits
+    - Writes of this process are applied right away and replayed on top of a
+      rebuild that was in progress when they happened
+    - on_built(index) runs in a daemon thread after every build from the loader
+    """
+
+    def __init__(self, loader: Callable[[], Iterable[Product]], ttl: float = 60.0,
+                 clock: Callable[[], float] = time.monotonic,
+                 factory: Callable[[Iterable[Product]], object] = None,
+                 warm_start: Callable[[], Optional[Tuple[object, float]]] = None,
+                 on_built: Callable[[object], None] = None, name: str = "product-index"):
+        self._loader = loader
+        self.ttl = ttl
+        self._clock = clock
+        self._factory = factory if factory is not None else ProductIndex.from_products
+        # () -> (index, age in seconds) or None
+        self._warm_start = warm_start
+        self._on_built = on_built
+        self.name = name
+        self._index = None
+        self._built_at = 0.0
+        self._pending: Optional[List[Callable]] = None
+        self._refreshing = False
+        self._lock = threading.Lock()
+        self._build_lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, loader: Callable[[], Iterable[Product]]) -> "CatalogIndex":
+        return cls(loader, ttl=float(os.getenv("PRODUCT_INDEX_TTL_SECONDS", "60")))
+
+    def get(self):
+        """Current index, building it if needed and scheduling a rebuild when stale"""
+        index = self._index
+        if index is None:
+            with self._build_lock:
+                if self._index is None and not self._load_warm_start():
+                    self._rebuild()
+                return self._index
+        if self._clock() - self._built_at >= self.ttl:
+            with self._lock:
+                start = not self._refreshing
+                self._refreshing = True
+            if start:
+                threading.Thread(target=self._refresh, name=f"{self.name}-refresh", daemon=True).start()
+        return index
+
+    def _load_warm_start(self) -> bool:
+        if self._warm_start is None:
+            return False
+        try:
+            warm = self._warm_start()
+        except Exception as e:
+            logger.error(f"Could not warm start {self.name}: {str(e)}")
+            return False
+        if warm is None:
+            return False
+        index, age = warm
+        with self._lock:
+            self._index = index
+            # An old snapshot is served right away and rebuilt in the background
+            self._built_at = self._clock() - age
+        logger.info(f"{self.name} warm started: {len(index)} active products, {age:.0f}s old")
+        return True
+
+    def _refresh(self) -> None:
+        try:
+            with self._build_lock:
+                self._rebuild()
+        except Exception as e:
+            # The previous index keeps serving; the next stale read retries
+            logger.error(f"{self.name} rebuild failed: {str(e)}")
+        finally:
+            with self._lock:
+                self._refreshing = False
+
+    def _rebuild(self) -> None:
+        start = time.perf_counter()
+        with self._lock:
+            self._pending = []
+        try:
+            index = self._factory(self._loader())
+        except Exception:
+            with self._lock:
+                self._pending = None
+            raise
+        with self._lock:
+            for change in self._pending:
+                change(index)
+            self._pending = None
+            self._index = index
+            self._built_at = self._clock()
+        logger.info(f"{self.name} built: {len(index)} active products in {time.perf_counter() - start:.2f}s")
+        if self._on_built is not None:
+            threading.Thread(target=self._after_build, args=(index,), name=f"{self.name}-built", daemon=True).start()
+
+    def _after_build(self, index) -> None:
+        try:
+            self._on_built(index)
+        except Exception as e:
+            logger.error(f"{self.name} post-build hook failed: {str(e)}")
+
+    def apply(self, change: Callable) -> None:
+        """Applies a write to the current index and to the one being rebuilt"""
+        with self._lock:
+            if self._index is not None:
+                change(self._index)
+            if self._pending is not None:
+                self._pending.append(change)
+
+    def invalidate(self) -> None:
+        """Forgets the index; the next read rebuilds it"""
+        with self._lock:
+            self._index = None
+
+
+def _remove_sorted(index: Dict[str, List[str]], key: str, product_id: str) -> None:
+    ids = index.get(key)
+    if ids is None:
+        return
+    i = bisect.bisect_left(ids, product_id)
+    if i < len(ids) and ids[i] == product_id:
+        del ids[i]
+    if not ids:
+        del index[key]
+
+
+def _discard(index: Dict[str, Set[str]], key: str, product_id: str) -> None:
+    ids = index.get(key)
+    if ids is None:
+        return
+    ids.discard(product_id)
+    if not ids:
+        del index[key]
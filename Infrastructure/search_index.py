@@ -0,0 +1,339 @@
+"""
+Product Search Index (Infrastructure Layer)
+In-process inverted index with BM25 ranking over the name, category, origin
+and description of active products, behind GET /products/search.
+
+Text is normalized like the listing filters (casefolded, without accents),
+split into words, stripped of Spanish stopwords and reduced with a light
+Spanish stemmer (plurals and -o/-a endings), so "Papas orgánicas" and
+"papa organica" produce the same terms. The last word of a query also matches
+as a prefix ("saban" finds "sabanera") for search-as-you-type.
+
+InMemoryProductRepo keeps a SearchIndex up to date on every write.
+AdapterProductRepo keeps one in a CatalogIndex (search_catalog_from_env):
+built from the active Cassandra catalog on the first search, rebuilt in the
+background every SEARCH_INDEX_TTL_SECONDS and, with SEARCH_INDEX_PATH, saved
+to disk after each build and loaded from there on the next start.
+"""
+
+import base64
+import binascii
+import bisect
+import copy
+import gzip
+import heapq
+import json
+import logging
+import math
+import os
+import re
+import tempfile
+import threading
+import time
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from domain.entidades.product_model import Product
+from domain.entidades.product_query import ProductQuery
+from Infrastructure.product_index import CatalogIndex, matches_query, normalize_term
+
+logger = logging.getLogger(__name__)
+
+# Field weights of the BM25F-style term frequency
+FIELD_WEIGHTS = (("name", 3.0), ("category", 2.0), ("origin", 2.0), ("description", 1.0))
+TEXT_FIELDS = frozenset(field for field, _ in FIELD_WEIGHTS)
+BM25_K1 = 1.2
+BM25_B = 0.75
+# Terms the last query word expands to when used as a prefix
+MAX_PREFIX_TERMS = 20
+SNAPSHOT_VERSION = 1
+
+STOPWORDS = frozenset("""
+    a al con de del el en es la las lo los o para por se sin su sus u un una unas unos y
+    que como mas muy x
+""".split())
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+def stem(word: str) -> str:
+    """Light Spanish stemmer: plural endings, then the -o/-a gender ending of long words"""
+    if len(word) > 4 and word.endswith("es") and word[-3] in "lnrdzj":
+        word = word[:-2]
+    elif len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+        word = word[:-1]
+    if len(word) > 5 and word[-1] in "ao":
+        word = word[:-1]
+    return word
+
+
+def tokenize(text) -> List[str]:
+    """Normalized, stemmed terms of a text without stopwords"""
+    if not text:
+        return []
+    return [stem(word) for word in _WORD.findall(normalize_term(text))
+            if word not in STOPWORDS and (len(word) > 1 or word.isdigit())]
+
+
+def encode_search_token(offset: int) -> str:
+    return base64.urlsafe_b64encode(json.dumps(["search", offset]).encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_search_token(token: str) -> int:
+    """
+    Raises:
+        ValueError: If the token is malformed
+    """
+    try:
+        kind, offset = json.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+    except (binascii.Error, ValueError, TypeError):
+        raise ValueError("page_token inválido")
+    if kind != "search" or not isinstance(offset, int) or offset < 0:
+        raise ValueError("page_token inválido")
+    return offset
+
+
+class SearchIndex:
+    """
+    Inverted index of active products with BM25 ranking.
+
+    Features:
+    - Postings term -> {productId: weighted term frequency} (FIELD_WEIGHTS)
+    - Incremental add / remove / replace, without re-tokenizing when no text field changed
+    - Prefix expansion of the last query word over a sorted term list
+    - Optional ProductQuery filters on the ranked hits
+    - save() / load(): gzip JSON snapshot with the products and their terms
+    - One RLock around every read and write
+
+    Products are stored as given and never modified; replace() swaps in a copy.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._products: Dict[str, Product] = {}
+        self._doc_terms: Dict[str, Dict[str, float]] = {}
+        self._doc_length: Dict[str, float] = {}
+        self._total_length = 0.0
+        self._postings: Dict[str, Dict[str, float]] = {}
+        self._terms: List[str] = []
+
+    @classmethod
+    def from_products(cls, products: Iterable[Product]) -> "SearchIndex":
+        index = cls()
+        with index._lock:
+            for product in products:
+                index._index(product, cls.document_terms(product), sort_terms=False)
+            index._terms.sort()
+        return index
+
+    @staticmethod
+    def document_terms(product: Product) -> Dict[str, float]:
+        """Weighted term frequencies of the text fields of a product"""
+        terms: Counter = Counter()
+        for field, weight in FIELD_WEIGHTS:
+            for term in tokenize(getattr(product, field)):
+                terms[term] += weight
+        return dict(terms)
+
+    # ===============================
+    # WRITES
+    # ===============================
+
+    def _index(self, product: Product, terms: Dict[str, float], sort_terms: bool = True) -> None:
+        product_id = product.productId
+        if product_id in self._products:
+            self._unindex(product_id)
+        self._products[product_id] = product
+        self._doc_terms[product_id] = terms
+        length = sum(terms.values())
+        self._doc_length[product_id] = length
+        self._total_length += length
+        for term, frequency in terms.items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = {}
+                if sort_terms:
+                    bisect.insort(self._terms, term)
+                else:
+                    self._terms.append(term)
+            postings[product_id] = frequency
+
+    def _unindex(self, product_id: str) -> Optional[Product]:
+        product = self._products.pop(product_id, None)
+        if product is None:
+            return None
+        self._total_length -= self._doc_length.pop(product_id)
+        for term in self._doc_terms.pop(product_id):
+            postings = self._postings[term]
+            del postings[product_id]
+            if not postings:
+                del self._postings[term]
+                i = bisect.bisect_left(self._terms, term)
+                if i < len(self._terms) and self._terms[i] == term:
+                    del self._terms[i]
+        return product
+
+    def add(self, product: Product) -> None:
+        """
+        Indexes a product, replacing the one with the same productId if any.
+        When none of its text fields changed only the stored product is swapped.
+        """
+        with self._lock:
+            current = self._products.get(product.productId)
+            if current is not None and all(getattr(current, f) == getattr(product, f) for f in TEXT_FIELDS):
+                self._products[product.productId] = product
+                return
+        terms = self.document_terms(product)
+        with self._lock:
+            self._index(product, terms)
+
+    def remove(self, product_id: str) -> Optional[Product]:
+        with self._lock:
+            return self._unindex(product_id)
+
+    def replace(self, product_id: str, **changes) -> Optional[Product]:
+        """Re-indexes a copy of the product with the given field changes; None if it was not indexed"""
+        with self._lock:
+            current = self._products.get(product_id)
+            if current is None:
+                return None
+            updated = copy.copy(current)
+            for name, value in changes.items():
+                setattr(updated, name, value)
+            self.add(updated)
+            return updated
+
+    def __len__(self) -> int:
+        return len(self._products)
+
+    # ===============================
+    # SEARCH
+    # ===============================
+
+    def search(self, text: str, query: Optional[ProductQuery] = None, limit: int = 20,
+               offset: int = 0) -> Tuple[List[Product], bool]:
+        """
+        Products ranked by BM25 for the text, optionally filtered by query.
+        Returns the page [offset, offset + limit) and whether more hits follow.
+        """
+        words = tokenize(text)
+        if not words:
+            return [], False
+        # The last word is still being typed unless the text ends with a space
+        prefix = words[-1] if not text[-1:].isspace() else None
+        with self._lock:
+            scores = self._score(words, prefix)
+            # Highest score first; ties by productId so pages are stable.
+            # Hits leave the heap in rank order, so filters only run on the ones popped.
+            hits = [(-score, product_id) for product_id, score in scores.items()]
+            heapq.heapify(hits)
+            ranked: List[Product] = []
+            while hits and len(ranked) <= offset + limit:
+                product = self._products[heapq.heappop(hits)[1]]
+                if query is None or matches_query(product, query):
+                    ranked.append(product)
+        return ranked[offset:offset + limit], len(ranked) > offset + limit
+
+    def _score(self, words: List[str], prefix: Optional[str]) -> Dict[str, float]:
+        total = len(self._products)
+        if total == 0:
+            return {}
+        average_length = self._total_length / total
+        # Query term -> weight (repeated words count more, prefix expansions count half)
+        weights: Counter = Counter(words)
+        if prefix is not None:
+            start = bisect.bisect_left(self._terms, prefix)
+            for term in self._terms[start:start + MAX_PREFIX_TERMS]:
+                if not term.startswith(prefix):
+                    break
+                if term != prefix:
+                    weights[term] = max(weights[term], 0.5)
+        doc_length = self._doc_length
+        length_factor = BM25_K1 * BM25_B / average_length
+        base = BM25_K1 * (1 - BM25_B)
+        scores: Dict[str, float] = {}
+        for term, weight in weights.items():
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (total - len(postings) + 0.5) / (len(postings) + 0.5))
+            boost = weight * idf * (BM25_K1 + 1)
+            get = scores.get
+            for product_id, frequency in postings.items():
+                scores[product_id] = get(product_id, 0.0) + boost * frequency / (
+                    frequency + base + length_factor * doc_length[product_id])
+        return scores
+
+    # ===============================
+    # PERSISTENCE
+    # ===============================
+
+    def save(self, path: str) -> None:
+        """Writes a gzip JSON snapshot atomically (temporary file + rename)"""
+        with self._lock:
+            documents = [
+                [_product_fields(product), self._doc_terms[product_id]]
+                for product_id, product in self._products.items()
+            ]
+        payload = {"version": SNAPSHOT_VERSION, "savedAt": time.time(), "documents": documents}
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as raw, gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=5) as f:
+                f.write(json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode("utf-8"))
+            os.replace(tmp_path, path)
+        except Exception:
+            os.unlink(tmp_path)
+            raise
+        logger.info(f"Search index saved: {len(documents)} products to {path}")
+
+    @classmethod
+    def load(cls, path: str) -> Tuple["SearchIndex", float]:
+        """
+        Reads a snapshot written by save() without re-tokenizing.
+        Returns the index and the snapshot age in seconds.
+
+        Raises:
+            ValueError: If the snapshot has another format version
+        """
+        with gzip.open(path, "rb") as f:
+            payload = json.loads(f.read())
+        if payload.get("version") != SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported search index snapshot version {payload.get('version')}")
+        index = cls()
+        with index._lock:
+            for fields, terms in payload["documents"]:
+                index._index(Product(**fields), terms, sort_terms=False)
+            index._terms.sort()
+        return index, max(0.0, time.time() - payload["savedAt"])
+
+
+def _product_fields(product: Product) -> dict:
+    fields = product.toDictionary()
+    # Calculated in Product.__post_init__
+    del fields["inStock"]
+    return fields
+
+
+def search_catalog_from_env(loader) -> CatalogIndex:
+    """
+    CatalogIndex of a SearchIndex over the active catalog (AdapterProductRepo).
+    SEARCH_INDEX_TTL_SECONDS sets the rebuild period and SEARCH_INDEX_PATH,
+    when set, the snapshot saved after each build and loaded on start.
+    """
+    path = os.getenv("SEARCH_INDEX_PATH") or None
+
+    def warm_start():
+        if path is None or not os.path.exists(path):
+            return None
+        return SearchIndex.load(path)
+
+    return CatalogIndex(
+        loader,
+        ttl=float(os.getenv("SEARCH_INDEX_TTL_SECONDS", "300")),
+        factory=SearchIndex.from_products,
+        warm_start=warm_start,
+        on_built=(lambda index: index.save(path)) if path else None,
+        name="search-index",
+    )
@@ -0,0 +1,85 @@
+"""
+Tests para aexecute: puente entre los ResponseFuture del driver y asyncio
+"""
+import asyncio
+import threading
+
+import pytest
+
+from Infrastructure.async_cassandra_db import aexecute
+
+
+class FakeResultSet:
+    def __init__(self, paging_state):
+        self.paging_state = paging_state
+
+
+class FakeResponseFuture:
+    """
+    Simula un ResponseFuture que entrega sus páginas desde otro hilo. Solo expone
+    la API pública: el paging_state se lee del ResultSet de la página (result()).
+    """
+
+    def __init__(self, pages, error=None):
+        self.pages = pages
+        self.error = error
+        self.index = 0
+        self.current_state = None
+
+    @property
+    def has_more_pages(self):
+        return self.index < len(self.pages) - 1
+
+    def add_callbacks(self, callback, errback):
+        self.callback = callback
+        if self.error:
+            threading.Thread(target=errback, args=(self.error,)).start()
+        else:
+            threading.Thread(target=self._deliver).start()
+
+    def start_fetching_next_page(self):
+        self.index += 1
+        self._deliver()
+
+    def result(self):
+        return FakeResultSet(self.current_state)
+
+    def _deliver(self):
+        self.current_state = b"state-%d" % self.index if self.has_more_pages else None
+        self.callback(self.pages[self.index])
+
+
+class FakeSession:
+    def __init__(self, response):
+        self.response = response
+
+    def execute_async(self, statement, params, execution_profile=None, paging_state=None):
+        return self.response
+
+
+def run(session, **kwargs):
+    async def main():
+        return await aexecute(session, "SELECT", **kwargs)
+    return asyncio.run(main())
+
+
+def test_all_pages_are_collected():
+    """Con all_pages se siguen todas las páginas y no queda paging_state"""
+    session = FakeSession(FakeResponseFuture([[1, 2], [3], [4]]))
+    rows, paging_state = run(session)
+    assert rows == [1, 2, 3, 4]
+    assert paging_state is None
+
+
+def test_single_page_returns_paging_state():
+    """Sin all_pages se devuelve la primera página y el estado para continuar"""
+    session = FakeSession(FakeResponseFuture([[1, 2], [3]]))
+    rows, paging_state = run(session, all_pages=False)
+    assert rows == [1, 2]
+    assert paging_state == b"state-0"
+
+
+def test_driver_errors_are_raised_in_the_event_loop():
+    session = FakeSession(FakeResponseFuture([], error=RuntimeError("timeout")))
+    with pytest.raises(RuntimeError, match="timeout"):
+        run(session)
@@ -0,0 +1,105 @@
+"""
+Tests para los backends de caché compartidos usando el servidor Redis falso en proceso
+"""
+import pytest
+
+from Infrastructure.cache_backends import FakeRedisCacheBackend, FakeRedisServer, RedisCacheBackend
+from Infrastructure.product_cache import ProductCache
+from Infrastructure.testing import FakeClock, make_product
+
+
+def make_worker(server, clock, name):
+    return ProductCache(
+        ttl=60, negative_ttl=5, local_ttl=10, name=name, clock=clock,
+        backend=FakeRedisCacheBackend(server),
+    )
+
+
+def test_entry_loaded_by_one_worker_is_served_to_the_others():
+    """Un producto cargado por un worker se sirve a los demás sin ir a la base de datos"""
+    clock = FakeClock()
+    server = FakeRedisServer(clock=clock)
+    worker_a = make_worker(server, clock, "test_shared_a")
+    worker_b = make_worker(server, clock, "test_shared_b")
+    calls = []
+
+    def loader(product_id):
+        calls.append(product_id)
+        return make_product(product_id)
+
+    worker_a.get_or_load("PROD-TEST0001", loader)
+    product = worker_b.get_or_load("PROD-TEST0001", loader)
+    assert calls == ["PROD-TEST0001"]
+    assert product.name == "Papa sabanera"
+    assert product.createdAt == make_product().createdAt
+
+
+def test_write_in_one_worker_evicts_near_cache_of_all_workers():
+    """La invalidación publicada por un worker borra la copia local del resto"""
+    clock = FakeClock()
+    server = FakeRedisServer(clock=clock)
+    worker_a = make_worker(server, clock, "test_invalidation_a")
+    worker_b = make_worker(server, clock, "test_invalidation_b")
+    versions = {"PROD-TEST0001": "v1"}
+
+    def loader(product_id):
+        product = make_product(product_id)
+        product.imageUrl = versions[product_id]
+        return product
+
+    assert worker_a.get_or_load("PROD-TEST0001", loader).imageUrl == "v1"
+    assert worker_b.get_or_load("PROD-TEST0001", loader).imageUrl == "v1"
+
+    versions["PROD-TEST0001"] = "v2"
+    worker_b.invalidate("PROD-TEST0001")
+    assert worker_a.get_or_load("PROD-TEST0001", loader).imageUrl == "v2"
+
+
+def test_negative_entries_are_shared():
+    """Los IDs inexistentes también se comparten entre workers"""
+    clock = FakeClock()
+    server = FakeRedisServer(clock=clock)
+    worker_a = make_worker(server, clock, "test_negative_a")
+    worker_b = make_worker(server, clock, "test_negative_b")
+    calls = []
+
+    def loader(product_id):
+        calls.append(product_id)
+        return None
+
+    assert worker_a.get_or_load("PROD-NOPE", loader) is None
+    assert worker_b.get_or_load("PROD-NOPE", loader) is None
+    assert len(calls) == 1
+    clock.now = 5.0
+    worker_b.get_or_load("PROD-NOPE", loader)
+    assert len(calls) == 2
+
+
+def test_clear_drops_shared_and_near_entries():
+    """clear() vacía la caché compartida y la copia local del worker"""
+    clock = FakeClock()
+    server = FakeRedisServer(clock=clock)
+    worker = make_worker(server, clock, "test_clear")
+    worker.get_or_load("PROD-TEST0001", make_product)
+    worker.clear()
+    calls = []
+    worker.get_or_load("PROD-TEST0001", lambda product_id: calls.append(product_id) or make_product(product_id))
+    assert calls == ["PROD-TEST0001"]
+
+
+def test_redis_outage_at_startup_degrades_to_no_cache():
+    """Sin servidor Redis la caché se crea igual, cada lectura va a la base de datos y la suscripción se reintenta"""
+    pytest.importorskip("redis")
+    backend = RedisCacheBackend("redis://127.0.0.1:1/0", socket_timeout=0.05, retry_delay=0.05)
+    cache = ProductCache(name="test_redis_down", backend=backend)
+    try:
+        calls = []
+        for _ in range(2):
+            product = cache.get_or_load("PROD-TEST0001", lambda product_id: calls.append(product_id) or make_product(product_id))
+        assert product.name == "Papa sabanera"
+        assert calls == ["PROD-TEST0001", "PROD-TEST0001"]
+        cache.invalidate("PROD-TEST0001")
+        cache.clear()
+        assert not backend.subscribed
+    finally:
+        cache.close()
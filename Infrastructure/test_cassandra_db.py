@@ -0,0 +1,113 @@
+"""
+Tests para la creación con LWT y el backfill de CassandraDB (sin Cassandra: sesión simulada)
+"""
+from collections import namedtuple
+
+import pytest
+
+import Infrastructure.cassandra_db as cassandra_db
+from Infrastructure.cassandra_db import CassandraDB
+from Infrastructure.testing import make_product
+
+
+class FakeResult:
+    def __init__(self, was_applied=True):
+        self.was_applied = was_applied
+
+
+class FakeConnection:
+    catalog_shards = 4
+
+    def prepared(self, name):
+        return name
+
+
+class FakeSession:
+    """
+    Aplica el INSERT ... IF NOT EXISTS en memoria; los batches de las tablas de
+    consulta fallan las primeras batch_failures veces.
+    """
+
+    def __init__(self, batch_failures=0):
+        self.products = set()
+        self.query_tables = set()
+        self.batch_failures = batch_failures
+
+    def execute(self, statement, params=None):
+        if statement == "insert_product_if_not_exists":
+            if params[0] in self.products:
+                return FakeResult(was_applied=False)
+            self.products.add(params[0])
+            return FakeResult()
+        kind, values = statement
+        if self.batch_failures:
+            self.batch_failures -= 1
+            raise RuntimeError("WriteTimeout")
+        self.query_tables.add(values[0])
+        return FakeResult()
+
+
+def make_db(session):
+    db = CassandraDB.__new__(CassandraDB)
+    db.connection = FakeConnection()
+    db.session = session
+    db.create_mode = "lwt"
+    # Los batches reales necesitan sentencias preparadas; aquí basta con identificarlos
+    db._insert_batch = lambda values, include_products=True: ("query_tables", values)
+    return db
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(cassandra_db, "QUERY_TABLE_RETRY_DELAY", 0)
+
+
+def test_query_table_write_is_retried_after_the_lwt():
+    """Un fallo transitorio de las tablas de consulta se reintenta y el producto queda en los listados"""
+    session = FakeSession(batch_failures=2)
+    make_db(session).add_product(make_product("PROD-LWT00001"))
+    assert session.products == {"PROD-LWT00001"} == session.query_tables
+
+
+def test_created_product_is_not_reported_as_failed():
+    """Si las copias fallan siempre, la creación sigue siendo correcta y un reintento del cliente ve el duplicado"""
+    session = FakeSession(batch_failures=100)
+    db = make_db(session)
+    db.add_product(make_product("PROD-LWT00002"))
+    assert session.products == {"PROD-LWT00002"}
+    assert session.query_tables == set()
+    with pytest.raises(ValueError, match="Ya existe un producto con ese ID"):
+        db.add_product(make_product("PROD-LWT00002"))
+
+
+Row = namedtuple("Row", "product_id is_active")
+
+
+class FakePrepared:
+    """Sentencia preparada compartida: bind() crea una sentencia propia con su fetch_size"""
+
+    fetch_size = None
+
+    def bind(self, values):
+        bound = FakePrepared()
+        bound.values = values
+        return bound
+
+
+def test_backfill_sets_fetch_size_on_a_bound_statement():
+    """El backfill pagina con su page_size sin cambiar la sentencia preparada que comparten las lecturas"""
+    prepared = FakePrepared()
+    executed, copied = [], []
+
+    class ScanSession:
+        def execute(self, statement, params=None):
+            executed.append(statement)
+            return [Row("PROD-1", True), Row("PROD-2", False), Row("PROD-3", True)]
+
+    db = make_db(ScanSession())
+    db.connection.prepared = lambda name: prepared
+    db._execute_batches = lambda pending, concurrency: copied.append(len(pending)) or len(pending)
+    assert db.backfill_query_tables(page_size=2) == 2
+    assert copied == [2]
+    assert prepared.fetch_size is None
+    assert executed[0] is not prepared and executed[0].fetch_size == 2
@@ -0,0 +1,52 @@
+"""
+Tests para la configuración del cliente de Cassandra (perfiles de ejecución y políticas)
+"""
+import pytest
+from cassandra.cluster import EXEC_PROFILE_DEFAULT, Cluster
+from cassandra.policies import (
+    ConstantSpeculativeExecutionPolicy, DCAwareRoundRobinPolicy, FallthroughRetryPolicy,
+    NoSpeculativeExecutionPolicy, TokenAwarePolicy,
+)
+
+from Infrastructure.cassandra_profiles import BULK_SCAN_PROFILE, POINT_READ_PROFILE, ClusterTuning
+from Infrastructure.cassandra_rows import PRODUCT_PROFILE, product_row_factory
+
+
+def test_profiles_from_env(monkeypatch):
+    """Las variables CASSANDRA_* llegan a las políticas y timeouts de cada perfil"""
+    monkeypatch.setenv("CASSANDRA_LOCAL_DC", "dc-bogota")
+    monkeypatch.setenv("CASSANDRA_SPECULATIVE_DELAY_MS", "20")
+    monkeypatch.setenv("CASSANDRA_POINT_READ_TIMEOUT_SECONDS", "1.5")
+    monkeypatch.setenv("CASSANDRA_RETRY_POLICY", "fallthrough")
+    profiles = ClusterTuning.from_env().execution_profiles()
+
+    point_read = profiles[POINT_READ_PROFILE]
+    assert isinstance(point_read.load_balancing_policy, TokenAwarePolicy)
+    assert isinstance(point_read.load_balancing_policy._child_policy, DCAwareRoundRobinPolicy)
+    assert point_read.load_balancing_policy._child_policy.local_dc == "dc-bogota"
+    assert point_read.request_timeout == 1.5
+    assert isinstance(point_read.speculative_execution_policy, ConstantSpeculativeExecutionPolicy)
+    assert isinstance(point_read.retry_policy, FallthroughRetryPolicy)
+
+    # Los perfiles de productos conservan la row factory; el escaneo masivo no especula
+    for name in (PRODUCT_PROFILE, POINT_READ_PROFILE, BULK_SCAN_PROFILE):
+        assert profiles[name].row_factory is product_row_factory
+    assert isinstance(profiles[BULK_SCAN_PROFILE].speculative_execution_policy, NoSpeculativeExecutionPolicy)
+    assert profiles[BULK_SCAN_PROFILE].request_timeout == 60
+    # Cada perfil tiene su propia instancia de política
+    assert profiles[EXEC_PROFILE_DEFAULT].load_balancing_policy is not point_read.load_balancing_policy
+
+
+def test_cluster_accepts_tuning_without_connecting():
+    tuning = ClusterTuning(compression="none", token_aware=False)
+    cluster = Cluster(contact_points=["127.0.0.1"], **tuning.cluster_kwargs())
+    tuning.apply_pool_settings(cluster)
+    assert cluster.compression is False
+    assert isinstance(cluster.profile_manager.default.load_balancing_policy, DCAwareRoundRobinPolicy)
+
+
+def test_invalid_values_are_rejected():
+    with pytest.raises(ValueError):
+        ClusterTuning(retry_policy="siempre")
+    with pytest.raises(ValueError):
+        ClusterTuning(compression="zstd")
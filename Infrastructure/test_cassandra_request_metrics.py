@@ -0,0 +1,96 @@
+"""
+Tests para los listeners de inicio de petición del driver (métricas y spans CQL)
+"""
+from cassandra import ReadTimeout
+from cassandra.query import BatchStatement, PreparedStatement, SimpleStatement
+from prometheus_client import REGISTRY
+
+from Infrastructure.cassandra_request_metrics import DriverRequestMetrics
+from Infrastructure.cassandra_statements import PRODUCT_STATEMENTS, PreparedStatementRegistry
+from Infrastructure.cassandra_tracing import CqlTracingListener
+from observability.tracing import CLIENT, SERVER, RatioSampler, Tracer, set_tracer, start_as_current
+
+
+class FakeResponseFuture:
+    """Guarda los callbacks para dispararlos desde el test, como haría el hilo del driver"""
+
+    def __init__(self, query):
+        self.query = query
+        self._query_retries = 0
+
+    def add_callbacks(self, callback, errback):
+        self.callback = callback
+        self.errback = errback
+
+
+class CollectingProcessor:
+    def __init__(self):
+        self.spans = []
+
+    def on_end(self, span):
+        self.spans.append(span)
+
+    def shutdown(self):
+        pass
+
+
+def bound(name):
+    query, _ = PRODUCT_STATEMENTS[name]
+    prepared = PreparedStatement([], b"id", None, query, "productos_db", 4, None, None)
+    return prepared.bind([])
+
+
+def sample(metric, **labels):
+    return REGISTRY.get_sample_value(metric, labels) or 0.0
+
+
+def test_requests_are_labelled_by_statement_and_outcome():
+    metrics = DriverRequestMetrics(PreparedStatementRegistry().name_for)
+    ok_before = sample("productos_cassandra_requests_total", statement="select_product_by_id", outcome="success")
+    timeout_before = sample("productos_cassandra_requests_total", statement="select_product_by_id", outcome="timeout")
+    latency_before = sample("productos_cassandra_request_duration_seconds_count", statement="select_product_by_id")
+    retries_before = sample("productos_cassandra_retries_total", statement="select_product_by_id")
+
+    future = FakeResponseFuture(bound("select_product_by_id"))
+    metrics(future)
+    future._query_retries = 1
+    future.callback([])
+    # Una página posterior cuenta como petición pero no repite la latencia
+    future.callback([])
+
+    failed = FakeResponseFuture(bound("select_product_by_id"))
+    metrics(failed)
+    failed.errback(ReadTimeout("timeout"))
+
+    assert sample("productos_cassandra_requests_total", statement="select_product_by_id", outcome="success") == ok_before + 2
+    assert sample("productos_cassandra_requests_total", statement="select_product_by_id", outcome="timeout") == timeout_before + 1
+    assert sample("productos_cassandra_request_duration_seconds_count", statement="select_product_by_id") == latency_before + 2
+    assert sample("productos_cassandra_retries_total", statement="select_product_by_id") == retries_before + 1
+
+
+def test_statement_labels_stay_bounded():
+    metrics = DriverRequestMetrics(PreparedStatementRegistry().name_for)
+    assert metrics.statement_label(BatchStatement()) == "batch"
+    assert metrics.statement_label(SimpleStatement("SELECT now() FROM system.local")) == "other"
+    assert metrics.statement_label("SELECT release_version FROM system.local") == "other"
+
+
+def test_cql_spans_only_inside_sampled_traces():
+    processor = CollectingProcessor()
+    set_tracer(Tracer(RatioSampler(1.0), processor))
+    try:
+        listener = CqlTracingListener(PreparedStatementRegistry().name_for, "productos_db")
+        outside = FakeResponseFuture(bound("select_products_by_user"))
+        listener(outside)
+        assert not hasattr(outside, "callback")
+
+        with start_as_current("get_products_by_user_id", SERVER) as root:
+            future = FakeResponseFuture(bound("select_products_by_user"))
+            listener(future)
+        future.callback(["p1", "p2"])
+    finally:
+        set_tracer(None)
+
+    span = next(s for s in processor.spans if s.kind == CLIENT)
+    assert span.name == "CQL select_products_by_user" and span.parent_id == root.span_id
+    assert span.attributes["db.cassandra.rows_returned"] == 2
@@ -0,0 +1,52 @@
+"""
+Tests para la row factory que convierte filas de Cassandra en entidades Product
+"""
+from datetime import date
+
+from cassandra.util import Date
+from prometheus_client import REGISTRY
+
+from Infrastructure.cassandra_rows import product_row_factory
+from Infrastructure.cassandra_statements import PRODUCT_COLUMNS
+
+COLNAMES = [name.strip() for name in PRODUCT_COLUMNS.split(",")]
+
+
+def make_row(**overrides):
+    values = {
+        "product_id": "PROD-A1B2C3D4", "name": "Papa Pastusa", "category": "vegetales",
+        "price": 1200.0, "original_price": float("nan"), "unit": "kg", "image_url": "",
+        "stock": None, "origin": "Boyacá", "description": "Papa", "user_id": "u1",
+        "created_at": Date(date(2025, 7, 13)), "updated_at": Date(date(2025, 7, 14)),
+        "is_active": True, "is_organic": None, "is_best_seller": None, "free_shipping": False,
+        "image_variants": None,
+    }
+    values.update(overrides)
+    return tuple(values[name] for name in COLNAMES)
+
+
+def test_row_is_mapped_to_product_with_native_types():
+    """Las fechas llegan como date, NaN se convierte en None y stock nulo en 0"""
+    product, = product_row_factory(COLNAMES, [make_row(image_variants={"card": "c.webp"})])
+    assert product.productId == "PROD-A1B2C3D4"
+    assert product.createdAt == date(2025, 7, 13)
+    assert product.updatedAt == date(2025, 7, 14)
+    assert product.originalPrice is None
+    assert product.stock == 0 and product.inStock is False
+    assert product.imageVariants == {"card": "c.webp"}
+    assert product.toDictionary()["createdAt"] == "2025-07-13"
+
+
+def test_invalid_rows_are_skipped():
+    """Una fila que no pasa la validación de Product se descarta sin afectar a las demás"""
+    products = product_row_factory(COLNAMES, [make_row(name=""), make_row(product_id="PROD-OK")])
+    assert [p.productId for p in products] == ["PROD-OK"]
+
+
+def test_each_page_reports_mapping_and_validation_stages():
+    def count(stage):
+        return REGISTRY.get_sample_value("productos_stage_duration_seconds_count", {"stage": stage}) or 0.0
+
+    before = count("row_mapping"), count("entity_validation")
+    product_row_factory(COLNAMES, [make_row(product_id=f"PROD-{i}") for i in range(3)])
+    assert (count("row_mapping"), count("entity_validation")) == (before[0] + 1, before[1] + 1)
@@ -0,0 +1,123 @@
+"""
+Tests para el repositorio de productos en memoria (índices, paginación y semántica del adaptador de Cassandra)
+"""
+import threading
+
+import pytest
+
+from domain.entidades.product_model import Product
+from domain.entidades.product_query import ProductQuery
+from Infrastructure.in_memory_product_repo import InMemoryProductRepo
+
+
+def make_product(product_id, user_id="USER-1", category="vegetales", price=2500.0, **fields):
+    return Product(
+        name="Papa sabanera", category=category, price=price, unit="kg",
+        imageUrl="", stock=10, origin="Cundinamarca", description="Papa fresca",
+        user_id=user_id, productId=product_id, **fields,
+    )
+
+
+def test_duplicate_ids_are_rejected_like_cassandra():
+    """Un ID repetido falla con el mismo error, también en la carga masiva"""
+    repo = InMemoryProductRepo()
+    repo.add_product(make_product("PROD-A"))
+    with pytest.raises(ValueError, match="Ya existe un producto con ese ID"):
+        repo.add_product(make_product("PROD-A"))
+    errors = repo.add_products([make_product("PROD-B"), make_product("PROD-A")], [True, False])
+    assert errors == [None, "Ya existe un producto con ese ID"]
+    assert len(repo) == 2
+
+
+def test_deactivated_products_leave_every_index():
+    """Un producto desactivado sigue disponible por ID pero sale de los listados"""
+    repo = InMemoryProductRepo()
+    repo.add_product(make_product("PROD-A", user_id="USER-1", category="frutas", price=100.0))
+    repo.add_product(make_product("PROD-B", user_id="USER-1", category="frutas", price=200.0))
+    repo.add_product(make_product("PROD-C", user_id="USER-2", isActive=False))
+
+    assert repo.update_product("PROD-A") is True
+    assert repo.update_product("PROD-X") is False
+
+    assert repo.get_product_by_id("PROD-A").isActive is False
+    assert [p.productId for p in repo.get_all_products()] == ["PROD-B"]
+    assert [p.productId for p in repo.get_products_by_user_id("USER-1")] == ["PROD-B"]
+    assert repo.get_products_by_user_id("USER-2") == []
+    assert [p.productId for p in repo.find_products(ProductQuery(category="frutas")).items] == ["PROD-B"]
+    assert [p.productId for p in repo.find_products(ProductQuery(minPrice=0, maxPrice=1000)).items] == ["PROD-B"]
+
+
+def test_price_range_is_inclusive_and_sorted():
+    """El índice de precios devuelve el rango cerrado ordenado por precio"""
+    repo = InMemoryProductRepo()
+    for product_id, price in [("PROD-A", 300.0), ("PROD-B", 100.0), ("PROD-C", 200.0), ("PROD-D", 200.0)]:
+        repo.add_product(make_product(product_id, price=price))
+    query = ProductQuery(minPrice=200, maxPrice=300, sort="price")
+    assert [p.productId for p in repo.find_products(query).items] == ["PROD-C", "PROD-D", "PROD-A"]
+    assert [p.productId for p in repo.find_products(ProductQuery(maxPrice=150)).items] == ["PROD-B"]
+
+
+def test_keyset_pages_are_stable_under_concurrent_writes():
+    """Los productos creados entre páginas no desplazan el cursor ni repiten elementos"""
+    repo = InMemoryProductRepo()
+    for i in range(10):
+        repo.add_product(make_product(f"PROD-{i:02d}"))
+
+    first = repo.get_all_products_page(4)
+    assert [p.productId for p in first.items] == ["PROD-00", "PROD-01", "PROD-02", "PROD-03"]
+    repo.add_product(make_product("PROD-01A"))
+    repo.update_product("PROD-05")
+
+    seen = [p.productId for p in first.items]
+    token = first.nextPageToken
+    while token:
+        page = repo.get_all_products_page(4, token)
+        seen.extend(p.productId for p in page.items)
+        token = page.nextPageToken
+    assert seen == ["PROD-00", "PROD-01", "PROD-02", "PROD-03", "PROD-04", "PROD-06", "PROD-07", "PROD-08", "PROD-09"]
+
+    with pytest.raises(ValueError, match="page_token inválido"):
+        repo.get_all_products_page(4, "no-es-un-token")
+
+
+def test_updates_replace_products_instead_of_mutating_them():
+    """Las lecturas previas conservan su versión; las imágenes de productos inexistentes se ignoran"""
+    repo = InMemoryProductRepo()
+    original = make_product("PROD-A")
+    repo.add_product(original)
+    before = repo.get_product_by_id("PROD-A")
+
+    repo.update_image_url("PROD-A", "http://img/a.jpg")
+    repo.update_image_variants("PROD-A", {"thumbnail": "http://img/a-t.webp"})
+    repo.update_image_url("PROD-X", "http://img/x.jpg")
+
+    after = repo.get_product_by_id("PROD-A")
+    assert before.imageUrl == "" and original.imageUrl == ""
+    assert after.imageUrl == "http://img/a.jpg"
+    assert after.imageVariants == {"thumbnail": "http://img/a-t.webp"}
+    assert repo.get_product_by_id("PROD-X") is None
+
+
+def test_concurrent_writers_keep_indexes_consistent():
+    """Escrituras desde varios hilos dejan los índices coherentes entre sí"""
+    repo = InMemoryProductRepo()
+
+    def writer(worker):
+        for i in range(200):
+            product_id = f"PROD-{worker}-{i:03d}"
+            repo.add_product(make_product(product_id, user_id=f"USER-{i % 7}", price=float(i)))
+            if i % 3 == 0:
+                repo.update_product(product_id)
+
+    threads = [threading.Thread(target=writer, args=(w,)) for w in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    active = repo.get_all_products()
+    assert len(repo) == 800
+    assert len(active) == 800 - 4 * 67
+    assert sum(len(repo.get_products_by_user_id(f"USER-{u}")) for u in range(7)) == len(active)
+    assert len(repo.find_products(ProductQuery(sort="-price")).items) == len(active)
+    assert list(repo.iter_all_products(page_size=50)) == active
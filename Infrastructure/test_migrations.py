@@ -0,0 +1,69 @@
+"""
+Tests para las migraciones versionadas del esquema (sin Cassandra: sesión simulada)
+"""
+import pytest
+from cassandra import InvalidRequest
+
+from Infrastructure.migrations import (
+    LATEST_VERSION, MIGRATIONS, SchemaVersionError, check_schema, current_version, migrate,
+)
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def one(self):
+        return self.rows[0] if self.rows else None
+
+
+class FakeSession:
+    """Registra las sentencias y guarda las versiones aplicadas en memoria"""
+
+    def __init__(self, existing_columns=()):
+        self.statements = []
+        self.versions = None  # None = tabla schema_migrations inexistente
+        self.existing_columns = set(existing_columns)
+
+    def set_keyspace(self, keyspace):
+        pass
+
+    def execute(self, query, params=None):
+        self.statements.append(query)
+        if query.startswith("CREATE TABLE IF NOT EXISTS schema_migrations"):
+            self.versions = self.versions or []
+        elif "FROM" in query and "schema_migrations" in query:
+            if self.versions is None:
+                raise InvalidRequest("unconfigured table schema_migrations")
+            return FakeResult([(v,) for v in sorted(self.versions, reverse=True)])
+        elif query.startswith("INSERT INTO schema_migrations"):
+            self.versions.append(params[1])
+        elif query.startswith("ALTER TABLE"):
+            table = query.split()[2]
+            if table in self.existing_columns:
+                raise InvalidRequest("Invalid column name image_variants because it conflicts with an existing column")
+        return FakeResult([])
+
+
+def test_fresh_keyspace_is_migrated_to_latest():
+    session = FakeSession()
+    assert current_version(session, "productos_db") == 0
+    applied = migrate(session, "productos_db")
+    assert [m.version for m in applied] == [m.version for m in MIGRATIONS]
+    assert check_schema(session, "productos_db") == LATEST_VERSION
+    # Una segunda ejecución no aplica nada
+    assert migrate(session, "productos_db") == []
+
+
+def test_tables_created_by_the_old_startup_ddl_are_adopted():
+    """Las columnas que ya existen (DDL antiguo en connect) no hacen fallar la migración"""
+    session = FakeSession(existing_columns={"products", "products_by_user", "active_products_by_shard"})
+    migrate(session, "productos_db")
+    assert check_schema(session, "productos_db") == LATEST_VERSION
+
+
+def test_startup_check_rejects_pending_migrations():
+    session = FakeSession()
+    migrate(session, "productos_db", target=1)
+    with pytest.raises(SchemaVersionError):
+        check_schema(session, "productos_db")
@@ -0,0 +1,81 @@
+"""
+Tests para la caché de productos en proceso (TTL, LRU, caché negativa e invalidación)
+"""
+from Infrastructure.cache_backends import LRUTTLCache
+from Infrastructure.product_cache import ProductCache
+from Infrastructure.testing import FakeClock, make_product
+
+
+def test_lru_evicts_least_recently_used():
+    """Al superar la capacidad se expulsa la entrada usada hace más tiempo"""
+    evictions = []
+    cache = LRUTTLCache(max_entries=2, ttl=60, on_evict=lambda: evictions.append(1))
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("b") == (False, None)
+    assert cache.get("a") == (True, 1)
+    assert cache.get("c") == (True, 3)
+    assert len(evictions) == 1
+
+
+def test_entries_expire_after_ttl():
+    """Las entradas expiran al cumplirse su TTL"""
+    clock = FakeClock()
+    cache = LRUTTLCache(max_entries=10, ttl=5, clock=clock)
+    cache.set("a", 1)
+    clock.now = 4.9
+    assert cache.get("a") == (True, 1)
+    clock.now = 5.0
+    assert cache.get("a") == (False, None)
+
+
+def test_read_through_loads_once_and_returns_copies():
+    """Un segundo acceso no llama al loader y devuelve una copia independiente"""
+    calls = []
+
+    def loader(product_id):
+        calls.append(product_id)
+        return make_product(product_id)
+
+    cache = ProductCache(max_entries=10, ttl=60, name="test_read_through")
+    first = cache.get_or_load("PROD-TEST0001", loader)
+    first.imageUrl = "mutated"
+    second = cache.get_or_load("PROD-TEST0001", loader)
+    assert calls == ["PROD-TEST0001"]
+    assert second.imageUrl == ""
+
+
+def test_unknown_ids_are_negatively_cached():
+    """Los IDs inexistentes se recuerdan durante negative_ttl"""
+    clock = FakeClock()
+    calls = []
+
+    def loader(product_id):
+        calls.append(product_id)
+        return None
+
+    cache = ProductCache(ttl=60, negative_ttl=2, name="test_negative", clock=clock)
+    assert cache.get_or_load("PROD-NOPE", loader) is None
+    assert cache.get_or_load("PROD-NOPE", loader) is None
+    assert len(calls) == 1
+    clock.now = 2.0
+    cache.get_or_load("PROD-NOPE", loader)
+    assert len(calls) == 2
+
+
+def test_invalidate_drops_entry_and_skips_racing_store():
+    """Una invalidación borra la entrada y evita guardar una carga concurrente obsoleta"""
+    cache = ProductCache(ttl=60, name="test_invalidate")
+    cache.get_or_load("PROD-TEST0001", lambda pid: None)
+    cache.invalidate("PROD-TEST0001")
+    assert cache.get_or_load("PROD-TEST0001", make_product) is not None
+
+    def racing_loader(product_id):
+        cache.invalidate(product_id)
+        return make_product(product_id)
+
+    cache.invalidate("PROD-TEST0001")
+    cache.get_or_load("PROD-TEST0001", racing_loader)
+    assert len(cache) == 0
@@ -0,0 +1,129 @@
+"""
+Tests para el índice de productos en proceso (filtros, orden, paginación por cursor y recarga del catálogo)
+"""
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from domain.entidades.product_model import Product
+from domain.entidades.product_query import ProductQuery
+from Infrastructure.product_index import CatalogIndex, ProductIndex, normalize_term
+from Infrastructure.testing import FakeClock
+
+CATEGORIES = ["Frutas", "Vegetales", "Lácteos"]
+ORIGINS = ["Boyacá", "Cundinamarca", "Valle del Cauca"]
+
+
+def make_catalog(n=300, seed=7):
+    rng = random.Random(seed)
+    return [
+        Product(
+            name=f"Producto {i}", category=rng.choice(CATEGORIES), price=float(rng.randint(1, 50) * 100),
+            unit="kg", imageUrl="", stock=5, origin=rng.choice(ORIGINS), description="",
+            user_id=f"USER-{i % 5}", productId=f"PROD-{i:04d}", isOrganic=rng.choice([True, False, None]),
+            freeShipping=rng.random() < 0.3, createdAt=date(2025, 1, 1) + timedelta(days=rng.randint(0, 60)),
+        )
+        for i in range(n)
+    ]
+
+
+def brute_force(products, query):
+    """Resultado esperado: filtrar y ordenar todo el catálogo"""
+    def keep(p):
+        return (
+            (query.category is None or normalize_term(p.category) == normalize_term(query.category))
+            and (query.origin is None or normalize_term(p.origin) == normalize_term(query.origin))
+            and (query.isOrganic is None or bool(p.isOrganic) == query.isOrganic)
+            and (query.freeShipping is None or bool(p.freeShipping) == query.freeShipping)
+            and (query.minPrice is None or p.price >= query.minPrice)
+            and (query.maxPrice is None or p.price <= query.maxPrice)
+        )
+    field = query.sort_field
+    key = {"price": lambda p: (p.price, p.productId), "createdAt": lambda p: (p.createdAt, p.productId)}.get(
+        field, lambda p: p.productId)
+    return [p.productId for p in sorted(filter(keep, products), key=key, reverse=query.descending)]
+
+
+QUERIES = [
+    ProductQuery(),
+    ProductQuery(category="frutas"),
+    ProductQuery(category="LACTEOS", sort="-price"),
+    ProductQuery(origin="boyaca", isOrganic=True, sort="createdAt"),
+    ProductQuery(isOrganic=False, freeShipping=True),
+    ProductQuery(minPrice=1000, maxPrice=2500),
+    ProductQuery(minPrice=1000, maxPrice=2500, sort="-createdAt"),
+    ProductQuery(maxPrice=800, sort="price", category="Vegetales"),
+    ProductQuery(category="Granos"),
+]
+
+
+@pytest.mark.parametrize("query", QUERIES)
+def test_queries_match_a_full_scan_in_every_page(query):
+    """Cada consulta devuelve lo mismo que filtrar y ordenar todo el catálogo, también paginada"""
+    products = make_catalog()
+    index = ProductIndex.from_products(products)
+    expected = brute_force(products, query)
+
+    assert [p.productId for p in index.query(query)[0]] == expected
+
+    seen, token = [], None
+    while True:
+        page, token = index.query(query, limit=17, page_token=token)
+        seen.extend(p.productId for p in page)
+        if token is None:
+            break
+    assert seen == expected
+
+
+def test_incremental_writes_match_a_bulk_build():
+    """Altas, bajas y reemplazos dejan el índice igual que construirlo desde cero"""
+    products = make_catalog(120)
+    index = ProductIndex()
+    for product in products:
+        index.add(product)
+    for product in products[::4]:
+        index.remove(product.productId)
+    index.replace("PROD-0001", price=1.0, category="Granos")
+
+    remaining = [index.get(p.productId) for p in products if index.get(p.productId) is not None]
+    rebuilt = ProductIndex.from_products(remaining)
+    for query in QUERIES + [ProductQuery(category="granos", sort="price")]:
+        assert index.query(query)[0] == rebuilt.query(query)[0]
+    assert [p.productId for p in index.products_by_user("USER-1")[0]] == [
+        p.productId for p in remaining if p.user_id == "USER-1"
+    ]
+
+
+def test_page_token_of_another_sort_is_rejected():
+    """Un token emitido para otro orden es inválido"""
+    index = ProductIndex.from_products(make_catalog(30))
+    _, token = index.query(ProductQuery(sort="price"), limit=5)
+    with pytest.raises(ValueError, match="page_token inválido"):
+        index.query(ProductQuery(sort="createdAt"), limit=5, page_token=token)
+
+
+def test_catalog_index_loads_once_and_replays_writes_over_rebuilds():
+    """El índice del catálogo se carga en el primer uso y las escrituras locales no se pierden al recargarlo"""
+    catalog = make_catalog(20)
+    loads = []
+
+    def loader():
+        loads.append(1)
+        if len(loads) == 2:
+            # Escritura de este proceso durante la recarga (aún no visible en la base de datos)
+            catalog_index.apply(lambda index: index.remove("PROD-0003"))
+        return list(catalog)
+
+    clock = FakeClock()
+    catalog_index = CatalogIndex(loader, ttl=60, clock=clock)
+    catalog_index.apply(lambda index: index.remove("PROD-0000"))  # sin índice todavía: se ignora
+    assert len(catalog_index.get()) == 20
+    assert len(catalog_index.get()) == 20
+    assert len(loads) == 1
+
+    clock.now = 61
+    catalog_index._refresh()
+    assert len(loads) == 2
+    assert catalog_index.get().get("PROD-0003") is None
+    assert len(catalog_index.get()) == 19
@@ -0,0 +1,89 @@
+"""
+Tests para el índice de búsqueda por texto (tokenización en español, BM25, actualizaciones y persistencia)
+"""
+from domain.entidades.product_model import Product
+from domain.entidades.product_query import ProductQuery
+from Infrastructure.in_memory_product_repo import InMemoryProductRepo
+from Infrastructure.search_index import SearchIndex, tokenize
+
+
+def make_product(product_id, name, description="", category="vegetales", origin="Cundinamarca", **fields):
+    return Product(
+        name=name, category=category, price=2500.0, unit="kg", imageUrl="", stock=10,
+        origin=origin, description=description, user_id="USER-1", productId=product_id, **fields,
+    )
+
+
+CATALOG = [
+    make_product("PROD-1", "Papa sabanera", "Papa fresca de páramo", origin="Boyacá"),
+    make_product("PROD-2", "Papas criollas orgánicas", "Cultivo orgánico certificado", origin="Nariño", isOrganic=True),
+    make_product("PROD-3", "Tomate chonto", "Tomates maduros para salsa", origin="Boyacá"),
+    make_product("PROD-4", "Café de origen", "Café orgánico de altura", category="café", origin="Huila", isOrganic=True),
+    make_product("PROD-5", "Limones Tahití", "Limón jugoso", category="frutas", origin="Tolima"),
+]
+
+
+def ids(products):
+    return [p.productId for p in products]
+
+
+def test_tokenizer_folds_accents_plurals_and_gender():
+    """Mayúsculas, tildes, plurales y -o/-a producen los mismos términos; se quitan las stopwords"""
+    assert tokenize("Papas Orgánicas de Boyacá") == tokenize("papa organico boyaca")
+    assert tokenize("limones") == tokenize("Limón")
+    assert tokenize("tomates") == tokenize("tomate")
+    assert tokenize("la de y para") == []
+
+
+def test_bm25_ranks_name_matches_first_and_supports_prefixes():
+    """Las coincidencias en el nombre pesan más; la última palabra también busca por prefijo"""
+    index = SearchIndex.from_products(CATALOG)
+    assert ids(index.search("papa")[0])[:2] == ["PROD-1", "PROD-2"]
+    assert ids(index.search("orgánico boyaca")[0])[0] in {"PROD-2", "PROD-4"}
+    assert set(ids(index.search("orgánico boyaca")[0])) == {"PROD-1", "PROD-2", "PROD-3", "PROD-4"}
+    assert ids(index.search("saban")[0]) == ["PROD-1"]
+    # Con espacio final la palabra está completa: sin expansión por prefijo
+    assert index.search("saban ")[0] == []
+    assert index.search("de la")[0] == []
+
+
+def test_filters_and_pages_apply_to_ranked_hits():
+    """Los filtros del listado restringen los resultados y la paginación recorre el ranking"""
+    index = SearchIndex.from_products(CATALOG)
+    organic = index.search("organico", ProductQuery(category="cafe"))[0]
+    assert ids(organic) == ["PROD-4"]
+    first, more = index.search("papa tomate cafe limon", limit=2)
+    second, more_after = index.search("papa tomate cafe limon", limit=2, offset=2)
+    assert more and len(first) == 2 and len(second) == 2
+    assert not set(ids(first)) & set(ids(second))
+
+
+def test_incremental_updates_and_snapshot_round_trip(tmp_path):
+    """Altas, bajas y cambios de texto se reflejan al momento y el snapshot conserva los resultados"""
+    index = SearchIndex()
+    for product in CATALOG:
+        index.add(product)
+    index.remove("PROD-1")
+    index.replace("PROD-3", name="Tomate cherry")
+    index.replace("PROD-5", imageUrl="http://img/limon.jpg")
+    assert ids(index.search("sabanera")[0]) == []
+    assert ids(index.search("cherry")[0]) == ["PROD-3"]
+
+    path = str(tmp_path / "search.json.gz")
+    index.save(path)
+    loaded, age = SearchIndex.load(path)
+    assert 0 <= age < 60
+    for text in ("papa", "orgánico", "cherry", "limon", "tahiti boyaca"):
+        assert ids(loaded.search(text)[0]) == ids(index.search(text)[0])
+    assert loaded.search("limon")[0][0].imageUrl == "http://img/limon.jpg"
+
+
+def test_in_memory_repo_searches_active_products():
+    """El repositorio en memoria indexa al crear y deja de devolver productos desactivados"""
+    repo = InMemoryProductRepo()
+    repo.add_products(CATALOG, [True] * len(CATALOG))
+    page = repo.search_products("papa", limit=1)
+    assert ids(page.items) == ["PROD-1"] and page.nextPageToken
+    assert ids(repo.search_products("papa", limit=1, page_token=page.nextPageToken).items) == ["PROD-2"]
+    repo.update_product("PROD-1")
+    assert ids(repo.search_products("papa").items) == ["PROD-2"]
@@ -0,0 +1,123 @@
+"""
+Tests para el cliente del servicio de usuarios (caché, lotes y circuit breaker)
+contra el stub local del servicio
+"""
+import asyncio
+
+import pytest
+
+from Infrastructure.testing import FakeClock
+from Infrastructure.users_client import (
+    AsyncUsersClient, CircuitBreaker, UsersServiceClient, UsersServiceError, UsersServiceUnavailable,
+)
+from Infrastructure.users_stub_server import UsersStubServer
+
+
+@pytest.fixture
+def stub():
+    with UsersStubServer(users=["u1", "u2", "u3"]) as server:
+        yield server
+
+
+def test_answers_are_cached_positive_and_negative(stub):
+    """Cada usuario se consulta una sola vez mientras dura su TTL, exista o no"""
+    client = UsersServiceClient(stub.url)
+    assert client.exists("u1") is True
+    assert client.exists("nadie") is False
+    assert client.exists("u1") is True
+    assert client.exists("nadie") is False
+    assert stub.requests == 2
+    client.close()
+
+
+def test_exists_many_queries_each_distinct_user_once(stub):
+    client = UsersServiceClient(stub.url)
+    client.exists("u1")
+    result = client.exists_many(["u1", "u2", "u3", "u2", "x"])
+    assert result == {"u1": True, "u2": True, "u3": True, "x": False}
+    assert stub.requests == 4
+    client.close()
+
+
+def test_circuit_opens_after_consecutive_failures(stub):
+    """Con el circuito abierto no se llama al servicio; tras reset_timeout se prueba de nuevo"""
+    clock = FakeClock()
+    client = UsersServiceClient(stub.url, breaker=CircuitBreaker(failure_threshold=2, reset_timeout=10, clock=clock))
+    stub.failing = True
+    for _ in range(2):
+        with pytest.raises(UsersServiceError):
+            client.exists("u1")
+    with pytest.raises(UsersServiceUnavailable):
+        client.exists("u1")
+    assert stub.requests == 2
+    stub.failing = False
+    clock.now = 10
+    assert client.breaker.state == "half_open"
+    assert client.exists("u1") is True
+    assert client.breaker.state == "closed"
+    client.close()
+
+
+def test_timeout_is_reported_as_service_error():
+    with UsersStubServer(users=["u1"], latency=0.5) as slow:
+        client = UsersServiceClient(slow.url, timeout=0.05)
+        with pytest.raises(UsersServiceError):
+            client.exists("u1")
+        client.close()
+
+
+def open_breaker(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=clock)
+    breaker.record_failure()
+    clock.now = 10
+    return breaker
+
+
+def test_trial_slot_is_released_after_an_unexpected_error(stub, monkeypatch):
+    """Una prueba semiabierta que termina sin resultado libera su turno y la siguiente llamada vuelve a probar"""
+    clock = FakeClock()
+    client = UsersServiceClient(stub.url, breaker=open_breaker(clock))
+
+    def broken_get(*args, **kwargs):
+        raise RuntimeError("error inesperado")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(client.session, "get", broken_get)
+        with pytest.raises(RuntimeError):
+            client.exists("u1")
+    assert client.breaker.state == "half_open"
+    assert client.exists("u1") is True
+    assert client.breaker.state == "closed"
+    client.close()
+
+
+def test_cancelled_async_trial_releases_the_slot():
+    """Cancelar la llamada de prueba del cliente asíncrono no deja el circuito bloqueado"""
+    pytest.importorskip("httpx")
+
+    async def scenario(url):
+        client = AsyncUsersClient(url, breaker=open_breaker(FakeClock()))
+        trial = asyncio.ensure_future(client.exists("u1"))
+        await asyncio.sleep(0.05)
+        trial.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await trial
+        assert client.breaker.allow()
+        await client.close()
+
+    with UsersStubServer(users=["u1"], latency=0.5) as slow:
+        asyncio.run(scenario(slow.url))
+
+
+def test_stale_release_does_not_free_a_newer_trial():
+    """Solo la llamada dueña del turno de prueba puede liberarlo"""
+    clock = FakeClock()
+    breaker = open_breaker(clock)
+    first = breaker.admit()
+    breaker.record_failure()
+    clock.now = 20
+    second = breaker.admit()
+    breaker.release_trial(first)
+    assert second and not breaker.allow()
+    breaker.release_trial(second)
+    assert breaker.allow()
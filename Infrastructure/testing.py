@@ -0,0 +1,25 @@
+"""
+Test Helpers
+Fixtures shared by the Infrastructure and flask_interface test modules. Not a
+test module itself, so importing it never makes pytest collect tests twice.
+"""
+
+from domain.entidades.product_model import Product
+
+
+class FakeClock:
+    """Manually advanced clock (set .now) for TTL and circuit breaker tests"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_product(product_id="PROD-TEST0001"):
+    return Product(
+        name="Papa sabanera", category="vegetales", price=2500.0, unit="kg",
+        imageUrl="", stock=10, origin="Cundinamarca", description="Papa fresca",
+        user_id="USER-1", productId=product_id,
+    )
@@ -0,0 +1,347 @@
+"""
+Users Service Client (Infrastructure Layer)
+Checks that a user exists in the users microservice (GET /users/getById/<id>)
+before a product is registered for it.
+
+Both clients keep pooled keep-alive connections, apply strict timeouts, cache
+positive and negative answers for a while and stop calling the service through
+a circuit breaker after repeated failures, so a slow or down users service
+cannot stall product creation:
+- UsersServiceClient: requests.Session, used by the sync (Flask) mode
+- AsyncUsersClient: httpx.AsyncClient, used by the ASGI serving mode
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, Optional
+from urllib.parse import quote
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from domain.repositorio.user_directory import UserDirectory
+from Infrastructure.cache_backends import LRUTTLCache
+from observability.metrics import CACHE_EVICTIONS, CACHE_HITS, CACHE_MISSES, CIRCUIT_OPENED
+from observability.tracing import CLIENT, bind_context, current_span, inject, start_as_current, with_span
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_USERS_SERVICE_URL = "http://localhost:5001"
+
+
+class UsersServiceError(Exception):
+    """The users service could not answer (timeout, connection error or 5xx)"""
+
+
+class UsersServiceUnavailable(UsersServiceError):
+    """The circuit breaker is open: the users service is not being called"""
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker.
+
+    Features:
+    - Opens after failure_threshold consecutive failures
+    - While open, calls are rejected without touching the dependency
+    - After reset_timeout a single trial call is let through (half-open);
+      its success closes the circuit and its failure opens it again
+    - A trial that ends without an outcome (cancelled, unexpected error)
+      frees its slot through release_trial, so the circuit cannot stay stuck
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0,
+                 name: str = "users_service", clock: Callable[[], float] = time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_in_flight = False
+        self._trial_token = 0
+        self._opened = CIRCUIT_OPENED.labels(dependency=name)
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            if self._clock() - self._opened_at >= self.reset_timeout:
+                return "half_open"
+            return "open"
+
+    def allow(self) -> bool:
+        """True if a call may be made now"""
+        return self.admit() is not None
+
+    def admit(self) -> Optional[int]:
+        """
+        None while open, 0 for a normal call and a trial token for the
+        half-open trial call, to be passed to release_trial when it ends.
+        """
+        with self._lock:
+            if self._opened_at is None:
+                return 0
+            if self._clock() - self._opened_at < self.reset_timeout or self._trial_in_flight:
+                return None
+            self._trial_in_flight = True
+            self._trial_token += 1
+            return self._trial_token
+
+    def release_trial(self, token: int) -> None:
+        """Frees the trial slot if that trial has not recorded an outcome"""
+        with self._lock:
+            if self._trial_in_flight and self._trial_token == token:
+                self._trial_in_flight = False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._trial_in_flight or self._failures >= self.failure_threshold:
+                if self._opened_at is None or self._trial_in_flight:
+                    self._opened.inc()
+                self._opened_at = self._clock()
+                self._trial_in_flight = False
+
+
+class _UsersLookup:
+    """Cache, circuit breaker and status handling shared by the sync and async clients"""
+
+    def __init__(self, cache_ttl: float, negative_ttl: float, cache_size: int,
+                 breaker: Optional[CircuitBreaker]):
+        self.negative_ttl = negative_ttl
+        self.cache = LRUTTLCache(cache_size, cache_ttl, on_evict=CACHE_EVICTIONS.labels(cache="users").inc)
+        self.breaker = breaker if breaker is not None else CircuitBreaker()
+        self._hits = CACHE_HITS.labels(cache="users")
+        self._misses = CACHE_MISSES.labels(cache="users")
+
+    @staticmethod
+    def _settings_from_env() -> dict:
+        return dict(
+            base_url=os.getenv("USERS_SERVICE_URL", DEFAULT_USERS_SERVICE_URL),
+            timeout=float(os.getenv("USERS_SERVICE_TIMEOUT_SECONDS", "2")),
+            max_connections=int(os.getenv("USERS_SERVICE_MAX_CONNECTIONS", "100")),
+            cache_ttl=float(os.getenv("USERS_CACHE_TTL_SECONDS", "300")),
+            negative_ttl=float(os.getenv("USERS_CACHE_NEGATIVE_TTL_SECONDS", "30")),
+            cache_size=int(os.getenv("USERS_CACHE_MAX_ENTRIES", "10000")),
+            breaker=CircuitBreaker(
+                failure_threshold=int(os.getenv("USERS_CIRCUIT_FAILURE_THRESHOLD", "5")),
+                reset_timeout=float(os.getenv("USERS_CIRCUIT_RESET_SECONDS", "30")),
+            ),
+        )
+
+    @staticmethod
+    def _path(user_id: str) -> str:
+        return f"/users/getById/{quote(user_id, safe='')}"
+
+    def _client_span(self, url: str):
+        # Span CLIENT de la llamada saliente; traceparent se inyecta en sus cabeceras
+        return start_as_current("GET /users/getById", CLIENT, {
+            "http.method": "GET", "http.url": url, "peer.service": "users",
+        })
+
+    def _cached(self, user_id: str):
+        found, exists = self.cache.get(user_id)
+        (self._hits if found else self._misses).inc()
+        return found, exists
+
+    def _before_call(self) -> int:
+        token = self.breaker.admit()
+        if token is None:
+            raise UsersServiceUnavailable("Users service circuit is open")
+        return token
+
+    def _on_error(self, exc: Exception) -> UsersServiceError:
+        self.breaker.record_failure()
+        logger.warning(f"Users service request failed: {str(exc)}")
+        return UsersServiceError(str(exc))
+
+    def _on_response(self, user_id: str, status_code: int) -> bool:
+        if status_code >= 500:
+            raise self._on_error(Exception(f"Users service answered {status_code}"))
+        self.breaker.record_success()
+        exists = status_code == 200
+        self.cache.set(user_id, exists, None if exists else self.negative_ttl)
+        return exists
+
+
+class UsersServiceClient(_UsersLookup, UserDirectory):
+    """
+    Sync users-service client over a pooled requests.Session.
+
+    Features:
+    - Keep-alive connection pool and (connect, read) timeouts
+    - TTL cache of positive and (shorter) negative answers
+    - Circuit breaker raising UsersServiceUnavailable while open
+    - exists_many: concurrent fan-out of the uncached IDs
+    """
+
+    def __init__(self, base_url: str = DEFAULT_USERS_SERVICE_URL, timeout: float = 2.0,
+                 connect_timeout: float = 0.5, max_connections: int = 100, fanout: int = 8,
+                 cache_ttl: float = 300.0, negative_ttl: float = 30.0, cache_size: int = 10000,
+                 breaker: Optional[CircuitBreaker] = None):
+        super().__init__(cache_ttl, negative_ttl, cache_size, breaker)
+        self.base_url = base_url.rstrip("/")
+        self.timeout = (connect_timeout, timeout)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_connections, max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._executor = ThreadPoolExecutor(max_workers=fanout, thread_name_prefix="users-lookup")
+
+    @classmethod
+    def from_env(cls) -> Optional["UsersServiceClient"]:
+        """
+        Builds the client from environment variables.
+        Returns None when USERS_VALIDATION_ENABLED is false.
+        """
+        if os.getenv("USERS_VALIDATION_ENABLED", "false").lower() != "true":
+            return None
+        return cls(
+            connect_timeout=float(os.getenv("USERS_SERVICE_CONNECT_TIMEOUT_SECONDS", "0.5")),
+            fanout=int(os.getenv("USERS_SERVICE_FANOUT", "8")),
+            **cls._settings_from_env(),
+        )
+
+    def exists(self, user_id: str) -> bool:
+        """
+        True if the user exists (200), False for any other 4xx answer.
+
+        Raises:
+            UsersServiceUnavailable: If the circuit breaker is open
+            UsersServiceError: If the service is unreachable, times out or fails
+        """
+        found, exists = self._cached(user_id)
+        if found:
+            return exists
+        token = self._before_call()
+        url = self.base_url + self._path(user_id)
+        try:
+            with self._client_span(url) as span:
+                try:
+                    response = self.session.get(url, timeout=self.timeout, headers=inject())
+                except requests.RequestException as e:
+                    raise self._on_error(e)
+                span.set_attribute("http.status_code", response.status_code)
+                return self._on_response(user_id, response.status_code)
+        finally:
+            if token:
+                self.breaker.release_trial(token)
+
+    def exists_many(self, user_ids: Iterable[str]) -> Dict[str, bool]:
+        """Looks up each distinct user once; uncached IDs are queried concurrently"""
+        result, pending = {}, []
+        for user_id in set(user_ids):
+            found, exists = self._cached(user_id)
+            if found:
+                result[user_id] = exists
+            else:
+                pending.append(user_id)
+        if len(pending) == 1:
+            result[pending[0]] = self.exists(pending[0])
+        elif pending:
+            # Cada tarea conserva el span actual (trazas) en su hilo del pool
+            futures = [self._executor.submit(bind_context(self.exists), user_id) for user_id in pending]
+            result.update(zip(pending, (future.result() for future in futures)))
+        return result
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False)
+        self.session.close()
+
+
+class AsyncUsersClient(_UsersLookup):
+    """
+    Async users-service client over a pooled httpx.AsyncClient.
+    Same cache and circuit breaker behaviour as UsersServiceClient.
+    Requires the optional httpx package (pip install httpx).
+    """
+
+    def __init__(self, base_url: str = DEFAULT_USERS_SERVICE_URL, timeout: float = 2.0,
+                 max_connections: int = 100, cache_ttl: float = 300.0, negative_ttl: float = 30.0,
+                 cache_size: int = 10000, breaker: Optional[CircuitBreaker] = None):
+        try:
+            import httpx
+        except ImportError:
+            raise ImportError("The async users client requires the httpx package: pip install httpx")
+        super().__init__(cache_ttl, negative_ttl, cache_size, breaker)
+        self._httpx = httpx
+        self._client = httpx.AsyncClient(
+            base_url=base_url.rstrip("/"),
+            timeout=httpx.Timeout(timeout),
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+        )
+
+    @classmethod
+    def from_env(cls) -> Optional["AsyncUsersClient"]:
+        """Same settings as UsersServiceClient.from_env; None when validation is disabled"""
+        if os.getenv("USERS_VALIDATION_ENABLED", "false").lower() != "true":
+            return None
+        return cls(**cls._settings_from_env())
+
+    async def exists(self, user_id: str) -> bool:
+        """
+        True if the user exists (200), False for any other 4xx answer.
+
+        Raises:
+            UsersServiceUnavailable: If the circuit breaker is open
+            UsersServiceError: If the service is unreachable, times out or fails
+        """
+        found, exists = self._cached(user_id)
+        if found:
+            return exists
+        token = self._before_call()
+        path = self._path(user_id)
+        try:
+            with self._client_span(str(self._client.base_url).rstrip("/") + path) as span:
+                try:
+                    response = await self._client.get(path, headers=inject())
+                except self._httpx.HTTPError as e:
+                    raise self._on_error(e)
+                span.set_attribute("http.status_code", response.status_code)
+                return self._on_response(user_id, response.status_code)
+        finally:
+            # Also on cancellation: a trial without an outcome must not block the next one
+            if token:
+                self.breaker.release_trial(token)
+
+    async def exists_many(self, user_ids: Iterable[str]) -> Dict[str, bool]:
+        """Looks up each distinct user once, concurrently"""
+        unique = list(set(user_ids))
+        return dict(zip(unique, await asyncio.gather(*(self.exists(user_id) for user_id in unique))))
+
+    async def close(self) -> None:
+        await self._client.aclose()
+
+
+class LoopUsersDirectory(UserDirectory):
+    """
+    UserDirectory backed by an AsyncUsersClient running on an event loop.
+    Lets the synchronous CreateProductService, executed in a worker thread by
+    the async routes, validate users through the loop's pooled client.
+    """
+
+    def __init__(self, client: AsyncUsersClient, loop: asyncio.AbstractEventLoop):
+        self.client = client
+        self.loop = loop
+
+    def exists(self, user_id: str) -> bool:
+        return self._run(self.client.exists(user_id))
+
+    def exists_many(self, user_ids: Iterable[str]) -> Dict[str, bool]:
+        return self._run(self.client.exists_many(user_ids))
+
+    def _run(self, coro):
+        # La tarea del bucle no hereda el contexto de este hilo: se le pasa el span actual
+        return asyncio.run_coroutine_threadsafe(with_span(current_span(), coro), self.loop).result()
@@ -0,0 +1,122 @@
+"""
+Users Service Stub (Infrastructure Layer)
+Minimal local stand-in for the users microservice so user validation can be
+developed and tested offline. Serves GET /users/getById/<id>: 200 with the
+user for known IDs, 404 otherwise. Latency and failures can be injected.
+
+Usage:
+    python -m Infrastructure.users_stub_server --port 5001 --users u1,u2
+"""
+
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Iterable, Optional
+from urllib.parse import unquote
+
+USER_PATH = "/users/getById/"
+
+
+class UsersStubServer:
+    """
+    Threaded HTTP server answering like the users service.
+
+    Features:
+    - Known users configurable at runtime (add_user)
+    - Injectable latency (seconds) and failure mode (answers 503)
+    - Request counter to assert caching and fan-out in tests
+    - Usable as a context manager (starts on a free port by default)
+    """
+
+    def __init__(self, users: Iterable[str] = (), host: str = "127.0.0.1", port: int = 0,
+                 latency: float = 0.0):
+        self.users = set(users)
+        self.latency = latency
+        self.failing = False
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def add_user(self, user_id: str) -> None:
+        self.users.add(user_id)
+
+    def start(self) -> "UsersStubServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, args=(0.05,), daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "UsersStubServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def _answer(self, path: str):
+        with self._lock:
+            self.requests += 1
+        if self.latency:
+            time.sleep(self.latency)
+        if self.failing:
+            return 503, {"error": "Servicio no disponible"}
+        if not path.startswith(USER_PATH):
+            return 404, {"error": "Recurso no encontrado"}
+        user_id = unquote(path[len(USER_PATH):])
+        if user_id in self.users:
+            return 200, {"id": user_id}
+        return 404, {"error": "Usuario no encontrado"}
+
+    def _handler_class(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive, like the real service
+
+            def do_GET(self):
+                status, body = stub._answer(self.path)
+                payload = json.dumps(body).encode()
+                try:
+                    self.send_response(status)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(payload)))
+                    self.end_headers()
+                    self.wfile.write(payload)
+                except ConnectionError:
+                    pass  # the client gave up (timeout tests)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stub local del servicio de usuarios")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5001)
+    parser.add_argument("--users", default="", help="IDs de usuarios existentes separados por comas")
+    parser.add_argument("--latency", type=float, default=0.0, help="Latencia añadida por petición (segundos)")
+    args = parser.parse_args()
+    users = [u for u in args.users.split(",") if u]
+    server = UsersStubServer(users, host=args.host, port=args.port, latency=args.latency)
+    print(f"👥 Stub de usuarios en {server.url} ({len(users)} usuarios)")
+    try:
+        server._server.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
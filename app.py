@@ -3,58 +3,81 @@ Servicio de Gestión de Productos para Agroweb
 Aplicación Flask que maneja la gestión de productos agrícolas de la plataforma Agroweb.
 Incluye registro, consulta y listado de productos con Cassandra como base de datos.
 Instrumentación de métricas Prometheus para observabilidad.
+
+create_app() construye la aplicación sin abrir conexiones: la sesión de Cassandra
+se crea por proceso en la primera petición (flask_interface/dependencies.py).
+Producción: gunicorn -c gunicorn.conf.py wsgi:app
 """
 
 from flask import Flask, jsonify, request, Response
 from flask_interface.routes import bp
+from flask_interface.image_routes import images_bp
+from flask_interface.json_provider import FastJSONProvider
+from flask_interface.dependencies import readiness
 from flasgger import Swagger
 from flask_cors import CORS
 from prometheus_client import generate_latest
 import os
 
-app = Flask(__name__, static_folder='static')
 
-# Configuración de Swagger para documentación automática de la API
-swagger = Swagger(app, template_file='swagger/swagger.yaml')
+def create_app() -> Flask:
+    # Las imágenes del catálogo se sirven desde images_bp (ETag, caché immutable, rangos)
+    app = Flask(__name__, static_folder=None)
+
+    # Proveedor JSON rápido (orjson si está instalado, json estándar si no)
+    app.json = FastJSONProvider(app)
+
+    # Configuración de Swagger para documentación automática de la API
+    Swagger(app, template_file='swagger/swagger.yaml')
+
+    # Configuración de CORS para permitir solicitudes desde el frontend (puerto 5174)
+    CORS(app, origins=["http://localhost:5174"])
+
+    # Registro del blueprint de rutas de productos
+    app.register_blueprint(bp)
+    app.register_blueprint(images_bp)
+
+    # Endpoint de métricas Prometheus para observabilidad
+    @app.route('/metrics')
+    def metrics():
+        return Response(generate_latest(), mimetype='text/plain')
 
-# Configuración de CORS para permitir solicitudes desde el frontend (puerto 5174)
-CORS(app, origins=["http://localhost:5174"])
+    # Manejadores de errores HTTP
+    @app.errorhandler(400)
+    def bad_request(error):
+        return jsonify({"error": str(error.description) if hasattr(error, "description") else "Solicitud incorrecta"}), 400
 
-# Registro del blueprint de rutas de productos
-app.register_blueprint(bp)
+    @app.errorhandler(404)
+    def not_found(error):
+        return jsonify({"error": "Recurso no encontrado"}), 404
 
-# Endpoint de métricas Prometheus para observabilidad
-@app.route('/metrics')
-def metrics():
-    return Response(generate_latest(), mimetype='text/plain')
+    @app.errorhandler(415)
+    def unsupported_media_type(error):
+        return jsonify({"error": "Content-Type must be application/json"}), 415
 
-# Manejadores de errores HTTP
-@app.errorhandler(400)
-def bad_request(error):
-    return jsonify({"error": str(error.description) if hasattr(error, "description") else "Solicitud incorrecta"}), 400
+    @app.errorhandler(500)
+    def internal_error(error):
+        return jsonify({"error": "Error interno del servidor"}), 500
 
-@app.errorhandler(404)
-def not_found(error):
-    return jsonify({"error": "Recurso no encontrado"}), 404
+    # Endpoint de salud para monitoreo y observabilidad
+    @app.route('/health')
+    def health():
+        """Health check endpoint para verificar estado del servicio"""
+        return jsonify({
+            'status': 'healthy',
+            'service': 'productos',
+            'version': '1.2.0',
+            'metrics_endpoint': '/metrics'
+        })
 
-@app.errorhandler(415)
-def unsupported_media_type(error):
-    return jsonify({"error": "Content-Type must be application/json"}), 415
+    # Readiness: el worker tiene sesión de Cassandra y el esquema está al día (/health siempre responde)
+    @app.route('/ready')
+    def ready():
+        is_ready, detail = readiness()
+        return jsonify(detail), 200 if is_ready else 503
 
-@app.errorhandler(500)
-def internal_error(error):
-    return jsonify({"error": "Error interno del servidor"}), 500
+    return app
 
-# Endpoint de salud para monitoreo y observabilidad
-@app.route('/health')
-def health():
-    """Health check endpoint para verificar estado del servicio"""
-    return jsonify({
-        'status': 'healthy',
-        'service': 'productos',
-        'version': '1.2.0',
-        'metrics_endpoint': '/metrics'
-    })
 
 if __name__ == "__main__":
     print("🔧 Iniciando configuración de Flask...")
@@ -67,4 +90,15 @@ if __name__ == "__main__":
     print("=" * 50)
     print("✅ SERVIDOR LISTO - Esperando conexiones HTTP...")
     print("=" * 50)
-    app.run(debug=debug_mode, port=5000, host="127.0.0.1")
\ No newline at end of file
+    # SERVING_MODE=async sirve la misma API con Quart sobre hypercorn (asgi.py)
+    if os.getenv("SERVING_MODE", "sync").lower() == "async":
+        import asyncio
+        from hypercorn.asyncio import serve
+        from hypercorn.config import Config
+        from asgi import app as asgi_app
+        config = Config()
+        config.bind = ["127.0.0.1:5000"]
+        asyncio.run(serve(asgi_app, config))
+    else:
+        # Servidor de desarrollo de Flask (un proceso); en producción usar gunicorn (wsgi.py)
+        create_app().run(debug=debug_mode, port=5000, host="127.0.0.1")
@@ -1,13 +1,117 @@
 from domain.repositorio.product_repo import ProductRepository
+from domain.repositorio.image_storage import ImageStorage
+from domain.repositorio.user_directory import UserDirectory
 from domain.entidades.product_model import Product
-from dataclasses import dataclass
-from typing import Dict
+from dataclasses import MISSING, dataclass, fields
+from typing import Dict, List, Optional
+
+# Campos de Product sin valor por defecto y campos aceptados como entrada
+REQUIRED_FIELDS = tuple(
+    f.name for f in fields(Product) if f.init and f.default is MISSING and f.default_factory is MISSING
+)
+INPUT_FIELDS = frozenset(f.name for f in fields(Product) if f.init)
+
+
+def _row_product(data: Dict) -> Product:
+    """
+    Product de una fila de carga masiva, con errores legibles para el cliente
+    en lugar de los mensajes de Python (argumentos faltantes o desconocidos, tipos).
+
+    Raises:
+        ValueError: Si la fila no es válida
+    """
+    if not isinstance(data, dict):
+        raise ValueError("Cada fila debe ser un objeto")
+    missing = [name for name in REQUIRED_FIELDS if name not in data]
+    if missing:
+        raise ValueError(f"Faltan campos obligatorios: {', '.join(missing)}")
+    unknown = sorted(name for name in data if name not in INPUT_FIELDS)
+    if unknown:
+        raise ValueError(f"Campos desconocidos: {', '.join(unknown)}")
+    try:
+        return Product(**data)
+    except TypeError:
+        # p. ej. price o stock como texto no numérico
+        raise ValueError("Tipo de dato inválido en algún campo (price, originalPrice y stock deben ser numéricos)")
 
 @dataclass
 class CreateProductService:
     repo: ProductRepository
+    images: Optional[ImageStorage] = None
+    users: Optional[UserDirectory] = None
 
-    def execute(self, data: Dict) -> Product:
+    def execute(self, data: Dict, image=None) -> Product:
+        """
+        Creates a product with a single write. When an image is given, the productId
+        and image URL are resolved before persisting, and the saved image is removed
+        if the write fails, so no row is left pointing to a missing image. Only a file
+        created by this call is removed: an identical image already stored belongs to
+        an existing product.
+        Resized variants are queued once the product exists.
+
+        Raises:
+            ValueError: If the data is invalid, the user does not exist or the productId is taken
+        """
         product = Product(**data)
-        self.repo.add_product(product)
-        return product
\ No newline at end of file
+        # Se valida el usuario antes de guardar la imagen (sin escrituras si no existe)
+        if self.users is not None and not self.users.exists(product.user_id):
+            raise ValueError("El usuario no existe")
+        # Un productId enviado por el cliente que ya existe se rechaza antes de escribir nada
+        if image is not None and "productId" in data and self.repo.get_product_by_id(product.productId) is not None:
+            raise ValueError("Ya existe un producto con ese ID")
+        created_image = False
+        if image is not None:
+            product.imageUrl, created_image = self.images.save(product.productId, image)
+        try:
+            # IDs generated by Product (not sent by the client) can skip the duplicate check
+            self.repo.add_product(product, trusted_id="productId" not in data)
+        except Exception:
+            if created_image:
+                self.images.delete(product.imageUrl)
+            raise
+        if image is not None:
+            # Las variantes redimensionadas se generan en segundo plano
+            self.images.process_async(product.productId, product.imageUrl)
+        return product
+
+    def execute_batch(self, rows: List[Dict]) -> List[Dict]:
+        """
+        Validates every row through Product (and its user, when a UserDirectory is set)
+        and persists the valid ones in one bulk write.
+        Returns one result per row, in input order:
+        {"row": i, "status": "created", "productId": ...} or {"row": i, "status": "error", "error": ...}
+        """
+        results: List[Dict] = [None] * len(rows)
+        products, trusted_ids, positions = [], [], []
+        seen_ids = set()
+        for i, data in enumerate(rows):
+            try:
+                product = _row_product(data)
+                if product.productId in seen_ids:
+                    raise ValueError("productId repetido en la carga")
+            except ValueError as e:
+                results[i] = {"row": i, "status": "error", "error": str(e)}
+                continue
+            seen_ids.add(product.productId)
+            products.append(product)
+            trusted_ids.append("productId" not in data)
+            positions.append(i)
+
+        if self.users is not None and products:
+            # Una consulta por usuario distinto de la carga
+            existing = self.users.exists_many(p.user_id for p in products)
+            valid = [k for k, p in enumerate(products) if existing[p.user_id]]
+            for k, product in enumerate(products):
+                if not existing[product.user_id]:
+                    results[positions[k]] = {"row": positions[k], "status": "error", "error": "El usuario no existe"}
+            products = [products[k] for k in valid]
+            trusted_ids = [trusted_ids[k] for k in valid]
+            positions = [positions[k] for k in valid]
+
+        errors = self.repo.add_products(products, trusted_ids) if products else []
+        for i, product, error in zip(positions, products, errors):
+            if error is None:
+                results[i] = {"row": i, "status": "created", "productId": product.productId}
+            else:
+                results[i] = {"row": i, "status": "error", "error": error}
+        return results
@@ -1,9 +1,23 @@
 from domain.repositorio.product_repo import ProductRepository
+from domain.entidades.product_query import ProductQuery
 from dataclasses import dataclass
+from typing import Optional
 
 @dataclass
 class GetAllProductsService:
     repo: ProductRepository
 
     def execute(self):
-        return self.repo.get_all_products()
\ No newline at end of file
+        return self.repo.get_all_products()
+
+    def execute_page(self, limit: int, page_token: Optional[str] = None):
+        return self.repo.get_all_products_page(limit, page_token)
+
+    def execute_filtered(self, query: ProductQuery):
+        return self.repo.find_products(query).items
+
+    def execute_filtered_page(self, query: ProductQuery, limit: int, page_token: Optional[str] = None):
+        return self.repo.find_products(query, limit, page_token)
+
+    def stream(self):
+        return self.repo.iter_all_products()
@@ -1,9 +1,13 @@
 from domain.repositorio.product_repo import ProductRepository
 from dataclasses import dataclass
+from typing import Optional
 
 @dataclass
 class GetProductsByUserIDService:
     repo: ProductRepository
 
-    def execute(self):
-        return self.repo.get_products_by_user_id(self.user_id)
\ No newline at end of file
+    def execute(self, user_id: str):
+        return self.repo.get_products_by_user_id(user_id)
+
+    def execute_page(self, user_id: str, limit: int, page_token: Optional[str] = None):
+        return self.repo.get_products_by_user_id_page(user_id, limit, page_token)
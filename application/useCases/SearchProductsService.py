@@ -0,0 +1,14 @@
+from domain.repositorio.product_repo import ProductRepository
+from domain.entidades.product_query import ProductQuery
+from dataclasses import dataclass
+from typing import Optional
+
+@dataclass
+class SearchProductsService:
+    repo: ProductRepository
+
+    def execute(self, text: str, query: Optional[ProductQuery], limit: int, page_token: Optional[str] = None):
+        # Búsqueda por texto ordenada por relevancia; los filtros del listado se aplican sobre los resultados
+        if query is not None and query.sort is not None:
+            raise ValueError("sort no está disponible en la búsqueda (se ordena por relevancia)")
+        return self.repo.search_products(text, query, limit, page_token)
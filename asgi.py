@@ -0,0 +1,97 @@
+"""
+Servicio de Productos AgroWeb en modo asíncrono (ASGI)
+Misma API que app.py servida por Quart: las lecturas esperan los futures del
+driver de Cassandra y la validación de usuarios usa un cliente HTTP asíncrono,
+de modo que un worker mantiene cientos de peticiones en vuelo sin un hilo por
+petición.
+
+Uso:
+    hypercorn asgi:app --bind 127.0.0.1:5000
+    SERVING_MODE=async python app.py
+
+Las imágenes del catálogo siguen servidas por images_bp (Flask/WSGI) montado
+dentro de la aplicación ASGI. La documentación Swagger solo está en modo sync.
+"""
+
+from flask import Flask
+from hypercorn.middleware import AsyncioWSGIMiddleware
+from prometheus_client import generate_latest
+from quart import Quart, jsonify, Response
+from flask_interface.async_routes import async_bp
+from flask_interface.dependencies import readiness
+from flask_interface.image_routes import images_bp
+from flask_interface.json_provider import FastJSONProvider
+import asyncio
+
+app = Quart(__name__, static_folder=None)
+app.json = FastJSONProvider(app)
+app.register_blueprint(async_bp)
+
+# Imágenes del catálogo: mismo blueprint que en modo sync, ejecutado como WSGI
+IMAGES_PREFIX = "/static/catalog/"
+images_app = Flask(__name__, static_folder=None)
+images_app.register_blueprint(images_bp)
+images_asgi = AsyncioWSGIMiddleware(images_app)
+quart_asgi = app.asgi_app
+
+
+async def asgi_app(scope, receive, send):
+    if scope["type"] == "http" and scope["path"].startswith(IMAGES_PREFIX):
+        return await images_asgi(scope, receive, send)
+    return await quart_asgi(scope, receive, send)
+
+
+app.asgi_app = asgi_app
+
+# CORS para el frontend (puerto 5174); flask_cors no aplica a Quart
+CORS_ORIGIN = "http://localhost:5174"
+
+
+@app.after_request
+async def add_cors_headers(response):
+    response.headers["Access-Control-Allow-Origin"] = CORS_ORIGIN
+    response.vary.add("Origin")
+    return response
+
+
+@app.route('/metrics')
+async def metrics():
+    return Response(generate_latest(), mimetype='text/plain')
+
+
+@app.errorhandler(400)
+async def bad_request(error):
+    return jsonify({"error": str(error.description) if hasattr(error, "description") else "Solicitud incorrecta"}), 400
+
+
+@app.errorhandler(404)
+async def not_found(error):
+    return jsonify({"error": "Recurso no encontrado"}), 404
+
+
+@app.errorhandler(415)
+async def unsupported_media_type(error):
+    return jsonify({"error": "Content-Type must be application/json"}), 415
+
+
+@app.errorhandler(500)
+async def internal_error(error):
+    return jsonify({"error": "Error interno del servidor"}), 500
+
+
+@app.route('/health')
+async def health():
+    """Health check endpoint para verificar estado del servicio"""
+    return jsonify({
+        'status': 'healthy',
+        'service': 'productos',
+        'version': '1.2.0',
+        'mode': 'async',
+        'metrics_endpoint': '/metrics'
+    })
+
+
+@app.route('/ready')
+async def ready():
+    is_ready, detail = await asyncio.to_thread(readiness)
+    return jsonify(detail), 200 if is_ready else 503
@@ -0,0 +1,75 @@
+"""
+Benchmark: throughput de creación de productos por modo de PRODUCT_CREATE_MODE
+
+Modos comparados:
+- check: lectura previa + batch de inserción (comportamiento anterior)
+- lwt:   INSERT ... IF NOT EXISTS + batch de tablas de consulta
+- trust: batch de inserción sin verificación para IDs PROD- generados por el servidor
+
+Requiere Cassandra en ejecución (docker-compose up -d cassandra).
+Los productos creados se eliminan al terminar cada modo.
+
+Uso:
+    python -m benchmarks.bench_create_modes --products 2000 --threads 16
+"""
+import argparse
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.stats import format_summary, summarize
+from domain.entidades.product_model import Product
+from Infrastructure.cassandra_db import CREATE_MODES, CassandraDB
+
+BENCH_USER_ID = "bench-create-user"
+
+
+def make_products(count: int):
+    """Genera productos con IDs PROD- únicos, como los crea el servidor"""
+    return [
+        Product(
+            name=f"Producto benchmark {i}", category="frutas", price=1000.0 + i, unit="kg",
+            imageUrl="", stock=i % 50, origin="Tolima", description="benchmark",
+            user_id=BENCH_USER_ID, productId=f"PROD-{uuid.uuid4().hex[:12].upper()}",
+        )
+        for i in range(count)
+    ]
+
+
+def run_mode(database: CassandraDB, mode: str, products, threads: int):
+    """Crea todos los productos con el modo indicado y devuelve (segundos, latencias)"""
+    database.create_mode = mode
+    latencies = []
+
+    def create(product):
+        start = time.perf_counter()
+        database.add_product(product, trusted_id=True)
+        latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(create, products))
+    return time.perf_counter() - start, latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de modos de creación de productos")
+    parser.add_argument("--products", type=int, default=1000, help="Productos creados por modo")
+    parser.add_argument("--threads", type=int, default=16, help="Creaciones concurrentes")
+    args = parser.parse_args()
+
+    database = CassandraDB()
+    print(f"⏱️  Creando {args.products} productos por modo con {args.threads} hilos...")
+    try:
+        for mode in CREATE_MODES:
+            products = make_products(args.products)
+            elapsed, latencies = run_mode(database, mode, products, args.threads)
+            print(format_summary(f"{mode} ({args.products / elapsed:.0f} creaciones/s)", summarize(latencies)))
+            for product in products:
+                database.delete_product(product.productId, product.user_id)
+    finally:
+        database.disconnect()
+
+
+if __name__ == "__main__":
+    main()
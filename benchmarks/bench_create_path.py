@@ -0,0 +1,95 @@
+"""
+Benchmark: latencia del camino de creación de productos con imagen
+
+Compara el flujo anterior (INSERT con imageUrl vacío + guardar imagen + UPDATE de
+image_url) con el flujo actual de escritura única (ID e imagen resueltos antes de
+persistir, un solo INSERT). Ambos guardan la misma imagen en un directorio temporal.
+
+Requiere Cassandra en ejecución (docker-compose up -d cassandra).
+Los productos creados se eliminan al terminar.
+
+Uso:
+    python -m benchmarks.bench_create_path --iterations 500
+"""
+import argparse
+import io
+import os
+import shutil
+import tempfile
+import time
+
+from application.useCases.CreateProductService import CreateProductService
+from benchmarks.stats import format_summary, summarize
+from Infrastructure.adapterProductRepo import AdapterProductRepo
+from Infrastructure.local_image_storage import LocalImageStorage
+
+IMAGE_BYTES = os.urandom(200 * 1024)
+
+
+class UploadedImage:
+    """Imita el FileStorage de werkzeug que llega en el formulario multipart"""
+
+    def __init__(self, filename: str):
+        self.filename = filename
+
+    def save(self, path: str):
+        with open(path, "wb") as f:
+            shutil.copyfileobj(io.BytesIO(IMAGE_BYTES), f)
+
+
+def product_data(i: int):
+    return {
+        "name": f"Producto benchmark {i}", "category": "vegetales", "price": 1500.0,
+        "unit": "kg", "stock": 10, "origin": "Boyacá", "description": "benchmark",
+        "user_id": "bench-create-path", "imageUrl": "",
+    }
+
+
+def run_legacy(repo, images, iterations):
+    """Flujo anterior: INSERT, guardar imagen y UPDATE de image_url"""
+    service = CreateProductService(repo)
+    samples, created = [], []
+    for i in range(iterations):
+        start = time.perf_counter()
+        product = service.execute(product_data(i))
+        product.imageUrl, _ = images.save(product.productId, UploadedImage("foto.jpg"))
+        repo.update_image_url(product.productId, product.imageUrl)
+        samples.append(time.perf_counter() - start)
+        created.append(product)
+    return samples, created
+
+
+def run_single_write(repo, images, iterations):
+    """Flujo actual: imagen resuelta antes de persistir y un único INSERT"""
+    service = CreateProductService(repo, images)
+    samples, created = [], []
+    for i in range(iterations):
+        start = time.perf_counter()
+        product = service.execute(product_data(i), image=UploadedImage("foto.jpg"))
+        samples.append(time.perf_counter() - start)
+        created.append(product)
+    return samples, created
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del camino de creación de productos")
+    parser.add_argument("--iterations", type=int, default=300)
+    args = parser.parse_args()
+
+    repo = AdapterProductRepo()
+    directory = tempfile.mkdtemp(prefix="agroweb-bench-")
+    images = LocalImageStorage(directory=directory)
+    print(f"⏱️  Creando {args.iterations} productos con imagen por flujo (modo {repo.database.create_mode})...")
+    try:
+        for label, runner in (("INSERT + UPDATE (anterior)", run_legacy), ("Escritura única", run_single_write)):
+            samples, created = runner(repo, images, args.iterations)
+            print(format_summary(label, summarize(samples)))
+            for product in created:
+                repo.database.delete_product(product.productId, product.user_id)
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+        repo.database.disconnect()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Benchmark: serialización JSON del listado de productos
+
+Compara, para 10k productos por defecto:
+- jsonify anterior: [p.toDictionary() for p in products] + json estándar (sort_keys, compacto)
+- ProductSerializer sin caché: fragmentos en bytes (orjson si está instalado)
+- ProductSerializer con caché de fragmentos caliente (productos sin cambios entre peticiones)
+
+Mide el tiempo de serialización (mejor de N) y la memoria asignada (pico de tracemalloc).
+No requiere Cassandra.
+
+Uso:
+    python -m benchmarks.bench_json_serialization --products 10000
+"""
+import argparse
+import gc
+import json
+import time
+import tracemalloc
+
+from domain.entidades.product_model import Product
+from flask_interface.json_provider import USE_ORJSON
+from flask_interface.product_serializer import ProductSerializer
+
+
+def make_products(count: int):
+    categories = ("vegetales", "frutas", "lácteos", "hierbas")
+    return [
+        Product(
+            name=f"Producto {i}", category=categories[i % 4], price=1000.0 + i % 5000, unit="kg",
+            imageUrl=f"http://localhost:5000/static/catalog/PROD-{i:08X}.jpg", stock=i % 200,
+            origin="Boyacá", description="Producto de benchmark cultivado en Colombia",
+            user_id=f"user-{i % 500}", productId=f"PROD-{i:08X}", originalPrice=float("nan"),
+            isOrganic=i % 2 == 0, freeShipping=i % 5 == 0,
+            imageVariants={"thumbnail": f"PROD-{i:08X}-thumbnail.webp", "card": f"PROD-{i:08X}-card.webp"},
+        )
+        for i in range(count)
+    ]
+
+
+def serialize_legacy(products):
+    """Lo que hacía jsonify([p.toDictionary() for p in products]) con el proveedor por defecto"""
+    return json.dumps([p.toDictionary() for p in products], ensure_ascii=True,
+                      sort_keys=True, separators=(",", ":")).encode("utf-8")
+
+
+def measure(label, serialize, products, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        body = serialize(products)
+        best = min(best, time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    serialize(products)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<30} {best * 1000:>8.2f} ms   {peak / 1024 / 1024:>7.2f} MiB asignados (pico)   {len(body) / 1024:>7.0f} KiB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de serialización JSON de productos")
+    parser.add_argument("--products", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5, help="Repeticiones de la medición de tiempo (se toma la mejor)")
+    args = parser.parse_args()
+
+    products = make_products(args.products)
+    print(f"⏱️  Serializando {args.products} productos (codificador: {'orjson' if USE_ORJSON else 'json estándar'})...")
+    measure("jsonify + toDictionary", serialize_legacy, products, args.repeat)
+    measure("ProductSerializer sin caché", ProductSerializer(cache_size=0).list_bytes, products, args.repeat)
+    warm = ProductSerializer(cache_size=args.products)
+    warm.list_bytes(products)
+    measure("ProductSerializer caché", warm.list_bytes, products, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Micro-benchmark: consulta puntual de producto con SimpleStatement vs sentencia preparada
+
+Compara la latencia p50/p99 del camino get_product_by_id antes (SimpleStatement
+parseado por el coordinador en cada petición) y después (sentencia preparada
+desde el registro de CassandraConnection, enrutada token-aware).
+
+Requiere Cassandra en ejecución (docker-compose up -d cassandra).
+
+Uso:
+    python -m benchmarks.bench_prepared_statements --iterations 5000
+"""
+import argparse
+import time
+
+from cassandra import ConsistencyLevel
+from cassandra.query import SimpleStatement
+
+from benchmarks.stats import format_summary, summarize
+from domain.entidades.product_model import Product
+from Infrastructure.cassandra_db import CassandraDB
+
+BENCH_PRODUCT_ID = "test-bench-prepared"
+
+
+def seed_product(database: CassandraDB) -> None:
+    """Inserta el producto de prueba si no existe todavía"""
+    if database.get_product_by_id(BENCH_PRODUCT_ID):
+        return
+    database.add_product(Product(
+        name="Papa sabanera", category="vegetales", price=2500.0, unit="kg",
+        imageUrl="", stock=10, origin="Cundinamarca", description="benchmark",
+        user_id="bench-user", productId=BENCH_PRODUCT_ID,
+    ))
+
+
+def run_simple(session, iterations: int):
+    """Camino anterior: un SimpleStatement nuevo por petición"""
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        statement = SimpleStatement(
+            "SELECT * FROM products WHERE product_id = %s",
+            consistency_level=ConsistencyLevel.ONE,
+        )
+        session.execute(statement, [BENCH_PRODUCT_ID]).one()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def run_prepared(database: CassandraDB, iterations: int):
+    """Camino nuevo: sentencia preparada del registro"""
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        statement = database.connection.prepared("select_product_by_id")
+        database.session.execute(statement, [BENCH_PRODUCT_ID]).one()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de sentencias preparadas")
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--warmup", type=int, default=200)
+    args = parser.parse_args()
+
+    database = CassandraDB()
+    seed_product(database)
+
+    print("🔥 Calentando conexiones...")
+    run_simple(database.session, args.warmup)
+    run_prepared(database, args.warmup)
+
+    print(f"⏱️  Ejecutando {args.iterations} consultas puntuales por modo...")
+    simple = summarize(run_simple(database.session, args.iterations))
+    prepared = summarize(run_prepared(database, args.iterations))
+
+    print(format_summary("SimpleStatement", simple))
+    print(format_summary("PreparedStatement", prepared))
+    if prepared["p50_ms"] > 0:
+        print(f"📈 Mejora p50: {simple['p50_ms'] / prepared['p50_ms']:.2f}x | "
+              f"p99: {simple['p99_ms'] / max(prepared['p99_ms'], 1e-9):.2f}x")
+
+    database.disconnect()
+
+
+if __name__ == "__main__":
+    main()
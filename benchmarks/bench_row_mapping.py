@@ -0,0 +1,130 @@
+"""
+Benchmark: mapeo de filas de Cassandra a entidades Product
+
+Compara, sobre un catálogo sintético (100k filas por defecto), el camino anterior
+(named tuple -> dict con fechas ISO -> copia limpiada -> Product con __dict__, que
+vuelve a parsear las fechas) con el actual (row factory que construye Product con
+__slots__ directamente desde la fila).
+
+Mide objetos por segundo y bytes por objeto (retenidos y pico, con tracemalloc).
+No requiere Cassandra: las filas se generan con los mismos tipos que devuelve el driver.
+
+Uso:
+    python -m benchmarks.bench_row_mapping --rows 100000
+"""
+import argparse
+import gc
+import math
+import time
+import tracemalloc
+
+from cassandra.query import named_tuple_factory
+from cassandra.util import Date
+
+from domain.entidades.product_model import Product
+from Infrastructure.cassandra_rows import product_row_factory
+from Infrastructure.cassandra_statements import PRODUCT_COLUMNS
+
+COLNAMES = [name.strip() for name in PRODUCT_COLUMNS.split(",")]
+
+# Disposición anterior de Product: mismos __init__/__post_init__, atributos en __dict__
+LegacyProduct = type("LegacyProduct", (), {
+    "__init__": Product.__init__,
+    "__post_init__": Product.__post_init__,
+})
+
+
+def make_rows(count: int):
+    """Filas en el orden de PRODUCT_COLUMNS con los tipos del driver (DATE -> cassandra.util.Date)"""
+    categories = ("vegetales", "frutas", "lácteos", "hierbas")
+    rows = []
+    for i in range(count):
+        rows.append((
+            f"PROD-{i:08X}", f"Producto {i}", categories[i % 4], 1000.0 + i % 5000,
+            float("nan") if i % 3 else 1500.0, "kg", f"http://localhost:5000/static/catalog/{i}.jpg",
+            i % 200, "Boyacá", "Producto de benchmark", f"user-{i % 500}",
+            Date(19000 + i % 1000), Date(19500 + i % 500), True, i % 2 == 0, None, i % 5 == 0, None,
+        ))
+    return rows
+
+
+def legacy_row_to_dict(row):
+    """Copia de CassandraDB._row_to_dict antes del cambio"""
+    def format_date(date_obj):
+        if date_obj is None:
+            return None
+        if hasattr(date_obj, 'isoformat'):
+            return date_obj.isoformat()
+        return str(date_obj)
+
+    stock = row.stock if row.stock is not None else 0
+    return {
+        "productId": row.product_id, "name": row.name, "category": row.category,
+        "price": row.price, "originalPrice": row.original_price, "unit": row.unit,
+        "imageUrl": row.image_url, "stock": stock, "origin": row.origin,
+        "description": row.description, "user_id": row.user_id,
+        "createdAt": format_date(row.created_at), "updatedAt": format_date(row.updated_at),
+        "isActive": row.is_active, "isOrganic": row.is_organic, "isBestSeller": row.is_best_seller,
+        "freeShipping": row.free_shipping, "inStock": stock > 0,
+        "imageVariants": dict(row.image_variants) if row.image_variants else None,
+    }
+
+
+def legacy_clean(prod):
+    """Copia de AdapterProductRepo._clean antes del cambio"""
+    prod = dict(prod)
+    prod.pop("inStock", None)
+    for k, v in prod.items():
+        if isinstance(v, float) and math.isnan(v):
+            prod[k] = None
+        if v == "NaT":
+            prod[k] = None
+    return prod
+
+
+def map_legacy(rows):
+    """Camino anterior: el driver crea named tuples, CassandraDB dicts y el adaptador Products"""
+    dicts = [legacy_row_to_dict(row) for row in named_tuple_factory(COLNAMES, rows)]
+    return [LegacyProduct(**legacy_clean(d)) for d in dicts]
+
+
+def map_direct(rows):
+    """Camino actual: la row factory devuelve Products directamente"""
+    return product_row_factory(COLNAMES, rows)
+
+
+def measure(label, mapper, rows, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        mapper(rows)
+        best = min(best, time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    products = mapper(rows)
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    count = len(products)
+    print(f"{label:<28} {count / best:>12,.0f} objetos/s   "
+          f"{retained / count:>7.0f} B/objeto retenidos   {peak / count:>7.0f} B/objeto pico")
+    return products
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de mapeo fila -> Product")
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=3, help="Repeticiones de la medición de tiempo (se toma la mejor)")
+    args = parser.parse_args()
+
+    rows = make_rows(args.rows)
+    print(f"⏱️  Mapeando {args.rows} filas por camino (mejor de {args.repeat})...")
+    legacy = measure("dict + limpieza (anterior)", map_legacy, rows, args.repeat)
+    direct = measure("row factory + __slots__", map_direct, rows, args.repeat)
+    assert [p.productId for p in legacy] == [p.productId for p in direct]
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,7 @@
+"""
+Banco de carga del servicio de productos: catálogo sintético con semilla,
+cargas de trabajo con guion, generador de carga en lazo abierto e informe JSON.
+
+Uso:
+    python -m benchmarks.load --help
+"""
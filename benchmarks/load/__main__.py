@@ -0,0 +1,96 @@
+"""
+Banco de carga del servicio de productos
+
+Ejemplos:
+    # Aplicación en proceso con repositorio en memoria (coste puro de la aplicación)
+    python -m benchmarks.load --target app --repo memory --workload detail-heavy --rate 500 --duration 30
+
+    # Servidor en ejecución sobre el Cassandra local (docker-compose up -d cassandra)
+    gunicorn -c gunicorn.conf.py wsgi:app &
+    python -m benchmarks.load --target http --url http://127.0.0.1:5000 --products 100000 \\
+        --workload list-heavy --rate 200 --output resultados/list-heavy.json
+
+    # Comparar con una ejecución anterior (código de salida 1 si hay regresiones)
+    python -m benchmarks.load --workload detail-heavy --baseline resultados/base.json
+"""
+import argparse
+import sys
+import time
+
+from benchmarks.load.catalog import SyntheticCatalog
+from benchmarks.load.loadgen import ARRIVALS, run_open_loop
+from benchmarks.load.report import build_report, compare_reports, format_report, load_report, save_report
+from benchmarks.load.workloads import WORKLOADS
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Banco de carga del servicio de productos")
+    parser.add_argument("--target", choices=("app", "http"), default="app")
+    parser.add_argument("--repo", choices=("memory", "cassandra"), default="memory", help="Repositorio del objetivo app")
+    parser.add_argument("--url", default="http://127.0.0.1:5000", help="URL base del objetivo http")
+    parser.add_argument("--workload", choices=sorted(WORKLOADS), default="detail-heavy")
+    parser.add_argument("--rate", type=float, default=200.0, help="Peticiones por segundo ofrecidas")
+    parser.add_argument("--duration", type=float, default=30.0, help="Segundos medidos")
+    parser.add_argument("--warmup", type=float, default=5.0, help="Segundos de calentamiento (excluidos del informe)")
+    parser.add_argument("--concurrency", type=int, default=32, help="Hilos del generador de carga")
+    parser.add_argument("--arrival", choices=ARRIVALS, default=None, help="Patrón de llegadas (por defecto, el de la carga)")
+    parser.add_argument("--products", type=int, default=10000, help="Productos del catálogo sintético")
+    parser.add_argument("--users", type=int, default=500, help="Usuarios del catálogo sintético")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--skip-seed", action="store_true", help="No cargar el catálogo (ya cargado con la misma semilla)")
+    parser.add_argument("--seed-chunk", type=int, default=1000, help="Productos por lote en la carga inicial")
+    parser.add_argument("--output", help="Ruta del informe JSON")
+    parser.add_argument("--baseline", help="Informe JSON anterior con el que comparar")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="Margen de regresión (0.10 = 10%%)")
+    return parser.parse_args(argv)
+
+
+def build_target(args):
+    if args.target == "http":
+        from benchmarks.load.targets import HttpTarget
+        return HttpTarget(args.url, pool_size=args.concurrency)
+    from benchmarks.load.targets import AppTarget
+    return AppTarget(args.repo)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    catalog = SyntheticCatalog(args.products, args.users, args.seed)
+    workload = WORKLOADS[args.workload]
+    target = build_target(args)
+    try:
+        if not args.skip_seed:
+            print(f"🌱 Cargando catálogo sintético: {args.products} productos, {args.users} usuarios (semilla {args.seed})...")
+            start = time.perf_counter()
+            created = target.seed(catalog, args.seed_chunk)
+            print(f"✅ {created} productos creados en {time.perf_counter() - start:.1f}s")
+
+        print(f"🚀 {workload.name}: {workload.description}")
+        print(f"⏱️  {args.rate} req/s durante {args.duration}s (+{args.warmup}s de calentamiento), {args.concurrency} hilos")
+        result = run_open_loop(target, workload, catalog, args.rate, args.duration, args.concurrency,
+                               args.warmup, args.seed, args.arrival)
+    finally:
+        target.close()
+
+    report = build_report(result, {
+        "target": target.name, "workload": workload.name, "rate": args.rate, "duration": args.duration,
+        "warmup": args.warmup, "concurrency": args.concurrency, "arrival": args.arrival or workload.arrival,
+        "products": args.products, "users": args.users, "seed": args.seed,
+    })
+    print(format_report(report))
+    if args.output:
+        save_report(report, args.output)
+        print(f"💾 Informe guardado en {args.output}")
+    if args.baseline:
+        regressions = compare_reports(report, load_report(args.baseline), args.tolerance)
+        if regressions:
+            print("❌ Regresiones frente a la línea base:")
+            for line in regressions:
+                print(f"   - {line}")
+            return 1
+        print("✅ Sin regresiones frente a la línea base")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
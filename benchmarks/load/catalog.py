@@ -0,0 +1,88 @@
+"""
+Catálogo sintético reproducible
+
+Con la misma semilla se generan los mismos productos, y el productId y el usuario
+de cada producto se calculan a partir de su índice: las cargas de trabajo eligen
+productos y usuarios existentes sin guardar el catálogo en memoria (1M productos).
+La distribución de productos por usuario sigue una ley de Zipf, como en un
+marketplace real donde pocos vendedores concentran buena parte del catálogo.
+"""
+import random
+from bisect import bisect_left
+from itertools import accumulate
+from typing import Dict, Iterator, List
+
+CATEGORIES = ("frutas", "vegetales", "tubérculos", "granos", "lácteos", "hierbas", "café", "cacao")
+ORIGINS = ("Boyacá", "Cundinamarca", "Antioquia", "Valle del Cauca", "Nariño", "Santander", "Meta", "Huila")
+UNITS = ("kg", "lb", "unidad", "atado", "docena", "bulto")
+NAMES = ("Papa", "Tomate", "Mango", "Aguacate", "Plátano", "Cebolla", "Fresa", "Lulo", "Maracuyá",
+         "Frijol", "Arveja", "Mora", "Queso campesino", "Cilantro", "Café de origen", "Cacao fino")
+
+
+def product_id(index: int) -> str:
+    """productId del producto index del catálogo (mismo formato PROD-XXXXXXXX que Product)"""
+    return f"PROD-B{index:07X}"
+
+
+def user_id(index: int) -> str:
+    return f"bench-user-{index:05d}"
+
+
+class SyntheticCatalog:
+    """
+    products productos repartidos entre users usuarios (Zipf con exponente skew).
+    rows() produce los diccionarios de entrada de Product/POST /products/bulk.
+    """
+
+    def __init__(self, products: int = 10000, users: int = 500, seed: int = 42,
+                 skew: float = 1.1, inactive_ratio: float = 0.05):
+        if products <= 0 or users <= 0:
+            raise ValueError("products y users deben ser positivos")
+        self.products = products
+        self.users = users
+        self.seed = seed
+        self.skew = skew
+        self.inactive_ratio = inactive_ratio
+        self._cum_weights: List[float] = list(accumulate(1.0 / (rank ** skew) for rank in range(1, users + 1)))
+
+    def owner(self, index: int) -> str:
+        """Usuario dueño del producto index (determinista por semilla e índice)"""
+        point = random.Random(self.seed * 1_000_003 + index).random() * self._cum_weights[-1]
+        return user_id(bisect_left(self._cum_weights, point))
+
+    def random_product_id(self, rng: random.Random) -> str:
+        return product_id(rng.randrange(self.products))
+
+    def random_user_id(self, rng: random.Random) -> str:
+        """Usuario con la misma distribución que los dueños de productos"""
+        point = rng.random() * self._cum_weights[-1]
+        return user_id(bisect_left(self._cum_weights, point))
+
+    def row(self, index: int) -> Dict:
+        rng = random.Random(self.seed * 7_919 + index)
+        price = round(rng.uniform(500, 60000), -1)
+        return {
+            "productId": product_id(index),
+            "name": f"{rng.choice(NAMES)} {index}",
+            "category": rng.choice(CATEGORIES),
+            "price": price,
+            "originalPrice": round(price * rng.uniform(1.05, 1.4), -1) if rng.random() < 0.3 else None,
+            "unit": rng.choice(UNITS),
+            "imageUrl": f"http://localhost:5000/static/catalog/{product_id(index)}.jpg",
+            "stock": rng.randrange(0, 500),
+            "origin": rng.choice(ORIGINS),
+            "description": "Producto sintético del banco de carga",
+            "user_id": self.owner(index),
+            "isActive": rng.random() >= self.inactive_ratio,
+            "isOrganic": rng.random() < 0.25,
+            "freeShipping": rng.random() < 0.2,
+        }
+
+    def rows(self, start: int = 0, stop: int = None) -> Iterator[Dict]:
+        for index in range(start, self.products if stop is None else stop):
+            yield self.row(index)
+
+    def chunks(self, size: int) -> Iterator[List[Dict]]:
+        """Filas en bloques de size (carga inicial por POST /products/bulk o add_products)"""
+        for start in range(0, self.products, size):
+            yield list(self.rows(start, min(start + size, self.products)))
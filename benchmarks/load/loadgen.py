@@ -0,0 +1,113 @@
+"""
+Generador de carga en lazo abierto
+
+Las peticiones se lanzan según un calendario de llegadas fijado de antemano
+(constante, Poisson o en ráfagas) y no esperan a que terminen las anteriores,
+como el tráfico real. La latencia se mide desde el instante programado, no
+desde que un hilo queda libre: si el servicio se satura, la cola cuenta como
+latencia (sin "coordinated omission"). Para no crecer sin límite, las llegadas
+que encuentran max_in_flight peticiones pendientes se descartan y se informan.
+"""
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Iterator, List
+
+from benchmarks.load.catalog import SyntheticCatalog
+from benchmarks.load.workloads import Workload
+
+ARRIVALS = ("constant", "poisson", "burst")
+# Ráfagas: 1 s a BURST_FACTOR veces la tasa y 4 s a una tasa que mantiene la media
+BURST_PERIOD, BURST_ON, BURST_FACTOR = 5.0, 1.0, 4.0
+
+
+@dataclass
+class Sample:
+    operation: str
+    offset: float          # instante programado desde el inicio (s)
+    latency: float         # fin - instante programado (s)
+    service_time: float    # fin - inicio real (s)
+    status: int
+    error: bool
+
+
+@dataclass
+class LoadResult:
+    samples: List[Sample] = field(default_factory=list)
+    elapsed: float = 0.0
+    scheduled: int = 0
+    dropped: int = 0
+    warmup: float = 0.0
+
+    def measured(self) -> List[Sample]:
+        return [s for s in self.samples if s.offset >= self.warmup]
+
+
+def arrival_offsets(pattern: str, rate: float, duration: float, rng: random.Random) -> Iterator[float]:
+    """Instantes de llegada (s desde el inicio) con media rate por segundo"""
+    if pattern not in ARRIVALS:
+        raise ValueError(f"Patrón de llegadas desconocido: {pattern}")
+    if pattern == "constant":
+        count = int(rate * duration)
+        for i in range(count):
+            yield i / rate
+        return
+    offset = 0.0
+    off_rate = rate * (BURST_PERIOD - BURST_ON * BURST_FACTOR) / (BURST_PERIOD - BURST_ON)
+    while True:
+        current = rate
+        if pattern == "burst":
+            current = rate * BURST_FACTOR if offset % BURST_PERIOD < BURST_ON else off_rate
+        offset += rng.expovariate(current)
+        if offset >= duration:
+            return
+        yield offset
+
+
+def run_open_loop(target, workload: Workload, catalog: SyntheticCatalog, rate: float, duration: float,
+                  concurrency: int = 32, warmup: float = 0.0, seed: int = 42, arrival: str = None,
+                  max_in_flight: int = 10000) -> LoadResult:
+    """
+    Ejecuta workload contra target durante warmup + duration segundos a rate peticiones/s.
+    Las muestras del calentamiento se guardan pero el informe las excluye.
+    """
+    result = LoadResult(warmup=warmup)
+    lock = threading.Lock()
+    in_flight = [0]
+
+    def execute(index: int, offset: float, start: float):
+        rng = random.Random(seed * 1_000_003 + index)
+        operation = workload.pick(rng)
+        began = time.perf_counter()
+        try:
+            status = operation.run(target, catalog, rng)
+            error = status not in operation.expected
+        except Exception:
+            status, error = 0, True
+        finished = time.perf_counter()
+        sample = Sample(operation.name, offset, finished - (start + offset), finished - began, status, error)
+        with lock:
+            result.samples.append(sample)
+            in_flight[0] -= 1
+
+    offsets = arrival_offsets(arrival or workload.arrival, rate, warmup + duration, random.Random(seed))
+    executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="load")
+    start = time.perf_counter()
+    try:
+        for index, offset in enumerate(offsets):
+            delay = start + offset - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            result.scheduled += 1
+            with lock:
+                if in_flight[0] >= max_in_flight:
+                    result.dropped += 1
+                    continue
+                in_flight[0] += 1
+            executor.submit(execute, index, offset, start)
+    finally:
+        executor.shutdown(wait=True)
+    result.elapsed = time.perf_counter() - start
+    return result
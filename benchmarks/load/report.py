@@ -0,0 +1,92 @@
+"""
+Informe de resultados del banco de carga y comparación entre ejecuciones
+
+El informe JSON guarda la configuración de la ejecución (objetivo, carga,
+tasa, semilla, tamaño del catálogo) junto al rendimiento y los percentiles
+global y por operación, para comparar ejecuciones entre versiones.
+"""
+import json
+import platform
+import subprocess
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Dict, List
+
+from benchmarks.load.loadgen import LoadResult
+from benchmarks.stats import format_summary, summarize
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, timeout=5).stdout.strip() or "unknown"
+    except (OSError, subprocess.SubprocessError):
+        return "unknown"
+
+
+def _summary(samples, seconds: float) -> Dict:
+    summary = summarize([s.latency for s in samples])
+    summary["service_p50_ms"] = summarize([s.service_time for s in samples])["p50_ms"]
+    summary["throughput_rps"] = len(samples) / seconds if seconds > 0 else 0.0
+    summary["errors"] = sum(1 for s in samples if s.error)
+    summary["statuses"] = {str(k): v for k, v in sorted(Counter(s.status for s in samples).items())}
+    return summary
+
+
+def build_report(result: LoadResult, config: Dict) -> Dict:
+    samples = result.measured()
+    seconds = max(result.elapsed - result.warmup, 1e-9)
+    operations = sorted({s.operation for s in samples})
+    return {
+        "config": dict(config, git_commit=_git_commit(), python=platform.python_version(),
+                       date=datetime.now(timezone.utc).isoformat(timespec="seconds")),
+        "overall": dict(_summary(samples, seconds), offered_rps=config.get("rate"),
+                        scheduled=result.scheduled, dropped=result.dropped),
+        "operations": {
+            name: _summary([s for s in samples if s.operation == name], seconds) for name in operations
+        },
+    }
+
+
+def format_report(report: Dict) -> str:
+    overall = report["overall"]
+    lines = [
+        f"🎯 {report['config']['target']} | carga {report['config']['workload']} | "
+        f"{overall['offered_rps']} req/s ofrecidas",
+        f"📈 Rendimiento: {overall['throughput_rps']:.1f} req/s | errores: {overall['errors']} | "
+        f"descartadas: {overall['dropped']}",
+        format_summary("total", overall),
+    ]
+    for name, summary in report["operations"].items():
+        lines.append(format_summary(name, summary) + f" errores={summary['errors']} {summary['statuses']}")
+    return "\n".join(lines)
+
+
+def save_report(report: Dict, path: str) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+
+
+def load_report(path: str) -> Dict:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def compare_reports(current: Dict, baseline: Dict, tolerance: float = 0.10) -> List[str]:
+    """
+    Regresiones de current frente a baseline: rendimiento por debajo de
+    (1 - tolerance) o p50/p95/p99 por encima de (1 + tolerance), global y por operación.
+    """
+    regressions = []
+    sections = [("total", current["overall"], baseline["overall"])]
+    sections += [(name, summary, baseline["operations"][name])
+                 for name, summary in current["operations"].items() if name in baseline["operations"]]
+    for name, now, before in sections:
+        if before["throughput_rps"] and now["throughput_rps"] < before["throughput_rps"] * (1 - tolerance):
+            regressions.append(f"{name}: rendimiento {before['throughput_rps']:.1f} → {now['throughput_rps']:.1f} req/s")
+        for key in ("p50_ms", "p95_ms", "p99_ms"):
+            if before[key] and now[key] > before[key] * (1 + tolerance):
+                regressions.append(f"{name}: {key} {before[key]:.3f} → {now[key]:.3f}")
+        if now["errors"] > before["errors"]:
+            regressions.append(f"{name}: errores {before['errors']} → {now['errors']}")
+    return regressions
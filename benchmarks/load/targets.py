@@ -0,0 +1,126 @@
+"""
+Objetivos del banco de carga
+
+- AppTarget: la aplicación Flask en el mismo proceso (test client, sin sockets)
+  sobre el repositorio en memoria o sobre Cassandra (AdapterProductRepo).
+- HttpTarget: un servidor en ejecución (python app.py, gunicorn o hypercorn),
+  normalmente con el Cassandra local de docker-compose.
+
+Todos exponen request(method, path, json=None, form=None, image=None) -> status
+y seed(catalog) para la carga inicial del catálogo.
+"""
+import io
+import os
+import tempfile
+import threading
+from typing import Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from domain.entidades.product_model import Product
+from Infrastructure.in_memory_product_repo import InMemoryProductRepo
+
+
+def sample_image() -> bytes:
+    """JPEG pequeño y válido (las variantes se pueden generar si el pipeline está activo)"""
+    try:
+        from PIL import Image
+    except ImportError:
+        return b"\xff\xd8\xff\xe0" + os.urandom(4096)
+    buffer = io.BytesIO()
+    Image.new("RGB", (64, 64), (120, 170, 60)).save(buffer, format="JPEG")
+    return buffer.getvalue()
+
+
+class AppTarget:
+    """Aplicación Flask en proceso; un test client por hilo del generador de carga"""
+
+    def __init__(self, repo: str = "memory"):
+        # Las imágenes creadas por la carga van a un directorio temporal
+        self.image_directory = tempfile.mkdtemp(prefix="agroweb-load-")
+        os.environ["IMAGE_DIRECTORY"] = self.image_directory
+        from app import create_app
+        from flask_interface.dependencies import Container, set_container
+
+        if repo == "memory":
+            product_repo = InMemoryProductRepo()
+        elif repo == "cassandra":
+            product_repo = None  # AdapterProductRepo
+        else:
+            raise ValueError(f"Repositorio desconocido: {repo}")
+        self.name = f"app+{repo}"
+        self.app = create_app()
+        self.container = Container(repo=product_repo)
+        set_container(self.container)
+        self._local = threading.local()
+
+    def _client(self):
+        client = getattr(self._local, "client", None)
+        if client is None:
+            client = self._local.client = self.app.test_client()
+        return client
+
+    def request(self, method: str, path: str, json=None, form: Optional[Dict] = None,
+                image: Optional[bytes] = None) -> int:
+        if image is not None:
+            data = dict(form or {})
+            data["image"] = (io.BytesIO(image), "foto.jpg")
+            response = self._client().open(path, method=method, data=data, content_type="multipart/form-data")
+        else:
+            response = self._client().open(path, method=method, json=json)
+        response.get_data()
+        response.close()
+        return response.status_code
+
+    def seed(self, catalog, chunk: int = 1000) -> int:
+        """Carga el catálogo directamente en el repositorio (sin pasar por HTTP)"""
+        created = 0
+        repo = self.container.repo
+        for rows in catalog.chunks(chunk):
+            products = [Product(**row) for row in rows]
+            errors = repo.add_products(products, [True] * len(products))
+            created += sum(1 for error in errors if error is None)
+        return created
+
+    def close(self) -> None:
+        import shutil
+        from flask_interface.dependencies import close_container
+
+        close_container()
+        shutil.rmtree(self.image_directory, ignore_errors=True)
+
+
+class HttpTarget:
+    """Servidor en ejecución; sesión con pool keep-alive del tamaño de la concurrencia"""
+
+    def __init__(self, base_url: str, pool_size: int = 32, timeout: float = 30.0):
+        self.name = f"http {base_url}"
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def request(self, method: str, path: str, json=None, form: Optional[Dict] = None,
+                image: Optional[bytes] = None) -> int:
+        files = {"image": ("foto.jpg", image, "image/jpeg")} if image is not None else None
+        response = self.session.request(method, self.base_url + path, json=json, data=form,
+                                        files=files, timeout=self.timeout)
+        _ = response.content  # cuerpo completo, como un cliente real
+        return response.status_code
+
+    def seed(self, catalog, chunk: int = 1000) -> int:
+        """Carga el catálogo con POST /products/bulk (los IDs ya existentes se cuentan como fallidos)"""
+        created = 0
+        for rows in catalog.chunks(chunk):
+            response = self.session.post(self.base_url + "/products/bulk", json=rows, timeout=300)
+            if response.status_code in (201, 207, 400):
+                created += response.json().get("created", 0)
+            else:
+                raise RuntimeError(f"La carga inicial falló con {response.status_code}: {response.text[:200]}")
+        return created
+
+    def close(self) -> None:
+        self.session.close()
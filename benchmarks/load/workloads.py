@@ -0,0 +1,133 @@
+"""
+Cargas de trabajo con guion
+
+Cada carga es una mezcla ponderada de operaciones HTTP sobre el catálogo
+sintético. Cada operación declara los códigos de estado esperados; cualquier
+otro código o una excepción cuenta como error en el informe.
+"""
+import random
+from dataclasses import dataclass
+from itertools import accumulate
+from urllib.parse import urlencode
+from typing import Callable, Dict, FrozenSet, Tuple
+
+from benchmarks.load.catalog import CATEGORIES, NAMES, ORIGINS, SyntheticCatalog, product_id
+from benchmarks.load.targets import sample_image
+
+IMAGE = sample_image()
+BULK_ROWS = 100
+
+
+@dataclass(frozen=True)
+class Operation:
+    name: str
+    run: Callable[[object, SyntheticCatalog, random.Random], int]
+    expected: FrozenSet[int]
+
+
+@dataclass(frozen=True)
+class Workload:
+    name: str
+    description: str
+    mix: Tuple[Tuple[Operation, float], ...]
+    arrival: str = "poisson"
+
+    def pick(self, rng: random.Random) -> Operation:
+        operations = [operation for operation, _ in self.mix]
+        return rng.choices(operations, cum_weights=list(accumulate(w for _, w in self.mix)))[0]
+
+
+def _get_product(target, catalog, rng):
+    # 5% de IDs inexistentes (404, caché negativa)
+    if rng.random() < 0.05:
+        return target.request("GET", f"/products/{product_id(catalog.products + rng.randrange(1_000_000))}")
+    return target.request("GET", f"/products/{catalog.random_product_id(rng)}")
+
+
+def _list_user_products(target, catalog, rng):
+    return target.request("GET", f"/products/user/{catalog.random_user_id(rng)}")
+
+
+def _list_user_page(target, catalog, rng):
+    return target.request("GET", f"/products/user/{catalog.random_user_id(rng)}?limit=20")
+
+
+def _catalog_page(target, catalog, rng):
+    return target.request("GET", "/products?limit=50")
+
+
+def _filtered_page(target, catalog, rng):
+    # Filtros del escaparate: categoría u origen, a veces orgánico o rango de precio, con orden
+    params = {"limit": "24", "sort": rng.choice(("price", "-price", "-createdAt"))}
+    if rng.random() < 0.7:
+        params["category"] = rng.choice(CATEGORIES)
+    else:
+        params["origin"] = rng.choice(ORIGINS)
+    if rng.random() < 0.3:
+        params["isOrganic"] = "true"
+    if rng.random() < 0.3:
+        params["maxPrice"] = str(rng.choice((5000, 10000, 20000)))
+    return target.request("GET", "/products?" + urlencode(params))
+
+
+def _search(target, catalog, rng):
+    # Búsqueda del escaparate: nombre completo, nombre con origen o prefijo mientras se escribe
+    name = rng.choice(NAMES).lower()
+    roll = rng.random()
+    if roll < 0.3:
+        text = f"{name} {rng.choice(ORIGINS)}"
+    elif roll < 0.6:
+        text = name[:rng.randint(3, max(3, len(name) - 1))]
+    else:
+        text = name
+    params = {"q": text, "limit": "24"}
+    if rng.random() < 0.2:
+        params["category"] = rng.choice(CATEGORIES)
+    return target.request("GET", "/products/search?" + urlencode(params))
+
+
+def _new_row(catalog, rng) -> Dict:
+    row = catalog.row(rng.randrange(catalog.products))
+    # Producto nuevo: el servidor genera el productId
+    del row["productId"]
+    row["name"] = f"{row['name']} nuevo"
+    return row
+
+
+def _create_product(target, catalog, rng):
+    row = _new_row(catalog, rng)
+    form = {key: str(row[key]) for key in ("name", "category", "price", "unit", "stock", "origin", "description", "user_id")}
+    return target.request("POST", "/products", form=form, image=IMAGE)
+
+
+def _bulk_import(target, catalog, rng):
+    return target.request("POST", "/products/bulk", json=[_new_row(catalog, rng) for _ in range(BULK_ROWS)])
+
+
+GET_PRODUCT = Operation("get_product_by_id", _get_product, frozenset({200, 404}))
+LIST_USER = Operation("get_products_by_user_id", _list_user_products, frozenset({200}))
+LIST_USER_PAGE = Operation("get_products_by_user_id_page", _list_user_page, frozenset({200}))
+CATALOG_PAGE = Operation("get_all_products_page", _catalog_page, frozenset({200}))
+CREATE = Operation("create_product", _create_product, frozenset({201}))
+FILTERED_PAGE = Operation("get_filtered_products_page", _filtered_page, frozenset({200}))
+SEARCH = Operation("search_products", _search, frozenset({200}))
+BULK = Operation("create_products_bulk", _bulk_import, frozenset({201}))
+
+WORKLOADS: Dict[str, Workload] = {
+    workload.name: workload for workload in (
+        Workload("detail-heavy", "90% detalle por ID, 10% listado paginado por usuario",
+                 ((GET_PRODUCT, 0.9), (LIST_USER_PAGE, 0.1))),
+        Workload("list-heavy", "listados por usuario completos y paginados, páginas del catálogo y algo de detalle",
+                 ((LIST_USER, 0.4), (LIST_USER_PAGE, 0.2), (CATALOG_PAGE, 0.2), (GET_PRODUCT, 0.2))),
+        Workload("filter-heavy", "listados filtrados y ordenados del escaparate con algo de detalle",
+                 ((FILTERED_PAGE, 0.7), (GET_PRODUCT, 0.3))),
+        Workload("search-heavy", "búsqueda por texto (palabras completas y prefijos) con algo de detalle",
+                 ((SEARCH, 0.7), (GET_PRODUCT, 0.3))),
+        Workload("create-burst", "creación con imagen (multipart) en ráfagas de 1 s cada 5 s",
+                 ((CREATE, 1.0),), arrival="burst"),
+        Workload("bulk-import", f"POST /products/bulk de {BULK_ROWS} filas JSON",
+                 ((BULK, 1.0),), arrival="constant"),
+        Workload("mixed", "tráfico de tienda: lecturas con algunas creaciones",
+                 ((GET_PRODUCT, 0.6), (LIST_USER_PAGE, 0.2), (CATALOG_PAGE, 0.15), (CREATE, 0.05))),
+    )
+}
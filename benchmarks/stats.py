@@ -0,0 +1,34 @@
+"""
+Utilidades estadísticas compartidas por los benchmarks de AgroWeb
+"""
+from typing import Dict, List
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Percentil por rango más cercano sobre una lista de muestras (no necesita estar ordenada)"""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(0, min(len(ordered) - 1, int(round(pct / 100.0 * len(ordered))) - 1))
+    return ordered[rank]
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    """Resumen de latencias en milisegundos: p50, p95, p99 y máximo"""
+    ms = [s * 1000.0 for s in samples]
+    return {
+        "count": len(ms),
+        "p50_ms": percentile(ms, 50),
+        "p95_ms": percentile(ms, 95),
+        "p99_ms": percentile(ms, 99),
+        "max_ms": max(ms) if ms else 0.0,
+    }
+
+
+def format_summary(label: str, summary: Dict[str, float]) -> str:
+    """Formatea un resumen de latencias en una línea legible"""
+    return (
+        f"{label:<28} n={summary['count']:<7} "
+        f"p50={summary['p50_ms']:.3f}ms p95={summary['p95_ms']:.3f}ms "
+        f"p99={summary['p99_ms']:.3f}ms max={summary['max_ms']:.3f}ms"
+    )
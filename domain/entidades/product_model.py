@@ -1,8 +1,18 @@
 from dataclasses import dataclass, field
 from datetime import datetime, date
+from math import isnan
 import uuid
 
-@dataclass
+def _json_value(val):
+    # NaN -> None y fechas -> ISO 8601
+    if isinstance(val, float) and isnan(val):
+        return None
+    if hasattr(val, 'isoformat'):
+        return val.isoformat()
+    return val
+
+# slots=True: sin __dict__ por instancia (menos memoria y acceso a atributos más rápido)
+@dataclass(slots=True)
 class Product:
     # Campos requeridos en el input - Deben proporcionarse al crear un producto
     name: str              # Nombre del producto
@@ -28,6 +38,7 @@ class Product:
     productId: str = field(default_factory=lambda: f"PROD-{str(uuid.uuid4())[:8].upper()}")  # Auto-generated unique ID
     createdAt: date = field(default_factory=lambda: datetime.now().date())    # Marca de tiempo de creación
     updatedAt: date = field(default_factory=lambda: datetime.now().date())    # Marca de tiempo de última actualización
+    imageVariants: dict = None                                                # URLs de variantes redimensionadas (thumbnail, card, detail)
     inStock: bool = field(init=False, default=None)                           # Calculado desde stock > 0
 
     def __post_init__(self):
@@ -57,16 +68,7 @@ class Product:
             raise ValueError("El ID del usuario es obligatorio")
 
     def toDictionary(self):
-        from math import isnan
-        def clean(val):
-            try:
-                if isinstance(val, float) and isnan(val):
-                    return None
-            except:
-                pass
-            if hasattr(val, 'isoformat'):
-                return val.isoformat()
-            return val
+        clean = _json_value
         return {
             "productId": self.productId,
             "name": self.name,
@@ -86,4 +88,5 @@ class Product:
             "createdAt": clean(self.createdAt),
             "updatedAt": clean(self.updatedAt),
             "inStock": self.inStock,
+            "imageVariants": self.imageVariants,
         }
\ No newline at end of file
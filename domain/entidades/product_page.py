@@ -0,0 +1,15 @@
+from dataclasses import dataclass, field
+from typing import List, Optional
+from domain.entidades.product_model import Product
+
+@dataclass
+class ProductPage:
+    # Página de productos de un listado paginado por cursor
+    items: List[Product] = field(default_factory=list)   # Productos de la página
+    nextPageToken: Optional[str] = None                   # Token opaco de la siguiente página (None si no hay más)
+
+    def toDictionary(self):
+        return {
+            "items": [p.toDictionary() for p in self.items],
+            "nextPageToken": self.nextPageToken,
+        }
@@ -0,0 +1,30 @@
+from dataclasses import dataclass
+from typing import Optional
+
+# Campos por los que se puede ordenar un listado ("-campo" = descendente)
+SORT_FIELDS = ("price", "createdAt")
+
+@dataclass(frozen=True)
+class ProductQuery:
+    # Filtros del listado de productos activos (None = sin filtrar por ese campo)
+    category: Optional[str] = None        # Categoría exacta (sin distinguir mayúsculas ni tildes)
+    isOrganic: Optional[bool] = None      # Solo orgánicos (True) o solo no orgánicos (False)
+    freeShipping: Optional[bool] = None   # Con o sin envío gratuito
+    minPrice: Optional[float] = None      # Precio mínimo, incluido
+    maxPrice: Optional[float] = None      # Precio máximo, incluido
+    origin: Optional[str] = None          # Lugar de origen exacto (sin distinguir mayúsculas ni tildes)
+    sort: Optional[str] = None            # price, -price, createdAt o -createdAt (None = por productId)
+
+    def __post_init__(self):
+        if self.minPrice is not None and self.maxPrice is not None and self.minPrice > self.maxPrice:
+            raise ValueError("minPrice no puede ser mayor que maxPrice")
+        if self.sort is not None and self.sort.lstrip("-") not in SORT_FIELDS:
+            raise ValueError(f"sort debe ser uno de: {', '.join(f + ', -' + f for f in SORT_FIELDS)}")
+
+    @property
+    def sort_field(self) -> Optional[str]:
+        return self.sort.lstrip("-") if self.sort else None
+
+    @property
+    def descending(self) -> bool:
+        return bool(self.sort) and self.sort.startswith("-")
@@ -0,0 +1,21 @@
+from abc import ABC, abstractmethod
+from typing import Tuple
+
+class ImageStorage(ABC):
+    @abstractmethod
+    def save(self, product_id: str, image) -> Tuple[str, bool]:
+        """
+        Guarda la imagen subida (objeto con .filename y .save(path)).
+        Devuelve (URL pública, creada): creada es False si ya existía un archivo
+        idéntico, que entonces no debe borrarse al revertir.
+        """
+        pass
+
+    @abstractmethod
+    def delete(self, image_url: str) -> None:
+        """Elimina una imagen guardada previamente (usado al revertir una creación fallida)"""
+        pass
+
+    def process_async(self, product_id: str, image_url: str) -> None:
+        """Encola el procesamiento en segundo plano de una imagen ya persistida (por defecto no hace nada)"""
+        pass
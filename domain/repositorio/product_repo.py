@@ -1,10 +1,16 @@
 from abc import ABC, abstractmethod
-from typing import Optional, List
+from typing import Dict, Optional, List, Iterator
 from domain.entidades.product_model import Product
+from domain.entidades.product_page import ProductPage
+from domain.entidades.product_query import ProductQuery
 
 class ProductRepository(ABC):
     @abstractmethod
-    def add_product(self, product: Product) -> Product:
+    def add_product(self, product: Product, trusted_id: bool = False) -> Product:
+        pass
+
+    @abstractmethod
+    def add_products(self, products: List[Product], trusted_ids: List[bool]) -> List[Optional[str]]:
         pass
 
     @abstractmethod
@@ -18,3 +24,37 @@ class ProductRepository(ABC):
     @abstractmethod
     def get_products_by_user_id(self, user_id: str) -> List[Product]:
         pass
+
+    @abstractmethod
+    def update_product(self, product_id: str) -> bool:
+        pass
+
+    @abstractmethod
+    def update_image_url(self, product_id: str, image_url: str) -> None:
+        pass
+
+    @abstractmethod
+    def update_image_variants(self, product_id: str, variants: Dict[str, str]) -> None:
+        pass
+
+    @abstractmethod
+    def get_all_products_page(self, limit: int, page_token: Optional[str] = None) -> ProductPage:
+        pass
+
+    @abstractmethod
+    def get_products_by_user_id_page(self, user_id: str, limit: int, page_token: Optional[str] = None) -> ProductPage:
+        pass
+
+    @abstractmethod
+    def iter_all_products(self) -> Iterator[Product]:
+        pass
+
+    @abstractmethod
+    def find_products(self, query: ProductQuery, limit: Optional[int] = None, page_token: Optional[str] = None) -> ProductPage:
+        """Productos activos que cumplen los filtros de query en su orden; con limit, una página"""
+        pass
+
+    @abstractmethod
+    def search_products(self, text: str, query: Optional[ProductQuery] = None, limit: int = 20, page_token: Optional[str] = None) -> ProductPage:
+        """Productos activos ordenados por relevancia para el texto, opcionalmente filtrados"""
+        pass
@@ -0,0 +1,12 @@
+from abc import ABC, abstractmethod
+from typing import Dict, Iterable
+
+class UserDirectory(ABC):
+    @abstractmethod
+    def exists(self, user_id: str) -> bool:
+        """True si el usuario existe en el servicio de usuarios"""
+        pass
+
+    def exists_many(self, user_ids: Iterable[str]) -> Dict[str, bool]:
+        """Existencia de varios usuarios a la vez (por defecto, una consulta por usuario)"""
+        return {user_id: self.exists(user_id) for user_id in set(user_ids)}
@@ -0,0 +1,265 @@
+"""
+Rutas de productos en modo asíncrono (ASGI, Quart)
+
+Mismos endpoints y respuestas que flask_interface/routes.py, pero las lecturas
+esperan los futures de execute_async del driver (AsyncAdapterProductRepo) y la
+validación de usuarios usa un cliente HTTP asíncrono con pool de conexiones,
+así que un solo proceso atiende muchas peticiones concurrentes en vuelo.
+Las escrituras reutilizan el camino síncrono en un hilo (asyncio.to_thread); el
+CreateProductService de este modo consulta usuarios a través del cliente
+asíncrono del event loop (LoopUsersDirectory).
+
+Se sirve con asgi.py (SERVING_MODE=async). Requiere quart y httpx.
+"""
+from quart import Blueprint, request, jsonify, abort, Response
+from Infrastructure.async_product_repo import AsyncAdapterProductRepo
+from Infrastructure.in_memory_product_repo import AsyncInMemoryProductRepo, InMemoryProductRepo
+from Infrastructure.users_client import AsyncUsersClient, LoopUsersDirectory, UsersServiceError
+from application.useCases.CreateProductService import CreateProductService
+from flask_interface.bulk_parsing import bulk_status, parse_bulk_payload
+from flask_interface.request_params import (
+    BULK_MAX_ROWS, STREAM_FORMATS, StreamChunker, get_page_params, get_product_query, get_search_params,
+    get_stream_format,
+)
+from flask_interface.dependencies import close_container, get_container
+from flask_interface.http_caching import LIST_MAX_AGE, PRODUCT_MAX_AGE, conditional_json
+from flask_interface.routes import serializer
+from observability.MetricsDecorator import monitor_async_endpoint
+import asyncio
+import shutil
+
+async_bp = Blueprint('productos_async', __name__)
+# Creados al arrancar el servidor en cada proceso (before_app_serving)
+async_repo = None
+create_service = None
+search_service = None
+users_client = None
+
+
+class UploadedImage:
+    """Adapta el FileStorage de Quart (save asíncrono) a la interfaz síncrona de ImageStorage"""
+
+    def __init__(self, file_storage):
+        self.filename = file_storage.filename
+        self._stream = file_storage.stream
+
+    def save(self, path: str):
+        with open(path, "wb") as f:
+            shutil.copyfileobj(self._stream, f)
+
+
+@async_bp.before_app_serving
+async def open_clients():
+    global async_repo, create_service, search_service, users_client
+    # Crear el contenedor abre la sesión de Cassandra (bloqueante): fuera del event loop.
+    # Los usuarios se validan con AsyncUsersClient, así que no se crea el cliente síncrono
+    container = await asyncio.to_thread(get_container, sync_users=False)
+    if isinstance(container.repo, InMemoryProductRepo):
+        async_repo = AsyncInMemoryProductRepo(container.repo)
+    else:
+        async_repo = AsyncAdapterProductRepo(container.repo)
+    create_service = CreateProductService(container.repo, container.image_storage)
+    search_service = container.search_service
+    # None si USERS_VALIDATION_ENABLED=false
+    users_client = AsyncUsersClient.from_env()
+    if users_client is not None:
+        create_service.users = LoopUsersDirectory(users_client, asyncio.get_running_loop())
+
+
+@async_bp.after_app_serving
+async def close_clients():
+    if users_client is not None:
+        await users_client.close()
+    await asyncio.to_thread(close_container)
+
+
+def json_response(body: bytes, status: int = 200):
+    """Response for a JSON body that is already serialized"""
+    return Response(body, status=status, mimetype="application/json")
+
+
+def product_response(product):
+    """Async-mode version of routes.product_response (Quart request and Response)"""
+    return conditional_json(Response, request, serializer.etag(product), lambda: serializer.product_bytes(product),
+                            PRODUCT_MAX_AGE, last_modified=product.updatedAt)
+
+
+def list_response(products, vary=None):
+    return conditional_json(Response, request, serializer.list_etag(products), lambda: serializer.list_bytes(products),
+                            LIST_MAX_AGE, vary=vary)
+
+
+def page_response(page, vary=None):
+    return conditional_json(Response, request, serializer.page_etag(page), lambda: serializer.page_bytes(page),
+                            LIST_MAX_AGE, vary=vary)
+
+
+async def stream_products(products, fmt):
+    """Async version of routes.stream_products over an async iterator of products"""
+    chunker = StreamChunker(fmt)
+    async for product in products:
+        chunk = chunker.add(serializer.fragment(product))
+        if chunk:
+            yield chunk
+    chunk = chunker.close()
+    if chunk:
+        yield chunk
+
+
+@async_bp.route("/products", methods=["POST"])
+@monitor_async_endpoint("create_product")
+async def create_product():
+    if not (request.content_type or "").startswith('multipart/form-data'):
+        abort(415)
+    data = (await request.form).to_dict()
+    image = (await request.files).get('image')
+    required_fields = [
+        "name", "category", "price", "unit", "stock",
+        "origin", "description", "user_id"
+    ]
+    missing = [f for f in required_fields if f not in data]
+    if missing or not image:
+        return jsonify({"error": f"Faltan campos obligatorios: {', '.join(missing + (['image'] if not image else []))}"}), 400
+    try:
+        data["stock"] = int(data["stock"])
+        data["price"] = float(data["price"])
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    data["imageUrl"] = ""
+    try:
+        product = await asyncio.to_thread(create_service.execute, data, UploadedImage(image))
+        return json_response(serializer.product_bytes(product), 201)
+    except UsersServiceError:
+        return jsonify({"error": "Servicio de usuarios no disponible"}), 503
+    except (ValueError, TypeError) as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": "Error interno", "details": str(e)}), 400
+
+
+@async_bp.route("/products/bulk", methods=["POST"])
+@monitor_async_endpoint("create_products_bulk")
+async def create_products_bulk():
+    content_type = request.content_type or ""
+    try:
+        if content_type.startswith("multipart/form-data"):
+            rows = parse_bulk_payload(content_type, "", (await request.files).get("file"), BULK_MAX_ROWS)
+        else:
+            rows = parse_bulk_payload(content_type, await request.get_data(as_text=True), None, BULK_MAX_ROWS)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    try:
+        results = await asyncio.to_thread(create_service.execute_batch, rows)
+    except UsersServiceError:
+        return jsonify({"error": "Servicio de usuarios no disponible"}), 503
+    except Exception as e:
+        return jsonify({"error": "Error interno", "details": str(e)}), 500
+    body, status = bulk_status(results)
+    return jsonify(body), status
+
+
+@async_bp.route("/products/search", methods=["GET"])
+@monitor_async_endpoint("search_products")
+async def search_products():
+    try:
+        text, limit, page_token = get_search_params(request.args)
+        # Mismo caso de uso que el modo sync; la búsqueda puntúa en CPU, fuera del event loop
+        page = await asyncio.to_thread(search_service.execute, text, get_product_query(request.args), limit, page_token)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": "Error interno", "details": str(e)}), 500
+    return page_response(page)
+
+
+@async_bp.route("/products/<product_id>", methods=["GET"])
+@monitor_async_endpoint("get_product_by_id")
+async def get_product_by_id(product_id):
+    if not isinstance(product_id, str) or not product_id:
+        return jsonify({"error": "ID inválido"}), 400
+    try:
+        product = await async_repo.get_product_by_id(product_id)
+        if product is None:
+            return jsonify({"error": "Producto no encontrado"}), 404
+        return product_response(product)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 404
+    except Exception as e:
+        return jsonify({"error": "Internal server error", "details": str(e)}), 500
+
+
+@async_bp.route("/products", methods=["GET"])
+@monitor_async_endpoint("get_all_products")
+async def get_all_products():
+    try:
+        stream_format = get_stream_format(request.args, request.accept_mimetypes)
+        product_query = get_product_query(request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    if product_query is not None:
+        return await get_filtered_products(product_query, stream_format)
+    if stream_format:
+        return Response(
+            stream_products(async_repo.iter_all_products(), stream_format),
+            mimetype=STREAM_FORMATS[stream_format],
+        )
+    try:
+        page_params = get_page_params(request.args)
+        if page_params:
+            return page_response(await async_repo.get_all_products_page(*page_params), vary="Accept")
+        return list_response(await async_repo.get_all_products(), vary="Accept")
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": "Error interno", "details": str(e)}), 500
+
+
+async def get_filtered_products(product_query, stream_format):
+    """Async version of routes.get_filtered_products"""
+    try:
+        if stream_format:
+            page = await async_repo.find_products(product_query)
+            return Response(stream_products(iterate(page.items), stream_format), mimetype=STREAM_FORMATS[stream_format])
+        page_params = get_page_params(request.args)
+        if page_params:
+            return page_response(await async_repo.find_products(product_query, *page_params), vary="Accept")
+        page = await async_repo.find_products(product_query)
+        return list_response(page.items, vary="Accept")
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": "Error interno", "details": str(e)}), 500
+
+
+async def iterate(products):
+    for product in products:
+        yield product
+
+
+@async_bp.route("/products/user/<user_id>", methods=["GET"])
+@monitor_async_endpoint("get_products_by_user_id")
+async def get_products_by_user_id(user_id):
+    if not isinstance(user_id, str) or not user_id:
+        return jsonify({"error": "ID de usuario inválido"}), 400
+    try:
+        page_params = get_page_params(request.args)
+        page = await async_repo.get_products_by_user_id_page(user_id, *page_params) if page_params else None
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": "Error interno", "details": str(e)}), 500
+    if page is not None:
+        return page_response(page)
+    try:
+        products = await async_repo.get_products_by_user_id(user_id)
+        return list_response(products or [])
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 404
+    except Exception as e:
+        return jsonify({"error": "Error interno", "details": str(e)}), 500
+
+
+@async_bp.route("/test", methods=["GET"])
+@monitor_async_endpoint("test_route")
+async def test():
+    return "Test route is working!", 200
@@ -0,0 +1,123 @@
+"""
+Parsing of bulk product import payloads (JSON or CSV) into Product keyword rows,
+and the response summary shared by the sync and async bulk routes.
+"""
+import csv
+import io
+import json
+
+FLOAT_FIELDS = ("price", "originalPrice")
+INT_FIELDS = ("stock",)
+BOOL_FIELDS = ("isActive", "isOrganic", "isBestSeller", "freeShipping")
+TRUE_VALUES = {"true", "1", "si", "sí", "yes"}
+FALSE_VALUES = {"false", "0", "no"}
+
+
+def parse_bulk_request(req, max_rows):
+    """
+    Returns the list of product rows sent in the request.
+    Accepts a JSON array (or {"products": [...]}), a text/csv body,
+    or a multipart form with a CSV/JSON file in the "file" field.
+
+    Raises:
+        ValueError: If the payload cannot be parsed or exceeds max_rows
+    """
+    content_type = req.content_type or ""
+    if content_type.startswith("multipart/form-data"):
+        return parse_bulk_payload(content_type, "", req.files.get("file"), max_rows)
+    return parse_bulk_payload(content_type, req.get_data(as_text=True), None, max_rows)
+
+
+def parse_bulk_payload(content_type, body, upload, max_rows):
+    """
+    Framework-independent part of parse_bulk_request: body is the decoded request
+    body and upload the multipart "file" (only used for multipart requests).
+    """
+    content_type = content_type or ""
+    if content_type.startswith("multipart/form-data"):
+        # FileStorage is falsy without a filename, so test for presence explicitly
+        if upload is None:
+            raise ValueError("Falta el archivo 'file' con los productos")
+        body = upload.read().decode("utf-8-sig")
+        # The multipart part may come without a filename
+        is_csv = (upload.filename or "").lower().endswith(".csv") or (upload.mimetype or "").endswith("csv")
+        rows = parse_csv(body) if is_csv else parse_json(body)
+    elif content_type.startswith("text/csv"):
+        rows = parse_csv(body)
+    elif content_type.startswith("application/json"):
+        rows = parse_json(body)
+    else:
+        raise ValueError("Content-Type debe ser application/json, text/csv o multipart/form-data")
+
+    if not rows:
+        raise ValueError("No se recibieron productos")
+    if len(rows) > max_rows:
+        raise ValueError(f"Máximo {max_rows} productos por carga")
+    for row in rows:
+        if isinstance(row, dict):
+            # Bulk rows carry no uploaded image: imageUrl is optional here
+            row.setdefault("imageUrl", "")
+    return rows
+
+
+def bulk_status(results):
+    """
+    Response body and HTTP status for the per-row results of execute_batch:
+    201 if every row was created, 400 if none was, 207 (Multi-Status) otherwise.
+    """
+    created = sum(1 for r in results if r["status"] == "created")
+    failed = len(results) - created
+    if failed == 0:
+        status = 201
+    elif created == 0:
+        status = 400
+    else:
+        status = 207
+    return {"created": created, "failed": failed, "results": results}, status
+
+
+def parse_json(body):
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        raise ValueError("JSON inválido")
+    if isinstance(payload, dict):
+        payload = payload.get("products")
+    if not isinstance(payload, list):
+        raise ValueError("Se esperaba un array de productos o {\"products\": [...]}")
+    return payload
+
+
+def parse_csv(body):
+    reader = csv.DictReader(io.StringIO(body))
+    return [coerce_csv_row(row) for row in reader]
+
+
+def coerce_csv_row(row):
+    """
+    Converts CSV strings into the types expected by Product.
+    Empty cells are dropped so optional fields keep their defaults;
+    values that cannot be converted are kept as-is and rejected by Product validation.
+    """
+    data = {}
+    for key, value in row.items():
+        if key is None or value is None:
+            continue
+        key, value = key.strip(), value.strip()
+        if value == "":
+            continue
+        try:
+            if key in FLOAT_FIELDS:
+                value = float(value)
+            elif key in INT_FIELDS:
+                value = int(value)
+            elif key in BOOL_FIELDS:
+                lowered = value.lower()
+                if lowered in TRUE_VALUES:
+                    value = True
+                elif lowered in FALSE_VALUES:
+                    value = False
+        except ValueError:
+            pass
+        data[key] = value
+    return data
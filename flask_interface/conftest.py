@@ -0,0 +1,45 @@
+"""
+Fixtures compartidos de los tests de rutas: contenedor con repositorio en memoria y cliente Flask
+
+Un módulo puede redefinir repo (catálogo inicial) o container_env (variables de
+entorno del contenedor) pidiendo el fixture original y cambiando solo lo suyo.
+"""
+import pytest
+from flask import Flask
+
+import flask_interface.routes as routes
+from flask_interface.dependencies import Container, reset_container, set_container
+from Infrastructure.in_memory_product_repo import InMemoryProductRepo
+
+
+@pytest.fixture
+def container_env(tmp_path):
+    """Imágenes en tmp_path, sin variantes ni validación de usuarios"""
+    return {
+        "IMAGE_DIRECTORY": str(tmp_path),
+        "IMAGE_PIPELINE_ENABLED": "false",
+        "USERS_VALIDATION_ENABLED": "false",
+    }
+
+
+@pytest.fixture
+def repo():
+    return InMemoryProductRepo()
+
+
+@pytest.fixture
+def container(repo, container_env, monkeypatch):
+    for name, value in container_env.items():
+        monkeypatch.setenv(name, value)
+    container = Container(repo=repo)
+    set_container(container)
+    yield container
+    container.close()
+    reset_container()
+
+
+@pytest.fixture
+def client(container):
+    app = Flask(__name__)
+    app.register_blueprint(routes.bp)
+    return app.test_client()
@@ -0,0 +1,137 @@
+"""
+Dependencias de las rutas por proceso
+
+El repositorio, los clientes HTTP y los servicios abren conexiones (sesión de
+Cassandra, pool de hilos de imágenes, sesión con el servicio de usuarios), así
+que no se crean al importar el módulo: se construyen la primera vez que se usan
+en cada proceso. Bajo un servidor con fork (gunicorn) cada worker crea su propia
+sesión del driver después del fork en lugar de heredar los sockets del master.
+"""
+from Infrastructure.adapterProductRepo import AdapterProductRepo
+from Infrastructure.cassandra_connection import get_cassandra_connection, reset_cassandra_connection
+from Infrastructure.in_memory_product_repo import InMemoryProductRepo
+from Infrastructure.image_pipeline import ImagePipeline
+from Infrastructure.local_image_storage import LocalImageStorage
+from Infrastructure.users_client import UsersServiceClient
+from application.useCases.CreateProductService import CreateProductService
+from application.useCases.GetProductByIdService import GetProductByIdService
+from application.useCases.GetAllProductsService import GetAllProductsService
+from application.useCases.GetProductsByUserIDService import GetProductsByUserIDService
+from application.useCases.SearchProductsService import SearchProductsService
+from observability.tracing import shutdown_tracer
+import logging
+import os
+import threading
+
+logger = logging.getLogger(__name__)
+
+PRODUCT_REPOSITORIES = ("cassandra", "memory")
+
+
+def build_product_repo():
+    """ProductRepository elegido con PRODUCT_REPOSITORY: cassandra (por defecto) o memory"""
+    kind = os.getenv("PRODUCT_REPOSITORY", "cassandra").lower()
+    if kind == "memory":
+        # Catálogo en memoria del proceso: sin Cassandra y sin persistencia
+        return InMemoryProductRepo()
+    if kind != "cassandra":
+        raise ValueError(f"PRODUCT_REPOSITORY must be one of {PRODUCT_REPOSITORIES}, got '{kind}'")
+    return AdapterProductRepo()
+
+
+class Container:
+    """Repositorio, almacenamiento de imágenes y casos de uso de un proceso"""
+
+    def __init__(self, repo=None, sync_users=True):
+        self.pid = os.getpid()
+        # Otro ProductRepository (benchmarks, tests) en lugar del configurado
+        self.repo = repo if repo is not None else build_product_repo()
+        self.image_storage = LocalImageStorage()
+        self.image_storage.pipeline = ImagePipeline.from_env(
+            self.image_storage.directory, self.image_storage.base_url,
+            on_variants=self.repo.update_image_variants,
+        )
+        # None si USERS_VALIDATION_ENABLED=false, o en modo async (valida con AsyncUsersClient)
+        self.users_client = UsersServiceClient.from_env() if sync_users else None
+        self.create_service = CreateProductService(self.repo, self.image_storage, self.users_client)
+        self.get_by_id_service = GetProductByIdService(self.repo)
+        self.get_all_service = GetAllProductsService(self.repo)
+        self.get_by_user_id_service = GetProductsByUserIDService(self.repo)
+        self.search_service = SearchProductsService(self.repo)
+
+    def close(self):
+        """Termina las tareas de imágenes pendientes y cierra las conexiones"""
+        if self.image_storage.pipeline is not None:
+            self.image_storage.pipeline.shutdown()
+        if self.users_client is not None:
+            self.users_client.close()
+        close = getattr(self.repo, "close", None)
+        if close is not None:
+            close()
+
+
+_container = None
+_lock = threading.Lock()
+
+
+def get_container(sync_users: bool = True) -> Container:
+    """
+    Devuelve el contenedor del proceso actual, creándolo si hace falta.
+    sync_users=False lo crea sin el cliente síncrono de usuarios (modo async).
+    """
+    global _container
+    container = _container
+    if container is None or container.pid != os.getpid():
+        with _lock:
+            if _container is None or _container.pid != os.getpid():
+                _container = Container(sync_users=sync_users)
+            container = _container
+    return container
+
+
+def readiness():
+    """
+    (listo, detalle) del proceso actual: dependencias creadas, sesión de Cassandra
+    abierta y esquema en la versión que necesita el código. La primera llamada
+    crea las dependencias, así que la sonda de readiness también calienta el worker.
+    """
+    try:
+        container = get_container()
+    except Exception as e:
+        reason = get_cassandra_connection().last_error or str(e)
+        return False, {"status": "not_ready", "reason": reason}
+    database = getattr(container.repo, "database", None)
+    if database is None:
+        # Repositorio sin Cassandra (PRODUCT_REPOSITORY=memory)
+        return True, {"status": "ready"}
+    return True, {"status": "ready", "schemaVersion": database.connection.schema_version}
+
+
+def set_container(container: Container) -> None:
+    """Instala un contenedor ya construido para el proceso actual (benchmarks, tests)"""
+    global _container
+    with _lock:
+        _container = container
+
+
+def reset_container():
+    """
+    Olvida el contenedor y la conexión heredados tras un fork sin cerrarlos:
+    pertenecen al proceso padre y sus hilos no existen en el hijo.
+    """
+    global _container
+    _container = None
+    reset_cassandra_connection()
+
+
+def close_container():
+    """Cierre ordenado al terminar el proceso (worker_exit, after_serving)"""
+    global _container
+    container, _container = _container, None
+    if container is not None and container.pid == os.getpid():
+        try:
+            container.close()
+        except Exception as e:
+            logger.error(f"Error closing dependencies: {str(e)}")
+    # Spans pendientes de exportar
+    shutdown_tracer()
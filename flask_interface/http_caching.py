@@ -0,0 +1,47 @@
+"""
+GET condicionales de productos y listados
+
+Las respuestas JSON de producto, listados, páginas y búsqueda llevan un ETag
+fuerte (hash del contenido, ver ProductSerializer.etag) y Cache-Control; los
+productos además Last-Modified a partir de updatedAt. Si el If-None-Match del
+cliente o de la CDN coincide se responde 304 sin cuerpo y sin serializar.
+
+If-Modified-Since no se evalúa: updatedAt tiene precisión de día y no cambia en
+todas las escrituras (imágenes, desactivación), así que solo el ETag es un
+validador fiable. Con ambos encabezados, If-None-Match tiene prioridad (RFC 9110).
+
+Sirve para Flask y Quart: recibe la clase Response y el request del modo.
+La exportación en streaming (?format=) no lleva validadores.
+"""
+from datetime import date
+from typing import Callable, Optional
+import os
+
+from werkzeug.http import http_date, quote_etag
+
+# max-age en segundos de un producto y de los listados; 0 = no-cache (revalidar siempre con el ETag)
+PRODUCT_MAX_AGE = int(os.getenv("PRODUCT_HTTP_MAX_AGE", "60"))
+LIST_MAX_AGE = int(os.getenv("LIST_HTTP_MAX_AGE", "0"))
+
+
+def cache_control(max_age: int) -> str:
+    if max_age > 0:
+        return f"public, max-age={max_age}, must-revalidate"
+    return "public, no-cache"
+
+
+def conditional_json(response_class, request, etag: str, body: Callable[[], bytes], max_age: int,
+                     last_modified: Optional[date] = None, vary: Optional[str] = None):
+    """
+    Respuesta 200 con body() y validadores, o 304 sin llamar a body() si el
+    cliente ya tiene esa versión.
+    """
+    headers = {"ETag": quote_etag(etag), "Cache-Control": cache_control(max_age)}
+    if last_modified is not None:
+        headers["Last-Modified"] = http_date(last_modified)
+    if vary:
+        headers["Vary"] = vary
+    # Comparación débil, como exige If-None-Match; "*" coincide con cualquier versión
+    if request.if_none_match.contains_weak(etag):
+        return response_class(status=304, headers=headers)
+    return response_class(body(), status=200, headers=headers, mimetype="application/json")
@@ -0,0 +1,87 @@
+"""
+Rutas de imágenes del catálogo (/static/catalog)
+
+Sirve las imágenes fuera del manejador estático por defecto de Flask:
+- ETag fuerte (hash del contenido) y respuestas 304 a GET condicionales
+- Cache-Control immutable de un año para nombres con hash de contenido
+- Rangos (206) y transferencia zero-copy vía wsgi.file_wrapper / sendfile
+- X-Sendfile o X-Accel-Redirect opcionales para delegar el envío al proxy
+- Variantes precomprimidas (.br / .gz) si existen junto al original
+"""
+from flask import Blueprint, Response, abort, request
+from werkzeug.security import safe_join
+from werkzeug.utils import send_file
+from Infrastructure.cache_backends import LRUTTLCache
+from Infrastructure.local_image_storage import content_hash, is_content_hashed
+import mimetypes
+import os
+
+images_bp = Blueprint('images', __name__)
+
+CATALOG_DIR = os.path.abspath(os.getenv("IMAGE_DIRECTORY", os.path.join("static", "catalog")))
+IMMUTABLE_MAX_AGE = 365 * 24 * 3600
+MUTABLE_MAX_AGE = int(os.getenv("IMAGE_CACHE_MAX_AGE", "3600"))
+USE_X_SENDFILE = os.getenv("IMAGE_USE_X_SENDFILE", "false").lower() == "true"
+# Prefijo interno de nginx para X-Accel-Redirect (p. ej. /protected/catalog/); vacío = desactivado
+X_ACCEL_PREFIX = os.getenv("IMAGE_X_ACCEL_PREFIX", "")
+PRECOMPRESSED = (("br", ".br"), ("gzip", ".gz"))
+
+# ETags de archivos sin hash en el nombre, calculados una vez por (ruta, mtime, tamaño)
+_etags = LRUTTLCache(max_entries=4096, ttl=24 * 3600)
+
+
+def file_etag(path: str, filename: str) -> str:
+    """ETag fuerte: el hash del nombre si lo tiene, si no el hash del contenido (cacheado)"""
+    if is_content_hashed(filename):
+        return os.path.splitext(os.path.basename(filename))[0].rsplit('-', 1)[1]
+    stat = os.stat(path)
+    key = (path, stat.st_mtime_ns, stat.st_size)
+    found, etag = _etags.get(key)
+    if not found:
+        etag = content_hash(path)
+        _etags.set(key, etag)
+    return etag
+
+
+def pick_encoding(path: str):
+    """Devuelve (ruta, content-encoding) de la versión precomprimida aceptada por el cliente"""
+    accepted = request.accept_encodings
+    for encoding, suffix in PRECOMPRESSED:
+        if accepted[encoding] and os.path.isfile(path + suffix):
+            return path + suffix, encoding
+    return path, None
+
+
+@images_bp.route('/static/catalog/<path:filename>', methods=['GET', 'HEAD'])
+def serve_catalog_image(filename):
+    path = safe_join(CATALOG_DIR, filename)
+    if path is None or not os.path.isfile(path):
+        abort(404)
+
+    etag = file_etag(path, filename)
+    body_path, encoding = pick_encoding(path)
+    if encoding:
+        etag = f"{etag}-{encoding}"
+    mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+
+    if X_ACCEL_PREFIX:
+        # nginx envía el archivo; aquí solo se resuelven los GET condicionales
+        response = Response(mimetype=mimetype)
+        response.set_etag(etag)
+        response.make_conditional(request)
+        if response.status_code != 304:
+            response.headers['X-Accel-Redirect'] = X_ACCEL_PREFIX.rstrip('/') + '/' + filename + body_path[len(path):]
+    else:
+        response = send_file(
+            body_path, request.environ, mimetype=mimetype, conditional=True, etag=etag,
+            use_x_sendfile=USE_X_SENDFILE,
+        )
+
+    if is_content_hashed(filename):
+        response.headers['Cache-Control'] = f'public, max-age={IMMUTABLE_MAX_AGE}, immutable'
+    else:
+        response.headers['Cache-Control'] = f'public, max-age={MUTABLE_MAX_AGE}'
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    response.vary.add('Accept-Encoding')
+    return response
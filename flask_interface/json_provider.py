@@ -0,0 +1,74 @@
+"""
+Proveedor JSON de la aplicación Flask
+
+FastJSONProvider sustituye al proveedor por defecto (app.json) y usa orjson
+cuando está instalado (pip install orjson), que serializa directamente a bytes
+en C. Sin orjson, o con JSON_PROVIDER=stdlib, se comporta como el proveedor
+estándar de Flask. En ambos casos las claves se ordenan, igual que jsonify.
+"""
+from flask.json.provider import DefaultJSONProvider
+from datetime import date
+from decimal import Decimal
+import dataclasses
+import json
+import os
+import uuid
+
+try:
+    import orjson
+except ImportError:  # orjson es opcional
+    orjson = None
+
+USE_ORJSON = orjson is not None and os.getenv("JSON_PROVIDER", "auto").lower() != "stdlib"
+
+
+def _default(obj):
+    """Tipos no nativos de JSON: fechas en ISO 8601, Decimal/UUID como texto, dataclasses como objeto"""
+    if isinstance(obj, date):
+        return obj.isoformat()
+    if isinstance(obj, (Decimal, uuid.UUID)):
+        return str(obj)
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return dataclasses.asdict(obj)
+    if hasattr(obj, "toDictionary"):
+        return obj.toDictionary()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+_encoder = json.JSONEncoder(ensure_ascii=False, sort_keys=True, separators=(",", ":"), default=_default)
+_unsorted_encoder = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"), default=_default)
+
+
+def dumps_bytes(obj, sort_keys: bool = True) -> bytes:
+    """
+    JSON compacto en UTF-8 (orjson si está disponible).
+    sort_keys=False conserva el orden de inserción, para dicts ya construidos en orden.
+    """
+    if USE_ORJSON:
+        option = orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS if sort_keys else 0
+        return orjson.dumps(obj, default=_default, option=option)
+    return (_encoder if sort_keys else _unsorted_encoder).encode(obj).encode("utf-8")
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """
+    Proveedor JSON de Flask respaldado por orjson.
+    Las llamadas con argumentos extra de json (indent, cls...) y el modo debug
+    usan el proveedor estándar.
+    """
+
+    def dumps(self, obj, **kwargs) -> str:
+        if not USE_ORJSON or kwargs:
+            return super().dumps(obj, **kwargs)
+        return dumps_bytes(obj).decode("utf-8")
+
+    def loads(self, s, **kwargs):
+        if not USE_ORJSON or kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        if not USE_ORJSON or self.compact is False or (self.compact is None and self._app.debug):
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(dumps_bytes(obj) + b"\n", mimetype=self.mimetype)
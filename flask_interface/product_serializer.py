@@ -0,0 +1,153 @@
+"""
+Serialización de productos a JSON en bytes
+
+ProductSerializer escribe cada Product directamente como un fragmento JSON
+(bytes) sin pasar por toDictionary, y guarda los fragmentos en una caché LRU
+cuya clave es la tupla de valores de los campos: un producto sin cambios
+reutiliza su fragmento y cualquier cambio produce una clave nueva, por lo que
+la caché no necesita invalidación. Las listas y páginas se arman concatenando
+fragmentos. La salida es la misma que jsonify(product.toDictionary()).
+
+list_bytes, page_bytes y product_bytes registran la etapa serialization;
+fragment() no, porque la exportación en streaming la llama una vez por producto.
+
+etag, list_etag y page_etag son los validadores HTTP de las respuestas (ver
+http_caching): el hash de la clave de cada producto (repr de la tupla de
+valores, estable entre procesos), no del JSON, así que un GET condicional nunca
+pasa por el codificador. Los hashes se cachean aparte de los fragmentos
+(PRODUCT_ETAG_CACHE_SIZE, entradas de 16 bytes) para que un 304 sobre un
+catálogo grande no dependa de la caché de fragmentos. El ETag de una lista
+combina los hashes de sus productos en orden.
+"""
+from functools import lru_cache
+from operator import attrgetter
+from typing import Iterable
+import hashlib
+import os
+
+from domain.entidades.product_model import Product
+from domain.entidades.product_page import ProductPage
+from flask_interface.json_provider import dumps_bytes
+from observability.stages import SERIALIZATION, track_stage
+
+# Campos serializados; imageVariants va al final porque se convierte a tupla para la clave
+PRODUCT_FIELDS = (
+    "productId", "name", "category", "price", "unit", "imageUrl", "stock", "origin",
+    "description", "user_id", "isActive", "originalPrice", "isOrganic", "isBestSeller",
+    "freeShipping", "createdAt", "updatedAt", "inStock", "imageVariants",
+)
+_field_values = attrgetter(*PRODUCT_FIELDS)
+
+
+def _number(value):
+    return None if value != value else value  # NaN -> None
+
+
+def _iso(value):
+    return value if value is None or isinstance(value, str) else value.isoformat()
+
+
+def _encode(values: tuple) -> bytes:
+    (productId, name, category, price, unit, imageUrl, stock, origin, description, user_id,
+     isActive, originalPrice, isOrganic, isBestSeller, freeShipping, createdAt, updatedAt,
+     inStock, imageVariants) = values
+    # Claves en orden alfabético (el mismo que jsonify) para no tener que ordenarlas al serializar
+    return dumps_bytes({
+        "category": category,
+        "createdAt": _iso(createdAt),
+        "description": description,
+        "freeShipping": freeShipping,
+        "imageUrl": imageUrl,
+        "imageVariants": None if imageVariants is None else dict(imageVariants),
+        "inStock": inStock,
+        "isActive": isActive,
+        "isBestSeller": isBestSeller,
+        "isOrganic": isOrganic,
+        "name": name,
+        "origin": origin,
+        "originalPrice": _number(originalPrice),
+        "price": _number(price),
+        "productId": productId,
+        "stock": _number(stock),
+        "unit": unit,
+        "updatedAt": _iso(updatedAt),
+        "user_id": user_id,
+    }, sort_keys=False)
+
+
+def _version(values: tuple) -> bytes:
+    # Cambia con cualquier campo serializado, igual que el fragmento, sin codificar JSON
+    return hashlib.blake2b(repr(values).encode("utf-8"), digest_size=16).digest()
+
+
+class ProductSerializer:
+    """
+    Serializador de Product a bytes JSON con caché de fragmentos y de hashes (ETag).
+    cache_size=0 / etag_cache_size=0 desactivan cada caché.
+    """
+
+    def __init__(self, cache_size: int = 10000, etag_cache_size: int = 100000):
+        self._encode = lru_cache(maxsize=cache_size)(_encode) if cache_size > 0 else _encode
+        self._digest = lru_cache(maxsize=etag_cache_size)(_version) if etag_cache_size > 0 else _version
+
+    @classmethod
+    def from_env(cls) -> "ProductSerializer":
+        return cls(
+            cache_size=int(os.getenv("PRODUCT_JSON_CACHE_SIZE", "10000")),
+            etag_cache_size=int(os.getenv("PRODUCT_ETAG_CACHE_SIZE", "100000")),
+        )
+
+    @staticmethod
+    def _key(product: Product) -> tuple:
+        values = _field_values(product)
+        variants = values[-1]
+        if variants is not None:
+            values = values[:-1] + (tuple(sorted(variants.items())),)
+        return values
+
+    def fragment(self, product: Product) -> bytes:
+        """Objeto JSON de un producto"""
+        return self._encode(self._key(product))
+
+    def etag(self, product: Product) -> str:
+        """ETag fuerte de product_bytes(product): cambia con cualquier campo serializado"""
+        return self._digest(self._key(product)).hex()
+
+    def list_etag(self, products: Iterable[Product]) -> str:
+        """ETag fuerte de list_bytes(products)"""
+        return self._combine(b"list", products)
+
+    def page_etag(self, page: ProductPage) -> str:
+        """ETag fuerte de page_bytes(page), incluido el nextPageToken"""
+        return self._combine(b"page:" + (page.nextPageToken or "").encode("utf-8"), page.items)
+
+    def _combine(self, kind: bytes, products: Iterable[Product]) -> str:
+        digest = hashlib.blake2b(kind, digest_size=16)
+        for product in products:
+            digest.update(self._digest(self._key(product)))
+        return digest.hexdigest()
+
+    def product_bytes(self, product: Product) -> bytes:
+        """fragment() medido como etapa serialization (respuestas de un solo producto)"""
+        with track_stage(SERIALIZATION):
+            return self.fragment(product)
+
+    def list_bytes(self, products: Iterable[Product]) -> bytes:
+        """Array JSON de productos"""
+        with track_stage(SERIALIZATION):
+            return self._join(products)
+
+    def page_bytes(self, page: ProductPage) -> bytes:
+        """Objeto JSON de una ProductPage ({"items": [...], "nextPageToken": ...})"""
+        with track_stage(SERIALIZATION):
+            return (
+                b'{"items":' + self._join(page.items)
+                + b',"nextPageToken":' + dumps_bytes(page.nextPageToken) + b"}"
+            )
+
+    def _join(self, products: Iterable[Product]) -> bytes:
+        return b"[" + b",".join(map(self.fragment, products)) + b"]"
+
+    def cache_info(self):
+        """Estadísticas de la caché de fragmentos (hits, misses, currsize) o None si está desactivada"""
+        return self._encode.cache_info() if hasattr(self._encode, "cache_info") else None
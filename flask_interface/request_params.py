@@ -0,0 +1,131 @@
+"""
+Query parameters and response streaming shared by the sync (Flask) and
+async (Quart) product routes. Helpers take the request's args/accept headers
+instead of a request object so both frameworks can use them.
+"""
+import math
+import os
+from typing import Optional
+
+from domain.entidades.product_query import ProductQuery
+
+DEFAULT_PAGE_SIZE = int(os.getenv("PRODUCTS_DEFAULT_PAGE_SIZE", "50"))
+MAX_PAGE_SIZE = int(os.getenv("PRODUCTS_MAX_PAGE_SIZE", "200"))
+BULK_MAX_ROWS = int(os.getenv("PRODUCTS_BULK_MAX_ROWS", "1000"))
+STREAM_CHUNK_BYTES = int(os.getenv("PRODUCTS_STREAM_CHUNK_BYTES", "65536"))
+STREAM_FORMATS = {"ndjson": "application/x-ndjson", "json-stream": "application/json"}
+
+
+def get_page_params(args):
+    """
+    Reads the cursor pagination parameters (limit, page_token) from the query string.
+    Returns None when the client did not ask for a paged response.
+    """
+    if "limit" not in args and "page_token" not in args:
+        return None
+    try:
+        limit = int(args.get("limit", DEFAULT_PAGE_SIZE))
+    except ValueError:
+        raise ValueError("limit debe ser un entero")
+    if limit < 1 or limit > MAX_PAGE_SIZE:
+        raise ValueError(f"limit debe estar entre 1 y {MAX_PAGE_SIZE}")
+    return limit, args.get("page_token") or None
+
+
+QUERY_TEXT_PARAMS = ("category", "origin")
+QUERY_BOOL_PARAMS = ("isOrganic", "freeShipping")
+QUERY_PRICE_PARAMS = ("minPrice", "maxPrice")
+QUERY_PARAMS = QUERY_TEXT_PARAMS + QUERY_BOOL_PARAMS + QUERY_PRICE_PARAMS + ("sort",)
+
+
+def get_product_query(args) -> Optional[ProductQuery]:
+    """
+    Reads the listing filters and sort from the query string.
+    Returns None when the client did not ask for any of them.
+    """
+    if not any(name in args for name in QUERY_PARAMS):
+        return None
+    values = {name: args.get(name) or None for name in QUERY_TEXT_PARAMS}
+    for name in QUERY_BOOL_PARAMS:
+        value = args.get(name)
+        if value is None or value == "":
+            continue
+        if value.lower() not in ("true", "false", "1", "0"):
+            raise ValueError(f"{name} debe ser true o false")
+        values[name] = value.lower() in ("true", "1")
+    for name in QUERY_PRICE_PARAMS:
+        value = args.get(name)
+        if value is None or value == "":
+            continue
+        try:
+            values[name] = float(value)
+        except ValueError:
+            raise ValueError(f"{name} debe ser un número")
+        if not math.isfinite(values[name]):
+            raise ValueError(f"{name} debe ser un número")
+    return ProductQuery(sort=args.get("sort") or None, **values)
+
+
+SEARCH_MAX_CHARS = 200
+
+
+def get_search_params(args):
+    """
+    Reads the search text (q) and its page (limit, page_token) from the query string.
+    Search results are always paged.
+    """
+    text = (args.get("q") or "").strip()
+    if not text:
+        raise ValueError("El parámetro q es obligatorio")
+    if len(text) > SEARCH_MAX_CHARS:
+        raise ValueError(f"q admite como máximo {SEARCH_MAX_CHARS} caracteres")
+    limit, page_token = get_page_params(args) or (DEFAULT_PAGE_SIZE, None)
+    # Conserva el espacio final: indica que la última palabra está completa
+    return args.get("q").lstrip(), limit, page_token
+
+
+def get_stream_format(args, accept_mimetypes):
+    """
+    Returns the requested streaming format ("ndjson" or "json-stream") or None.
+    NDJSON can also be requested with the header Accept: application/x-ndjson.
+    """
+    fmt = args.get("format")
+    if fmt is None and accept_mimetypes.best == STREAM_FORMATS["ndjson"]:
+        fmt = "ndjson"
+    if fmt is not None and fmt not in STREAM_FORMATS:
+        raise ValueError(f"format debe ser uno de: {', '.join(STREAM_FORMATS)}")
+    return fmt
+
+
+class StreamChunker:
+    """
+    Groups serialized products into chunks of about STREAM_CHUNK_BYTES,
+    either as NDJSON lines or as an incrementally built JSON array.
+    """
+
+    def __init__(self, fmt: str):
+        self.ndjson = fmt == "ndjson"
+        self._buffer = [] if self.ndjson else [b"["]
+        self._size = 0
+        self._first = True
+
+    def add(self, item: bytes) -> Optional[bytes]:
+        """Adds one serialized product; returns a chunk when the buffer is full"""
+        if self.ndjson:
+            item += b"\n"
+        elif not self._first:
+            item = b"," + item
+        self._first = False
+        self._buffer.append(item)
+        self._size += len(item)
+        if self._size >= STREAM_CHUNK_BYTES:
+            chunk = b"".join(self._buffer)
+            self._buffer, self._size = [], 0
+            return chunk
+        return None
+
+    def close(self) -> Optional[bytes]:
+        """Returns the last chunk (closing the JSON array if needed)"""
+        if not self.ndjson:
+            self._buffer.append(b"]")
+        return b"".join(self._buffer) if self._buffer else None
@@ -1,24 +1,48 @@
-from flask import Blueprint, request, jsonify, abort
-from Infrastructure.adapterProductRepo import AdapterProductRepo
-from application.useCases.CreateProductService import CreateProductService
-from application.useCases.GetProductByIdService import GetProductByIdService
-from application.useCases.GetAllProductsService import GetAllProductsService
-from application.useCases.GetProductsByUserIDService import GetProductsByUserIDService
+from flask import Blueprint, request, jsonify, abort, Response
+from flask_interface.bulk_parsing import bulk_status, parse_bulk_request
+from flask_interface.dependencies import get_container
+from flask_interface.http_caching import LIST_MAX_AGE, PRODUCT_MAX_AGE, conditional_json
+from flask_interface.product_serializer import ProductSerializer
+from flask_interface.request_params import (
+    BULK_MAX_ROWS, STREAM_FORMATS, StreamChunker, get_page_params, get_product_query, get_search_params,
+    get_stream_format,
+)
+from Infrastructure.users_client import UsersServiceError
 from observability.MetricsDecorator import monitor_endpoint
-import requests
-import os
-from werkzeug.utils import secure_filename
 
 bp = Blueprint('productos', __name__)
-repo = AdapterProductRepo()
-create_service = CreateProductService(repo)
-get_by_id_service = GetProductByIdService(repo)
-get_all_service = GetAllProductsService(repo)
-get_by_user_id_service = GetProductsByUserIDService(repo)
+# El repositorio y los servicios se crean por proceso en el primer uso (ver dependencies)
+serializer = ProductSerializer.from_env()
 
-def validate_user_exists(user_id):
-    resp = requests.get(f"http://localhost:5001/users/getById/{user_id}")
-    return resp.status_code == 200
+def json_response(body: bytes, status: int = 200):
+    """Response for a JSON body that is already serialized"""
+    return Response(body, status=status, mimetype="application/json")
+
+def product_response(product):
+    """Producto con ETag y Last-Modified; 304 sin serializar si el cliente ya tiene esta versión"""
+    return conditional_json(Response, request, serializer.etag(product), lambda: serializer.product_bytes(product),
+                            PRODUCT_MAX_AGE, last_modified=product.updatedAt)
+
+def list_response(products, vary=None):
+    """Array JSON de productos con ETag (304 si no cambió)"""
+    return conditional_json(Response, request, serializer.list_etag(products), lambda: serializer.list_bytes(products),
+                            LIST_MAX_AGE, vary=vary)
+
+def page_response(page, vary=None):
+    """ProductPage con ETag (304 si no cambió)"""
+    return conditional_json(Response, request, serializer.page_etag(page), lambda: serializer.page_bytes(page),
+                            LIST_MAX_AGE, vary=vary)
+
+def stream_products(products, fmt):
+    """Serializes products one by one and yields them in chunks (see StreamChunker)"""
+    chunker = StreamChunker(fmt)
+    for product in products:
+        chunk = chunker.add(serializer.fragment(product))
+        if chunk:
+            yield chunk
+    chunk = chunker.close()
+    if chunk:
+        yield chunk
 
 @bp.route("/products", methods=["POST"])
 @monitor_endpoint("create_product")
@@ -39,37 +63,57 @@ def create_product():
     missing = [f for f in required_fields if f not in data]
     if missing or not image:
         return jsonify({"error": f"Faltan campos obligatorios: {', '.join(missing + (['image'] if not image else []))}"}), 400
-    # Validate category and user as before...
-    # Temporarily set imageUrl to empty string
+    # imageUrl is resolved from the uploaded image before the product is persisted
     data["imageUrl"] = ""
     try:
-        # Create product (generates productId)
-        product = create_service.execute(data)
-        # Save image with productId as filename
-        ext = os.path.splitext(secure_filename(image.filename))[1]
-        filename = f"{product.productId}{ext}"
-        save_path = os.path.join("static", "catalog", filename)
-        image.save(save_path)
-        # Update imageUrl
-        product.imageUrl = f"http://localhost:5000/static/catalog/{filename}"
-        # Save/update product in DB with new imageUrl
-        repo.update_image_url(product.productId, product.imageUrl) 
-        return jsonify(product.toDictionary()), 201
+        # Create product (generates productId, saves the image, single INSERT)
+        product = get_container().create_service.execute(data, image=image)
+        return json_response(serializer.product_bytes(product), 201)
+    except UsersServiceError:
+        return jsonify({"error": "Servicio de usuarios no disponible"}), 503
     except (ValueError, TypeError) as e:
         return jsonify({"error": str(e)}), 400
     except Exception as e:
         return jsonify({"error": "Error interno", "details": str(e)}), 400
 
+@bp.route("/products/bulk", methods=["POST"])
+@monitor_endpoint("create_products_bulk")
+def create_products_bulk():
+    try:
+        rows = parse_bulk_request(request, BULK_MAX_ROWS)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    try:
+        results = get_container().create_service.execute_batch(rows)
+    except UsersServiceError:
+        return jsonify({"error": "Servicio de usuarios no disponible"}), 503
+    except Exception as e:
+        return jsonify({"error": "Error interno", "details": str(e)}), 500
+    body, status = bulk_status(results)
+    return jsonify(body), status
+
+@bp.route("/products/search", methods=["GET"])
+@monitor_endpoint("search_products")
+def search_products():
+    try:
+        text, limit, page_token = get_search_params(request.args)
+        page = get_container().search_service.execute(text, get_product_query(request.args), limit, page_token)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": "Error interno", "details": str(e)}), 500
+    return page_response(page)
+
 @bp.route("/products/<product_id>", methods=["GET"])
 @monitor_endpoint("get_product_by_id")
 def get_product_by_id(product_id):
     if not isinstance(product_id, str) or not product_id:
         return jsonify({"error": "ID inválido"}), 400
     try:
-        product = get_by_id_service.execute(product_id)
+        product = get_container().get_by_id_service.execute(product_id)
         if product is None:
             return jsonify({"error": "Producto no encontrado"}), 404
-        return jsonify(product.toDictionary()), 200
+        return product_response(product)
     except ValueError as e:
         return jsonify({"error": str(e)}), 404
     except Exception as e:
@@ -78,24 +122,69 @@ def get_product_by_id(product_id):
 @bp.route("/products", methods=["GET"])
 @monitor_endpoint("get_all_products")
 def get_all_products():
+    try:
+        stream_format = get_stream_format(request.args, request.accept_mimetypes)
+        # Filtros y orden (?category=&isOrganic=&freeShipping=&minPrice=&maxPrice=&origin=&sort=)
+        product_query = get_product_query(request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    get_all_service = get_container().get_all_service
+    if product_query is not None:
+        return get_filtered_products(get_all_service, product_query, stream_format)
+    if stream_format:
+        return Response(
+            stream_products(get_all_service.stream(), stream_format),
+            mimetype=STREAM_FORMATS[stream_format],
+        )
+    try:
+        page_params = get_page_params(request.args)
+        page = get_all_service.execute_page(*page_params) if page_params else None
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": "Error interno", "details": str(e)}), 500
+    # GET /products también sirve NDJSON según Accept
+    if page is not None:
+        return page_response(page, vary="Accept")
     try:
         products = get_all_service.execute()
-        if not products:
-            return jsonify([]), 200
-        return jsonify([p.toDictionary() for p in products]), 200
+        return list_response(products or [], vary="Accept")
     except Exception as e:
         return jsonify({"error": "Error interno", "details": str(e)}), 500
         
+def get_filtered_products(get_all_service, product_query, stream_format):
+    """Listado filtrado u ordenado servido desde el índice de productos (completo, paginado o en streaming)"""
+    try:
+        if stream_format:
+            products = get_all_service.execute_filtered(product_query)
+            return Response(stream_products(products, stream_format), mimetype=STREAM_FORMATS[stream_format])
+        page_params = get_page_params(request.args)
+        if page_params:
+            return page_response(get_all_service.execute_filtered_page(product_query, *page_params), vary="Accept")
+        return list_response(get_all_service.execute_filtered(product_query), vary="Accept")
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": "Error interno", "details": str(e)}), 500
+
 @bp.route("/products/user/<user_id>", methods=["GET"])
 @monitor_endpoint("get_products_by_user_id")
 def get_products_by_user_id(user_id):
     if not isinstance(user_id, str) or not user_id:
         return jsonify({"error": "ID de usuario inválido"}), 400
+    get_by_user_id_service = get_container().get_by_user_id_service
+    try:
+        page_params = get_page_params(request.args)
+        page = get_by_user_id_service.execute_page(user_id, *page_params) if page_params else None
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": "Error interno", "details": str(e)}), 500
+    if page is not None:
+        return page_response(page)
     try:
         products = get_by_user_id_service.execute(user_id)
-        if not products:
-            return jsonify([]), 200
-        return jsonify([p.toDictionary() for p in products]), 200
+        return list_response(products or [])
     except ValueError as e:
         return jsonify({"error": str(e)}), 404
     except Exception as e:
@@ -0,0 +1,122 @@
+"""
+Tests para las rutas del modo asíncrono (Quart): mismas respuestas que las rutas sync
+"""
+import asyncio
+import threading
+
+import pytest
+
+quart = pytest.importorskip("quart")
+
+import flask_interface.async_routes as async_routes
+from flask_interface.dependencies import reset_container
+from Infrastructure.testing import make_product
+from Infrastructure.users_client import LoopUsersDirectory
+
+
+@pytest.fixture
+def repo(repo):
+    repo.add_product(make_product("PROD-A"))
+    return repo
+
+
+@pytest.fixture
+def app(container):
+    app = quart.Quart(__name__)
+    app.register_blueprint(async_routes.async_bp)
+    return app
+
+
+def serve(app, scenario):
+    """Ejecuta scenario(client) con el servidor arrancado (before/after_app_serving)"""
+    async def main():
+        async with app.test_app() as test_app:
+            return await scenario(test_app.test_client())
+    return asyncio.run(main())
+
+
+def test_reads_match_the_sync_routes(app):
+    async def scenario(client):
+        found = await client.get("/products/PROD-A")
+        missing = await client.get("/products/PROD-X")
+        by_user = await client.get("/products/user/USER-1")
+        return found.status_code, missing.status_code, await missing.get_json(), await by_user.get_json()
+
+    found, missing, missing_body, by_user = serve(app, scenario)
+    assert (found, missing) == (200, 404)
+    assert missing_body == {"error": "Producto no encontrado"}
+    assert [p["productId"] for p in by_user] == ["PROD-A"]
+
+
+def test_empty_ids_are_rejected_with_400(app):
+    """Como en routes.py, un ID vacío responde 400 antes de consultar el repositorio"""
+    async def scenario(client):
+        async with app.test_request_context("/products/"):
+            product = await async_routes.get_product_by_id("")
+            by_user = await async_routes.get_products_by_user_id("")
+        return [(status, await body.get_json()) for body, status in (product, by_user)]
+
+    assert serve(app, scenario) == [(400, {"error": "ID inválido"}), (400, {"error": "ID de usuario inválido"})]
+
+
+def test_value_errors_of_the_repository_are_404(app, monkeypatch):
+    async def not_found(*args):
+        raise ValueError("Producto no encontrado")
+
+    async def scenario(client):
+        monkeypatch.setattr(async_routes.async_repo, "get_product_by_id", not_found)
+        monkeypatch.setattr(async_routes.async_repo, "get_products_by_user_id", not_found)
+        return [(await client.get(path)).status_code for path in ("/products/PROD-A", "/products/user/USER-1")]
+
+    assert serve(app, scenario) == [404, 404]
+
+
+def test_container_is_built_off_the_event_loop_without_the_sync_users_client(container_env, monkeypatch):
+    """Al arrancar, el contenedor se crea en un hilo y la validación de usuarios usa solo el cliente asíncrono"""
+    pytest.importorskip("httpx")
+    # Sin contenedor previo: lo crea open_clients con el repositorio en memoria
+    env = {**container_env, "USERS_VALIDATION_ENABLED": "true", "PRODUCT_REPOSITORY": "memory"}
+    for name, value in env.items():
+        monkeypatch.setenv(name, value)
+    reset_container()
+    built = []
+    get_container = async_routes.get_container
+
+    def recording_get_container(**kwargs):
+        container = get_container(**kwargs)
+        built.append((threading.current_thread(), container))
+        return container
+
+    monkeypatch.setattr(async_routes, "get_container", recording_get_container)
+    app = quart.Quart(__name__)
+    app.register_blueprint(async_routes.async_bp)
+
+    async def scenario(client):
+        return threading.current_thread(), async_routes.create_service.users
+
+    loop_thread, users = serve(app, scenario)
+    [(thread, container)] = built
+    assert thread is not loop_thread
+    assert container.users_client is None
+    assert isinstance(users, LoopUsersDirectory)
+
+
+def test_search_and_bulk_share_the_sync_rules(app, container):
+    """La búsqueda usa SearchProductsService y la carga masiva el mismo 201/207/400 que el modo sync"""
+    row = {"name": "Mango", "category": "frutas", "price": 3000.0, "unit": "kg", "stock": 5,
+           "origin": "Tolima", "description": "Mango dulce", "user_id": "USER-2"}
+
+    async def scenario(client):
+        sorted_search = await client.get("/products/search?q=papa&sort=price")
+        search = await client.get("/products/search?q=papa")
+        bulk = await client.post("/products/bulk", json=[row, {"name": "Sin precio"}])
+        return sorted_search, await sorted_search.get_json(), search, await search.get_json(), bulk, await bulk.get_json()
+
+    sorted_search, sorted_body, search, search_body, bulk, bulk_body = serve(app, scenario)
+    assert sorted_search.status_code == 400
+    assert sorted_body["error"].startswith("sort no está disponible")
+    assert search.status_code == 200
+    assert [p["productId"] for p in search_body["items"]] == ["PROD-A"]
+    assert bulk.status_code == 207
+    assert (bulk_body["created"], bulk_body["failed"]) == (1, 1)
+    assert len(container.repo.get_all_products()) == 2
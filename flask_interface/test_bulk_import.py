@@ -0,0 +1,114 @@
+"""
+Tests para la carga masiva de productos (POST /products/bulk): formatos, coerción CSV, errores por fila y códigos 201/207/400
+"""
+import io
+
+import pytest
+from werkzeug.datastructures import FileStorage
+
+from domain.entidades.product_model import Product
+from flask_interface.bulk_parsing import parse_bulk_payload
+
+CSV_BODY = (
+    "name,category,price,unit,stock,origin,description,user_id,isOrganic,originalPrice\n"
+    "Papa sabanera,vegetales,2500,kg,10,Boyacá,Papa fresca,USER-1,sí,\n"
+    " Mango , frutas , 3000.5 , kg , 0 , Tolima , Mango dulce , USER-2 , no , 3500\n"
+)
+
+
+def row(name="Papa sabanera", **fields):
+    return {"name": name, "category": "vegetales", "price": 2500.0, "unit": "kg", "stock": 10,
+            "origin": "Boyacá", "description": "Papa fresca", "user_id": "USER-1", **fields}
+
+
+def upload(data, filename, content_type="application/octet-stream"):
+    return FileStorage(stream=io.BytesIO(data.encode("utf-8")), filename=filename, content_type=content_type)
+
+
+# ===============================
+# PARSING
+# ===============================
+
+def test_json_array_and_products_object_are_accepted():
+    assert parse_bulk_payload("application/json", '[{"name": "a"}]', None, 10) == [{"name": "a", "imageUrl": ""}]
+    assert parse_bulk_payload("application/json; charset=utf-8", '{"products": [{"name": "a", "imageUrl": "x"}]}',
+                              None, 10) == [{"name": "a", "imageUrl": "x"}]
+
+
+def test_csv_cells_are_coerced_and_empty_cells_dropped():
+    """Números y booleanos del CSV llegan tipados; las celdas vacías usan el valor por defecto"""
+    first, second = parse_bulk_payload("text/csv", CSV_BODY, None, 10)
+    assert first["price"] == 2500.0 and first["stock"] == 10 and first["isOrganic"] is True
+    assert "originalPrice" not in first and first["imageUrl"] == ""
+    assert second["name"] == "Mango" and second["price"] == 3000.5 and second["isOrganic"] is False
+    assert second["originalPrice"] == 3500.0 and second["description"] == "Mango dulce"
+
+
+def test_multipart_file_is_parsed_by_extension_or_mimetype():
+    """El archivo del formulario se lee como CSV por extensión o mimetype y, si no, como JSON; el nombre es opcional"""
+    assert len(parse_bulk_payload("multipart/form-data; boundary=x", "", upload(CSV_BODY, "productos.CSV"), 10)) == 2
+    assert len(parse_bulk_payload("multipart/form-data", "", upload(CSV_BODY, None, "text/csv"), 10)) == 2
+    assert parse_bulk_payload("multipart/form-data", "", upload('[{"name": "a"}]', None), 10)[0]["name"] == "a"
+    with pytest.raises(ValueError, match="Falta el archivo 'file'"):
+        parse_bulk_payload("multipart/form-data", "", None, 10)
+
+
+@pytest.mark.parametrize("content_type, body, message", [
+    ("application/json", "[", "JSON inválido"),
+    ("application/json", '{"items": []}', "Se esperaba un array"),
+    ("application/json", "[]", "No se recibieron productos"),
+    ("application/json", "[{}, {}, {}]", "Máximo 2 productos por carga"),
+    ("application/xml", "<a/>", "Content-Type debe ser"),
+])
+def test_invalid_payloads_are_rejected(content_type, body, message):
+    with pytest.raises(ValueError, match=message):
+        parse_bulk_payload(content_type, body, None, 2)
+
+
+# ===============================
+# ROUTE AND SERVICE
+# ===============================
+
+def test_all_rows_created_returns_201(client, container):
+    response = client.post("/products/bulk", data=CSV_BODY, content_type="text/csv")
+    assert response.status_code == 201
+    assert response.json["created"] == 2 and response.json["failed"] == 0
+    ids = [result["productId"] for result in response.json["results"]]
+    assert [container.repo.get_product_by_id(i).name for i in ids] == ["Papa sabanera", "Mango"]
+
+
+def test_row_errors_are_reported_in_input_order_with_207(client, container):
+    """Cada fila tiene su resultado en el orden de entrada; los errores se explican en español"""
+    container.repo.add_product(Product(imageUrl="", productId="PROD-EXIST001", **row()))
+    rows = [
+        row(productId="PROD-NEW00001"),
+        {"name": "Sin precio"},
+        row(productId="PROD-NEW00001"),
+        row(productId="PROD-EXIST001"),
+        row(price="abc"),
+        row(color="rojo"),
+        "no es un objeto",
+        row(price=-1.0),
+        row(),
+    ]
+    response = client.post("/products/bulk", json=rows)
+    assert response.status_code == 207
+    results = response.json["results"]
+    assert [r["row"] for r in results] == list(range(len(rows)))
+    assert [r["status"] for r in results] == ["created"] + ["error"] * 7 + ["created"]
+    errors = [r.get("error") for r in results]
+    assert errors[1] == "Faltan campos obligatorios: category, price, unit, stock, origin, description, user_id"
+    assert errors[2] == "productId repetido en la carga"
+    assert errors[3] == "Ya existe un producto con ese ID"
+    assert errors[4].startswith("Tipo de dato inválido")
+    assert errors[5] == "Campos desconocidos: color"
+    assert errors[6] == "Cada fila debe ser un objeto"
+    assert errors[7] == "El precio no puede ser negativo"
+    assert response.json["created"] == 2 and response.json["failed"] == 7
+
+
+def test_no_row_created_returns_400(client):
+    response = client.post("/products/bulk", json=[{"name": "a"}, row(stock=-1)])
+    assert response.status_code == 400
+    assert response.json["created"] == 0 and response.json["failed"] == 2
+    assert client.post("/products/bulk", data="<a/>", content_type="application/xml").status_code == 400
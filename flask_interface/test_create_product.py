@@ -0,0 +1,86 @@
+"""
+Tests para la creación de productos con imagen (POST /products): escritura única y reversión de la imagen
+"""
+import io
+import os
+
+import pytest
+
+IMAGE = b"\xff\xd8\xff\xe0" + bytes(range(256)) * 8
+OTHER_IMAGE = b"\xff\xd8\xff\xe0" + bytes(range(255, -1, -1)) * 8
+
+
+def post_product(client, image=IMAGE, **fields):
+    form = {
+        "name": "Papa sabanera", "category": "vegetales", "price": "2500", "unit": "kg", "stock": "10",
+        "origin": "Boyacá", "description": "Papa fresca", "user_id": "USER-1", **fields,
+        "image": (io.BytesIO(image), "papa.jpg"),
+    }
+    return client.post("/products", data=form, content_type="multipart/form-data")
+
+
+def stored_files(tmp_path):
+    return sorted(os.listdir(tmp_path))
+
+
+def test_create_stores_the_image_before_the_single_write(client, container, tmp_path):
+    """El producto se guarda una vez con la URL de su imagen, nombrada por el hash del contenido"""
+    response = post_product(client)
+    assert response.status_code == 201
+    product = container.repo.get_product_by_id(response.json["productId"])
+    filename = product.imageUrl.rsplit("/", 1)[1]
+    assert stored_files(tmp_path) == [filename]
+    assert filename.startswith(product.productId + "-")
+    assert (tmp_path / filename).read_bytes() == IMAGE
+
+
+@pytest.mark.parametrize("image", [IMAGE, OTHER_IMAGE])
+def test_duplicate_id_never_touches_the_live_image(client, container, tmp_path, image):
+    """Un productId repetido responde 400 sin borrar ni dejar archivos, con la misma imagen o con otra"""
+    first = post_product(client, productId="PROD-DUP00001")
+    assert first.status_code == 201
+    before = stored_files(tmp_path)
+
+    duplicate = post_product(client, image=image, productId="PROD-DUP00001")
+    assert duplicate.status_code == 400
+    assert duplicate.json["error"] == "Ya existe un producto con ese ID"
+    assert stored_files(tmp_path) == before
+    live = container.repo.get_product_by_id("PROD-DUP00001").imageUrl.rsplit("/", 1)[1]
+    assert (tmp_path / live).read_bytes() == IMAGE
+
+
+def test_concurrent_duplicate_keeps_the_shared_image(container, tmp_path, monkeypatch):
+    """Si otro proceso crea el mismo ID entre la comprobación y la escritura, la imagen idéntica no se borra"""
+    service = container.create_service
+    data = {"name": "Papa", "category": "vegetales", "price": 1.0, "unit": "kg", "stock": 1, "imageUrl": "",
+            "origin": "Boyacá", "description": "", "user_id": "USER-1", "productId": "PROD-RACE0001"}
+    service.execute(dict(data), image=UploadedBytes(IMAGE))
+    before = stored_files(tmp_path)
+    # La comprobación previa no ve el producto (todavía no replicado)
+    monkeypatch.setattr(container.repo, "get_product_by_id", lambda product_id: None)
+    with pytest.raises(ValueError, match="Ya existe un producto con ese ID"):
+        service.execute(dict(data), image=UploadedBytes(IMAGE))
+    assert stored_files(tmp_path) == before
+
+
+def test_failed_write_removes_the_new_image(client, container, tmp_path, monkeypatch):
+    """Si la escritura falla se borra la imagen recién guardada y no queda ningún archivo"""
+    def fail(product, trusted_id=False):
+        raise RuntimeError("Cassandra no disponible")
+
+    monkeypatch.setattr(container.repo, "add_product", fail)
+    response = post_product(client)
+    assert response.status_code == 400
+    assert stored_files(tmp_path) == []
+
+
+class UploadedBytes:
+    """Archivo subido mínimo (.filename y .save(path)) para llamar al servicio directamente"""
+
+    def __init__(self, data, filename="papa.jpg"):
+        self.data = data
+        self.filename = filename
+
+    def save(self, path):
+        with open(path, "wb") as f:
+            f.write(self.data)
@@ -0,0 +1,79 @@
+"""
+Tests para los GET condicionales de productos y listados (ETag, 304, Cache-Control)
+"""
+import pytest
+
+import flask_interface.routes as routes
+from Infrastructure.testing import make_product
+
+
+@pytest.fixture
+def repo(repo):
+    for product_id in ("PROD-A", "PROD-B", "PROD-C"):
+        repo.add_product(make_product(product_id))
+    return repo
+
+
+def test_product_revalidates_with_304_until_it_changes(client, repo):
+    """Un If-None-Match vigente devuelve 304 sin cuerpo; tras una escritura vuelve el 200 con otro ETag"""
+    response = client.get("/products/PROD-A")
+    etag = response.headers["ETag"]
+    assert response.status_code == 200
+    assert not etag.startswith("W/")
+    assert response.headers["Cache-Control"] == f"public, max-age={routes.PRODUCT_MAX_AGE}, must-revalidate"
+    assert "Last-Modified" in response.headers
+
+    cached = client.get("/products/PROD-A", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.data == b""
+    assert cached.headers["ETag"] == etag
+
+    repo.update_image_url("PROD-A", "http://img/a.jpg")
+    changed = client.get("/products/PROD-A", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+    assert changed.json["imageUrl"] == "http://img/a.jpg"
+
+
+def test_listings_and_pages_have_content_etags(client, repo):
+    """Los listados y cada página tienen su propio ETag, que cambia al cambiar cualquiera de sus productos"""
+    listing = client.get("/products")
+    assert listing.headers["Cache-Control"] == "public, no-cache"
+    assert "Accept" in listing.headers["Vary"]
+    assert client.get("/products", headers={"If-None-Match": listing.headers["ETag"]}).status_code == 304
+
+    first = client.get("/products?limit=2")
+    second = client.get(f"/products?limit=2&page_token={first.json['nextPageToken']}")
+    assert first.headers["ETag"] != second.headers["ETag"] != listing.headers["ETag"]
+
+    by_user = client.get("/products/user/USER-1")
+    repo.update_image_url("PROD-C", "http://img/c.jpg")
+    assert client.get("/products", headers={"If-None-Match": listing.headers["ETag"]}).status_code == 200
+    assert client.get("/products/user/USER-1", headers={"If-None-Match": by_user.headers["ETag"]}).status_code == 200
+    # La primera página no contiene PROD-C
+    assert client.get("/products?limit=2", headers={"If-None-Match": first.headers["ETag"]}).status_code == 304
+
+
+def test_stream_export_and_errors_have_no_validators(client):
+    """La exportación en streaming y las respuestas de error no llevan ETag"""
+    assert "ETag" not in client.get("/products?format=ndjson").headers
+    assert "ETag" not in client.get("/products/PROD-X").headers
+
+
+def test_304_never_encodes_products(client, monkeypatch):
+    """Responder 304 a un listado o a un producto no serializa ningún producto, ni con la caché de fragmentos fría"""
+    encoded = []
+    encode = routes.serializer._encode
+
+    def counting_encode(values):
+        encoded.append(values[0])
+        return encode(values)
+
+    monkeypatch.setattr(routes.serializer, "_encode", counting_encode)
+    listing, product = client.get("/products"), client.get("/products/PROD-A")
+    assert sorted(encoded) == ["PROD-A", "PROD-A", "PROD-B", "PROD-C"]
+    encoded.clear()
+    routes.serializer._digest.cache_clear()
+    assert client.get("/products", headers={"If-None-Match": listing.headers["ETag"]}).status_code == 304
+    assert client.get("/products/PROD-A", headers={"If-None-Match": product.headers["ETag"]}).status_code == 304
+    assert encoded == []
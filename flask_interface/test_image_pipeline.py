@@ -0,0 +1,110 @@
+"""
+Tests para el pipeline de variantes de imagen (tamaños, WebP, orientación EXIF, metadatos y callback)
+"""
+import os
+
+import pytest
+
+Image = pytest.importorskip("PIL.Image")
+from PIL import UnidentifiedImageError
+
+from Infrastructure.image_pipeline import VARIANT_SIZES, ImagePipeline
+
+BASE_URL = "http://localhost/static/catalog"
+ORIENTATION = 0x0112
+GPS_INFO = 0x8825
+
+
+def write_photo(path, size=(2000, 1000), orientation=6):
+    """JPEG apaisado con orientación EXIF (6 = girar 90°), GPS y comentario, como sale de un móvil"""
+    image = Image.new("RGB", size, (200, 30, 30))
+    exif = image.getexif()
+    exif[ORIENTATION] = orientation
+    exif[0x010F] = "Fabricante"
+    exif.get_ifd(GPS_INFO)[1] = "N"
+    image.save(path, "JPEG", exif=exif.tobytes(), comment=b"finca del usuario")
+    return str(path)
+
+
+@pytest.fixture
+def received():
+    return []
+
+
+@pytest.fixture
+def pipeline(tmp_path, received):
+    pipeline = ImagePipeline(str(tmp_path), BASE_URL, on_variants=lambda product_id, variants:
+                             received.append((product_id, variants)))
+    yield pipeline
+    pipeline.shutdown()
+
+
+def variant_path(tmp_path, url):
+    assert url.startswith(BASE_URL + "/variants/")
+    return tmp_path / "variants" / url.rsplit("/", 1)[1]
+
+
+def test_variants_are_rotated_resized_webp_without_metadata(pipeline, tmp_path, received):
+    """Cada variante se gira según el EXIF, cabe en su tamaño, se guarda en WebP y no conserva metadatos"""
+    source = write_photo(tmp_path / "PROD-A.jpg")
+    with Image.open(source) as original:
+        assert original.getexif().get_ifd(GPS_INFO) and "comment" in original.info
+    variants = pipeline.submit("PROD-A", source).result(timeout=10)
+
+    assert set(variants) == set(VARIANT_SIZES)
+    for name, size in VARIANT_SIZES.items():
+        path = variant_path(tmp_path, variants[name])
+        assert path.name.startswith(f"PROD-A-{name}-") and path.suffix == ".webp"
+        with Image.open(path) as image:
+            assert image.format == "WEBP"
+            # El original es 2000x1000 con orientación 6: la variante queda vertical
+            assert image.size == (size // 2, size)
+            assert "exif" not in image.info and "icc_profile" not in image.info
+            assert not image.getexif()
+    assert received == [("PROD-A", variants)]
+
+
+def test_small_original_is_not_upscaled(pipeline, tmp_path):
+    source = write_photo(tmp_path / "PROD-B.jpg", size=(100, 50), orientation=1)
+    variants = pipeline.submit("PROD-B", source).result(timeout=10)
+    for url in variants.values():
+        with Image.open(variant_path(tmp_path, url)) as image:
+            assert image.size == (100, 50)
+
+
+def test_identical_content_gets_the_same_name(pipeline, tmp_path):
+    """El nombre lleva el hash del contenido codificado, así que regenerar no cambia las URLs"""
+    source = write_photo(tmp_path / "PROD-C.jpg")
+    first = pipeline.submit("PROD-C", source).result(timeout=10)
+    assert pipeline.submit("PROD-C", source).result(timeout=10) == first
+    assert len(os.listdir(tmp_path / "variants")) == len(VARIANT_SIZES)
+
+
+def test_jpeg_format_drops_alpha(tmp_path):
+    source = tmp_path / "PROD-D.png"
+    Image.new("RGBA", (300, 300), (0, 0, 0, 0)).save(source)
+    pipeline = ImagePipeline(str(tmp_path), BASE_URL + "/", image_format="jpeg")
+    try:
+        variants = pipeline.submit("PROD-D", str(source)).result(timeout=10)
+    finally:
+        pipeline.shutdown()
+    with Image.open(variant_path(tmp_path, variants["thumbnail"])) as image:
+        assert image.format == "JPEG" and image.mode == "RGB" and image.size == (160, 160)
+
+
+def test_invalid_image_fails_the_future_without_callback(pipeline, tmp_path, received, caplog):
+    """Un archivo que no es imagen hace fallar el Future, se registra y no se llama al callback"""
+    source = tmp_path / "PROD-E.jpg"
+    source.write_bytes(b"no es una imagen")
+    future = pipeline.submit("PROD-E", str(source))
+    with pytest.raises(UnidentifiedImageError):
+        future.result(timeout=10)
+    assert received == []
+    assert "Image pipeline failed for product PROD-E" in caplog.text
+
+
+def test_unknown_format_and_disabled_pipeline(tmp_path, monkeypatch):
+    with pytest.raises(ValueError, match="IMAGE_VARIANT_FORMAT"):
+        ImagePipeline(str(tmp_path), BASE_URL, image_format="GIF")
+    monkeypatch.setenv("IMAGE_PIPELINE_ENABLED", "false")
+    assert ImagePipeline.from_env(str(tmp_path), BASE_URL) is None
@@ -0,0 +1,66 @@
+"""
+Tests para el servicio de imágenes del catálogo (ETag, 304, caché immutable, rangos)
+"""
+import gzip
+
+import pytest
+from flask import Flask
+
+import flask_interface.image_routes as image_routes
+
+IMAGE_BYTES = bytes(range(256)) * 40
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.setattr(image_routes, "CATALOG_DIR", str(tmp_path))
+    (tmp_path / "PROD-A1B2C3D4-0123456789ab.jpg").write_bytes(IMAGE_BYTES)
+    (tmp_path / "papa.jpg").write_bytes(IMAGE_BYTES)
+    app = Flask(__name__, static_folder=None)
+    app.register_blueprint(image_routes.images_bp)
+    return app.test_client()
+
+
+def test_hashed_image_is_immutable_and_revalidates_with_304(client):
+    """Los nombres con hash se cachean un año y un If-None-Match válido devuelve 304 sin cuerpo"""
+    response = client.get("/static/catalog/PROD-A1B2C3D4-0123456789ab.jpg")
+    assert response.status_code == 200
+    assert response.data == IMAGE_BYTES
+    assert "immutable" in response.headers["Cache-Control"]
+    assert response.headers["ETag"] == '"0123456789ab"'
+
+    cached = client.get("/static/catalog/PROD-A1B2C3D4-0123456789ab.jpg",
+                        headers={"If-None-Match": response.headers["ETag"]})
+    assert cached.status_code == 304
+    assert cached.data == b""
+
+
+def test_legacy_image_gets_strong_content_etag(client):
+    """Las imágenes sin hash usan el hash del contenido como ETag y un max-age corto"""
+    response = client.get("/static/catalog/papa.jpg")
+    assert response.status_code == 200
+    assert not response.headers["ETag"].startswith("W/")
+    assert "immutable" not in response.headers["Cache-Control"]
+    assert client.get("/static/catalog/papa.jpg",
+                      headers={"If-None-Match": response.headers["ETag"]}).status_code == 304
+
+
+def test_range_request_returns_partial_content(client):
+    """Las peticiones con Range reciben solo el fragmento pedido"""
+    response = client.get("/static/catalog/papa.jpg", headers={"Range": "bytes=0-99"})
+    assert response.status_code == 206
+    assert response.data == IMAGE_BYTES[:100]
+
+
+def test_precompressed_file_is_served_when_accepted(client, tmp_path):
+    """Si existe una versión .gz y el cliente acepta gzip se sirve con Content-Encoding"""
+    (tmp_path / "papa.jpg.gz").write_bytes(gzip.compress(IMAGE_BYTES))
+    response = client.get("/static/catalog/papa.jpg", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.headers["Content-Type"] == "image/jpeg"
+    assert gzip.decompress(response.data) == IMAGE_BYTES
+
+
+def test_paths_outside_the_catalog_are_not_served(client):
+    """Las rutas que salen del directorio del catálogo responden 404"""
+    assert client.get("/static/catalog/../app.py").status_code == 404
@@ -0,0 +1,52 @@
+"""
+Tests para el serializador de productos a bytes JSON y su caché de fragmentos
+"""
+import json
+
+from domain.entidades.product_page import ProductPage
+from flask_interface.product_serializer import ProductSerializer
+from Infrastructure.testing import make_product
+
+
+def test_fragment_matches_to_dictionary():
+    """El fragmento equivale a toDictionary, incluidos NaN, fechas y variantes de imagen"""
+    product = make_product("PROD-A1B2C3D4")
+    product.originalPrice = float("nan")
+    product.imageVariants = {"thumbnail": "t.webp", "card": "c.webp"}
+    serializer = ProductSerializer()
+    assert json.loads(serializer.fragment(product)) == product.toDictionary()
+
+
+def test_list_and_page_are_valid_json():
+    serializer = ProductSerializer()
+    products = [make_product(f"PROD-{i}") for i in range(3)]
+    assert json.loads(serializer.list_bytes(products)) == [p.toDictionary() for p in products]
+    assert json.loads(serializer.list_bytes([])) == []
+    page = ProductPage(items=products[:2], nextPageToken="abc")
+    assert json.loads(serializer.page_bytes(page)) == page.toDictionary()
+
+
+def test_fragment_cache_reuses_unchanged_products_only():
+    """Un producto sin cambios reutiliza el fragmento; al cambiar un campo se serializa de nuevo"""
+    serializer = ProductSerializer(cache_size=100)
+    product = make_product("PROD-A1B2C3D4")
+    first = serializer.fragment(product)
+    assert serializer.fragment(make_product("PROD-A1B2C3D4")) is first
+    product.price = 999.0
+    assert json.loads(serializer.fragment(product))["price"] == 999.0
+    assert serializer.cache_info().hits == 1
+
+
+def test_etags_follow_the_serialized_content():
+    """Productos iguales comparten ETag; cualquier cambio de campo, de orden o de token lo cambia"""
+    serializer = ProductSerializer(cache_size=100)
+    first, second = make_product("PROD-1"), make_product("PROD-2")
+    assert serializer.etag(first) == serializer.etag(make_product("PROD-1"))
+    assert ProductSerializer(cache_size=0).etag(first) == serializer.etag(first)
+    changed = make_product("PROD-1")
+    changed.imageVariants = {"card": "c.webp"}
+    assert serializer.etag(changed) != serializer.etag(first)
+
+    assert serializer.list_etag([first, second]) != serializer.list_etag([second, first])
+    assert serializer.page_etag(ProductPage(items=[first], nextPageToken="a")) != serializer.page_etag(
+        ProductPage(items=[first], nextPageToken=None))
@@ -0,0 +1,62 @@
+"""
+Tests para la validación de usuarios al crear productos (individual y masiva) contra el stub del servicio de usuarios
+"""
+import io
+import os
+
+import pytest
+
+from Infrastructure.users_stub_server import UsersStubServer
+
+
+@pytest.fixture
+def stub():
+    with UsersStubServer(users=["USER-1"]) as server:
+        yield server
+
+
+@pytest.fixture
+def container_env(container_env, stub):
+    return {**container_env, "USERS_VALIDATION_ENABLED": "true", "USERS_SERVICE_URL": stub.url}
+
+
+def fields(user_id):
+    return {"name": "Papa sabanera", "category": "vegetales", "price": 2500.0, "unit": "kg", "stock": 10,
+            "origin": "Boyacá", "description": "Papa fresca", "user_id": user_id}
+
+
+def post_product(client, user_id):
+    form = {**fields(user_id), "image": (io.BytesIO(b"\xff\xd8\xff\xe0imagen"), "papa.jpg")}
+    return client.post("/products", data=form, content_type="multipart/form-data")
+
+
+def test_unknown_user_is_rejected_before_saving_the_image(client, container, tmp_path):
+    """Un usuario inexistente responde 400 sin guardar imagen ni producto"""
+    response = post_product(client, "USER-X")
+    assert response.status_code == 400
+    assert response.json["error"] == "El usuario no existe"
+    assert os.listdir(tmp_path) == []
+    assert container.repo.get_all_products() == []
+    assert post_product(client, "USER-1").status_code == 201
+
+
+def test_bulk_rejects_rows_of_unknown_users(client, container, stub):
+    """Las filas de usuarios inexistentes fallan solas y cada usuario distinto se consulta una vez"""
+    rows = [fields("USER-1"), fields("USER-X"), fields("USER-1"), fields("USER-X")]
+    response = client.post("/products/bulk", json=rows)
+    assert response.status_code == 207
+    assert [r["status"] for r in response.json["results"]] == ["created", "error", "created", "error"]
+    assert response.json["results"][1]["error"] == "El usuario no existe"
+    assert len(container.repo.get_all_products()) == 2
+    assert stub.requests == 2
+
+
+def test_users_service_failure_is_503(client, container, stub):
+    """Si el servicio de usuarios falla, la creación individual y la masiva responden 503 sin escribir"""
+    stub.failing = True
+    single = post_product(client, "USER-1")
+    assert single.status_code == 503
+    assert single.json["error"] == "Servicio de usuarios no disponible"
+    bulk = client.post("/products/bulk", json=[fields("USER-1")])
+    assert bulk.status_code == 503
+    assert container.repo.get_all_products() == []
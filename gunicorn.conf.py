@@ -0,0 +1,34 @@
+"""
+Configuración de gunicorn para el servicio de productos
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+Workers y hilos se configuran por entorno (WEB_CONCURRENCY, GUNICORN_THREADS).
+La sesión de Cassandra se crea en cada worker después del fork: post_fork olvida
+cualquier conexión heredada del master y worker_exit la cierra ordenadamente.
+"""
+import multiprocessing
+import os
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:5000")
+workers = int(os.getenv("WEB_CONCURRENCY", str(multiprocessing.cpu_count() * 2 + 1)))
+threads = int(os.getenv("GUNICORN_THREADS", "4"))
+# Con más de un hilo por worker se usa gthread (peticiones concurrentes por proceso)
+worker_class = "gthread" if threads > 1 else "sync"
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "30"))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", "5"))
+# La app se importa una vez en el master (sin conexiones abiertas) y se comparte por fork
+preload_app = os.getenv("GUNICORN_PRELOAD", "true").lower() == "true"
+accesslog = os.getenv("GUNICORN_ACCESS_LOG", "-")
+
+
+def post_fork(server, worker):
+    from flask_interface.dependencies import reset_container
+    reset_container()
+    server.log.info(f"Worker {worker.pid}: sesión de Cassandra pendiente de crear en este proceso")
+
+
+def worker_exit(server, worker):
+    from flask_interface.dependencies import close_container
+    close_container()
@@ -1,26 +1,77 @@
 import time
+from contextlib import contextmanager
 from functools import wraps
 from flask import request
+from werkzeug.exceptions import HTTPException
 from observability.metrics import REQUEST_COUNT, REQUEST_LATENCY, ERROR_COUNT
+from observability.tracing import SERVER, extract, start_as_current
+
+def response_status(response) -> int:
+    """Código de estado de lo que devuelve una vista: Response, (body, status[, headers]) o body"""
+    if isinstance(response, tuple):
+        if len(response) >= 2 and isinstance(response[1], int):
+            return response[1]
+        response = response[0]
+    return getattr(response, "status_code", 200)
+
+def _record(endpoint_name, method, status_code, start_time, span):
+    REQUEST_LATENCY.labels(endpoint=endpoint_name, method=method, status=str(status_code)).observe(
+        time.perf_counter() - start_time
+    )
+    if status_code >= 400:
+        ERROR_COUNT.labels(endpoint=endpoint_name).inc()
+    span.set_attribute("http.status_code", status_code)
+    if status_code >= 500:
+        span.set_status("ERROR")
+
+def _server_span(endpoint_name, req):
+    # Span SERVER de la petición, hijo del traceparent entrante si lo hay
+    rule = req.url_rule.rule if req.url_rule is not None else req.path
+    return start_as_current(
+        endpoint_name, SERVER, {"http.method": req.method, "http.route": rule},
+        parent=extract(req.headers), record_exceptions=False,
+    )
+
+@contextmanager
+def _monitored(endpoint_name, req):
+    """
+    Cuenta, cronometra y traza una petición. Entrega done(response), que registra
+    el estado de la respuesta y la devuelve; las excepciones se registran aquí.
+    """
+    start_time = time.perf_counter()
+    method = req.method
+    REQUEST_COUNT.labels(method=method, endpoint=endpoint_name).inc()
+    with _server_span(endpoint_name, req) as span:
+        def done(response):
+            _record(endpoint_name, method, response_status(response), start_time, span)
+            return response
+        try:
+            yield done
+        except HTTPException as e:
+            # abort(...) dentro de la vista
+            _record(endpoint_name, method, e.code or 500, start_time, span)
+            raise
+        except Exception as e:
+            span.record_exception(e)
+            _record(endpoint_name, method, 500, start_time, span)
+            raise
 
 def monitor_endpoint(endpoint_name):
     def decorator(func):
         @wraps(func)
         def wrapper(*args, **kwargs):
-            start_time = time.time()
-            REQUEST_COUNT.labels(method=request.method, endpoint=endpoint_name).inc()
-            try:
-                response = func(*args, **kwargs)
-                REQUEST_LATENCY.observe(time.time() - start_time)
-                status_code = 200
-                if isinstance(response, tuple) and len(response) >= 2:
-                    status_code = response[1]
-                if status_code >= 400:
-                    ERROR_COUNT.labels(endpoint=endpoint_name).inc()
-                return response
-            except Exception as e:
-                ERROR_COUNT.labels(endpoint=endpoint_name).inc()
-                REQUEST_LATENCY.observe(time.time() - start_time)
-                raise e
+            with _monitored(endpoint_name, request) as done:
+                return done(func(*args, **kwargs))
+        return wrapper
+    return decorator
+
+def monitor_async_endpoint(endpoint_name):
+    """Versión de monitor_endpoint para las vistas async del modo ASGI (Quart)"""
+    def decorator(func):
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            from quart import request as async_request
+            with _monitored(endpoint_name, async_request) as done:
+                return done(await func(*args, **kwargs))
         return wrapper
-    return decorator
\ No newline at end of file
+    return decorator
@@ -1,5 +1,21 @@
 from prometheus_client import Counter, Histogram
 
+# Etapas del camino caliente: de 100 µs (mapeo de una página pequeña) a varios segundos
+STAGE_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
 REQUEST_COUNT = Counter('productos_requests_total', 'Total requests', ['method', 'endpoint'])
-REQUEST_LATENCY = Histogram('productos_request_duration_seconds', 'Request latency')
-ERROR_COUNT = Counter('productos_errors_total', 'Total errors', ['endpoint'])
\ No newline at end of file
+REQUEST_LATENCY = Histogram('productos_request_duration_seconds', 'Request latency', ['endpoint', 'method', 'status'])
+ERROR_COUNT = Counter('productos_errors_total', 'Total errors', ['endpoint'])
+
+# cassandra_query, row_mapping, entity_validation, serialization, image_save
+STAGE_LATENCY = Histogram('productos_stage_duration_seconds', 'Time spent per request stage', ['stage'], buckets=STAGE_BUCKETS)
+
+CASSANDRA_REQUESTS = Counter('productos_cassandra_requests_total', 'Cassandra driver requests', ['statement', 'outcome'])
+CASSANDRA_REQUEST_LATENCY = Histogram('productos_cassandra_request_duration_seconds', 'Cassandra driver request latency (first page)', ['statement'], buckets=STAGE_BUCKETS)
+CASSANDRA_RETRIES = Counter('productos_cassandra_retries_total', 'Cassandra requests retried by the retry policy', ['statement'])
+
+CACHE_HITS = Counter('productos_cache_hits_total', 'Cache hits', ['cache'])
+CACHE_MISSES = Counter('productos_cache_misses_total', 'Cache misses', ['cache'])
+CACHE_EVICTIONS = Counter('productos_cache_evictions_total', 'Cache entries evicted by LRU capacity', ['cache'])
+
+CIRCUIT_OPENED = Counter('productos_circuit_opened_total', 'Times a circuit breaker opened', ['dependency'])
@@ -0,0 +1,50 @@
+"""
+Medición de etapas del camino caliente de una petición
+
+    with track_stage("serialization"):
+        body = serializer.list_bytes(products)
+
+Las duraciones van a productos_stage_duration_seconds{stage=...}. Las etapas
+que se repiten por fila (validación de entidades en la row factory) acumulan
+su tiempo y lo registran una vez con observe_stage.
+"""
+from time import perf_counter
+
+from observability.metrics import STAGE_LATENCY
+
+CASSANDRA_QUERY = "cassandra_query"
+ROW_MAPPING = "row_mapping"
+ENTITY_VALIDATION = "entity_validation"
+SERIALIZATION = "serialization"
+IMAGE_SAVE = "image_save"
+
+_children = {}
+
+
+def _stage(stage: str):
+    # labels() toma un lock en cada llamada; el hijo de cada etapa se reutiliza
+    child = _children.get(stage)
+    if child is None:
+        child = _children[stage] = STAGE_LATENCY.labels(stage=stage)
+    return child
+
+
+def observe_stage(stage: str, seconds: float) -> None:
+    _stage(stage).observe(seconds)
+
+
+class track_stage:
+    """Context manager que registra la duración del bloque en la etapa indicada"""
+
+    __slots__ = ("_histogram", "_start")
+
+    def __init__(self, stage: str):
+        self._histogram = _stage(stage)
+
+    def __enter__(self):
+        self._start = perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._histogram.observe(perf_counter() - self._start)
+        return False
@@ -0,0 +1,77 @@
+"""
+Tests para monitor_endpoint: histograma de latencia por endpoint, método y estado
+(no necesitan el servidor en ejecución)
+"""
+import asyncio
+
+import pytest
+from flask import Flask, Response, abort
+from prometheus_client import REGISTRY
+
+from observability.MetricsDecorator import monitor_async_endpoint, monitor_endpoint, response_status
+
+
+def latency_count(endpoint, status):
+    labels = {"endpoint": endpoint, "method": "GET", "status": status}
+    return REGISTRY.get_sample_value("productos_request_duration_seconds_count", labels) or 0.0
+
+
+def test_response_status_of_view_return_values():
+    assert response_status(({"error": "x"}, 404)) == 404
+    assert response_status((Response(status=201), {"X-Test": "1"})) == 201
+    assert response_status(Response(status=503)) == 503
+    assert response_status({"ok": True}) == 200
+
+
+def test_status_label_includes_response_objects_and_aborts():
+    app = Flask(__name__)
+
+    @app.route("/created")
+    @monitor_endpoint("test_decorator_created")
+    def created():
+        return Response(b"{}", status=201, mimetype="application/json")
+
+    @app.route("/missing")
+    @monitor_endpoint("test_decorator_missing")
+    def missing():
+        abort(404)
+
+    client = app.test_client()
+    assert client.get("/created").status_code == 201
+    assert client.get("/missing").status_code == 404
+    assert latency_count("test_decorator_created", "201") == 1
+    assert latency_count("test_decorator_missing", "404") == 1
+    errors = REGISTRY.get_sample_value("productos_errors_total", {"endpoint": "test_decorator_missing"})
+    assert errors == 1
+
+
+def test_async_views_are_recorded_like_sync_ones():
+    """monitor_async_endpoint registra el estado devuelto, los abort y las excepciones igual que la versión sync"""
+    quart = pytest.importorskip("quart")
+    app = quart.Quart(__name__)
+
+    @app.route("/created")
+    @monitor_async_endpoint("test_async_created")
+    async def created():
+        return {"ok": True}, 201
+
+    @app.route("/missing")
+    @monitor_async_endpoint("test_async_missing")
+    async def missing():
+        quart.abort(404)
+
+    @app.route("/broken")
+    @monitor_async_endpoint("test_async_broken")
+    async def broken():
+        raise RuntimeError("fallo")
+
+    async def scenario():
+        client = app.test_client()
+        return [(await client.get(path)).status_code for path in ("/created", "/missing", "/broken")]
+
+    assert asyncio.run(scenario()) == [201, 404, 500]
+    assert latency_count("test_async_created", "201") == 1
+    assert latency_count("test_async_missing", "404") == 1
+    assert latency_count("test_async_broken", "500") == 1
+    errors = REGISTRY.get_sample_value("productos_errors_total", {"endpoint": "test_async_broken"})
+    assert errors == 1
@@ -0,0 +1,90 @@
+"""
+Tests para las trazas: traceparent, muestreo y jerarquía de spans
+(no necesitan el servidor en ejecución)
+"""
+import pytest
+from flask import Flask
+
+from observability.MetricsDecorator import monitor_endpoint
+from observability.tracing import (
+    CLIENT, SERVER, RatioSampler, SpanContext, Tracer, inject, parse_traceparent, set_tracer,
+    start_as_current, traced,
+)
+
+REMOTE = "00-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-01"
+
+
+class CollectingProcessor:
+    """Guarda los spans terminados en memoria en lugar de exportarlos"""
+
+    def __init__(self):
+        self.spans = []
+
+    def on_end(self, span):
+        self.spans.append(span)
+
+    def shutdown(self):
+        pass
+
+
+@pytest.fixture
+def spans():
+    processor = CollectingProcessor()
+    set_tracer(Tracer(RatioSampler(1.0), processor))
+    yield processor.spans
+    set_tracer(None)
+
+
+def test_traceparent_parsing():
+    assert parse_traceparent(REMOTE) == SpanContext("4bf92f3577b34da6a3ce929d0e0e4736", "00f067aa0ba902b7", True)
+    for invalid in (None, "", "00-xyz-00f067aa0ba902b7-01", "00-" + "0" * 32 + "-00f067aa0ba902b7-01"):
+        assert parse_traceparent(invalid) is None
+
+
+def test_sampler_follows_parent_and_ratio():
+    assert RatioSampler(0.0).should_sample(SpanContext("a" * 32, "b" * 16, True), "a" * 32) is True
+    assert RatioSampler(1.0).should_sample(SpanContext("a" * 32, "b" * 16, False), "a" * 32) is False
+    assert RatioSampler(0.0).should_sample(None, "f" * 32) is False
+    assert RatioSampler(1.0).should_sample(None, "f" * 32) is True
+    with pytest.raises(ValueError):
+        RatioSampler(1.5)
+
+
+def test_nested_spans_and_header_injection(spans):
+    @traced()
+    def load():
+        with start_as_current("GET /users/getById", CLIENT):
+            return inject({})
+
+    @traced()
+    def produce():
+        yield from range(3)
+
+    with start_as_current("request", SERVER) as root:
+        headers = load()
+        items = produce()
+    assert list(items) == [0, 1, 2]
+
+    by_name = {span.name: span for span in spans}
+    client, repo = by_name["GET /users/getById"], by_name["test_nested_spans_and_header_injection.<locals>.load"]
+    assert client.parent_id == repo.span_id and repo.parent_id == root.span_id
+    assert headers["traceparent"] == client.traceparent()
+    # El generador se consume fuera del bloque pero conserva su padre
+    generator = by_name["test_nested_spans_and_header_injection.<locals>.produce"]
+    assert generator.parent_id == root.span_id and generator.attributes["items"] == 3
+
+
+def test_route_span_continues_incoming_trace(spans):
+    app = Flask(__name__)
+
+    @app.route("/products/<product_id>")
+    @monitor_endpoint("test_tracing_route")
+    def get_product(product_id):
+        return {"error": "Producto no encontrado"}, 404
+
+    app.test_client().get("/products/PROD-1", headers={"traceparent": REMOTE})
+    span, = spans
+    assert span.kind == SERVER and span.name == "test_tracing_route"
+    assert span.trace_id == "4bf92f3577b34da6a3ce929d0e0e4736" and span.parent_id == "00f067aa0ba902b7"
+    assert span.attributes["http.route"] == "/products/<product_id>"
+    assert span.attributes["http.status_code"] == 404 and span.status == "UNSET"
@@ -0,0 +1,585 @@
+"""
+Trazas distribuidas opcionales (modelo de spans compatible con OpenTelemetry)
+
+Cada petición abre un span SERVER (monitor_endpoint / monitor_async_endpoint),
+y dentro de él se crean spans para los métodos del repositorio (@traced), cada
+ejecución CQL (Infrastructure/cassandra_tracing.py) y cada llamada HTTP saliente
+(servicio de usuarios). El contexto viaja en la cabecera W3C `traceparent`: se
+extrae de la petición entrante y se inyecta en las salientes, así que las trazas
+se unen con las de otros servicios instrumentados con OpenTelemetry.
+
+Configuración (variables de entorno):
+- TRACING_ENABLED=false: desactivado, cada span es un no-op compartido
+- TRACING_SAMPLE_RATIO=0.1: fracción de trazas raíz muestreadas; si la petición
+  trae traceparent se respeta la decisión del llamador (parent-based)
+- TRACING_EXPORTER=file|otlp: JSON lines en TRACING_FILE_PATH o OTLP/HTTP (JSON)
+  a TRACING_OTLP_ENDPOINT (colector de OpenTelemetry, puerto 4318)
+- TRACING_SERVICE_NAME=productos
+
+Los spans terminados se exportan por lotes desde un hilo (BatchSpanProcessor);
+si la cola se llena se descartan en lugar de frenar las peticiones.
+"""
+import atexit
+import contextvars
+import inspect
+import json
+import logging
+import os
+import queue
+import random
+import threading
+import time
+from functools import wraps
+from typing import Dict, List, NamedTuple, Optional
+
+logger = logging.getLogger(__name__)
+
+TRACEPARENT = "traceparent"
+
+INTERNAL = "INTERNAL"
+SERVER = "SERVER"
+CLIENT = "CLIENT"
+# SpanKind y StatusCode de OTLP
+_OTLP_KINDS = {INTERNAL: 1, SERVER: 2, CLIENT: 3}
+_OTLP_STATUS = {"UNSET": 0, "OK": 1, "ERROR": 2}
+
+
+class SpanContext(NamedTuple):
+    """Contexto de un span remoto (cabecera traceparent)"""
+    trace_id: str
+    span_id: str
+    sampled: bool
+
+
+_current_span = contextvars.ContextVar("productos_current_span", default=None)
+
+
+class Span:
+    """Span en curso. Sin muestrear solo conserva los IDs para propagarlos"""
+
+    __slots__ = ("trace_id", "span_id", "parent_id", "name", "kind", "start_ns", "end_ns",
+                 "attributes", "status", "status_message", "sampled", "_processor")
+
+    def __init__(self, name: str, kind: str, trace_id: str, span_id: str, parent_id: Optional[str],
+                 sampled: bool, processor=None, attributes: Optional[Dict] = None):
+        self.name = name
+        self.kind = kind
+        self.trace_id = trace_id
+        self.span_id = span_id
+        self.parent_id = parent_id
+        self.sampled = sampled
+        self._processor = processor
+        self.attributes = dict(attributes) if sampled and attributes else {}
+        self.status = "UNSET"
+        self.status_message = None
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+
+    def set_attribute(self, key: str, value) -> None:
+        if self.sampled:
+            self.attributes[key] = value
+
+    def set_status(self, status: str, message: Optional[str] = None) -> None:
+        self.status = status
+        self.status_message = message
+
+    def record_exception(self, exc: BaseException) -> None:
+        self.set_attribute("exception.type", type(exc).__name__)
+        self.set_attribute("exception.message", str(exc))
+        self.set_status("ERROR", str(exc))
+
+    def end(self) -> None:
+        if self.end_ns is not None:
+            return
+        self.end_ns = time.time_ns()
+        if self.sampled and self._processor is not None:
+            self._processor.on_end(self)
+
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-{'01' if self.sampled else '00'}"
+
+    def to_dict(self) -> Dict:
+        """Span terminado en formato plano (exportador de archivo)"""
+        return {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "parentSpanId": self.parent_id,
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": self.start_ns,
+            "endTimeUnixNano": self.end_ns,
+            "durationMs": round((self.end_ns - self.start_ns) / 1e6, 3),
+            "attributes": self.attributes,
+            "status": {"code": self.status, "message": self.status_message},
+        }
+
+
+class _NoopSpan:
+    """Span compartido cuando las trazas están desactivadas"""
+
+    sampled = False
+    trace_id = span_id = parent_id = None
+
+    def set_attribute(self, key, value):
+        pass
+
+    def set_status(self, status, message=None):
+        pass
+
+    def record_exception(self, exc):
+        pass
+
+    def end(self):
+        pass
+
+    def traceparent(self):
+        return None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+def parse_traceparent(value: Optional[str]) -> Optional[SpanContext]:
+    """SpanContext de una cabecera traceparent (versión 00); None si falta o no es válida"""
+    if not value:
+        return None
+    parts = value.strip().split("-")
+    if len(parts) != 4 or len(parts[1]) != 32 or len(parts[2]) != 16 or len(parts[3]) != 2:
+        return None
+    try:
+        int(parts[1], 16), int(parts[2], 16)
+        flags = int(parts[3], 16)
+    except ValueError:
+        return None
+    if parts[1] == "0" * 32 or parts[2] == "0" * 16:
+        return None
+    return SpanContext(parts[1], parts[2], bool(flags & 1))
+
+
+class RatioSampler:
+    """
+    Parent-based: un hijo sigue la decisión del padre. Las raíces se muestrean
+    si los 64 bits bajos del trace_id caen bajo ratio (mismo criterio que
+    TraceIdRatioBased de OpenTelemetry, así que es determinista por traza).
+    """
+
+    def __init__(self, ratio: float):
+        if not 0.0 <= ratio <= 1.0:
+            raise ValueError(f"TRACING_SAMPLE_RATIO must be between 0 and 1, got {ratio}")
+        self.ratio = ratio
+        self._bound = int(ratio * (1 << 64))
+
+    def should_sample(self, parent, trace_id: str) -> bool:
+        if parent is not None:
+            return parent.sampled
+        return int(trace_id[16:], 16) < self._bound
+
+
+class FileSpanExporter:
+    """Un span por línea (JSON) en un archivo local"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def export(self, spans: List[Span]) -> None:
+        lines = "".join(json.dumps(span.to_dict(), default=str) + "\n" for span in spans)
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(lines)
+
+    def shutdown(self) -> None:
+        pass
+
+
+def _otlp_value(value) -> Dict:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _otlp_attributes(attributes: Dict) -> List[Dict]:
+    return [{"key": key, "value": _otlp_value(value)} for key, value in attributes.items()]
+
+
+class OTLPHttpSpanExporter:
+    """Exporta a un colector OpenTelemetry por OTLP/HTTP con cuerpo JSON (/v1/traces)"""
+
+    def __init__(self, endpoint: str, service_name: str, timeout: float = 5.0):
+        import requests
+
+        self.endpoint = endpoint
+        self.timeout = timeout
+        self._session = requests.Session()
+        self._resource = {"attributes": _otlp_attributes({"service.name": service_name})}
+
+    def export(self, spans: List[Span]) -> None:
+        body = {"resourceSpans": [{
+            "resource": self._resource,
+            "scopeSpans": [{"scope": {"name": "productos.tracing"}, "spans": [self._span(s) for s in spans]}],
+        }]}
+        response = self._session.post(self.endpoint, json=body, timeout=self.timeout)
+        if response.status_code >= 400:
+            logger.warning(f"OTLP collector answered {response.status_code} for {len(spans)} spans")
+
+    @staticmethod
+    def _span(span: Span) -> Dict:
+        data = {
+            "traceId": span.trace_id,
+            "spanId": span.span_id,
+            "name": span.name,
+            "kind": _OTLP_KINDS[span.kind],
+            "startTimeUnixNano": str(span.start_ns),
+            "endTimeUnixNano": str(span.end_ns),
+            "attributes": _otlp_attributes(span.attributes),
+            "status": {"code": _OTLP_STATUS[span.status]},
+        }
+        if span.parent_id:
+            data["parentSpanId"] = span.parent_id
+        if span.status_message:
+            data["status"]["message"] = span.status_message
+        return data
+
+    def shutdown(self) -> None:
+        self._session.close()
+
+
+class BatchSpanProcessor:
+    """
+    Cola acotada + hilo exportador: las peticiones solo encolan el span terminado.
+    Exporta cada batch_size spans o cada interval segundos.
+    """
+
+    def __init__(self, exporter, max_queue: int = 2048, batch_size: int = 256, interval: float = 2.0):
+        self.exporter = exporter
+        self.batch_size = batch_size
+        self.interval = interval
+        self.dropped = 0
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="span-exporter", daemon=True)
+        self._thread.start()
+
+    def on_end(self, span: Span) -> None:
+        try:
+            self._queue.put_nowait(span)
+        except queue.Full:
+            if self.dropped == 0:
+                logger.warning("Span export queue is full: dropping spans")
+            self.dropped += 1
+
+    def _drain(self) -> List[Span]:
+        batch = []
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _export(self, batch: List[Span]) -> None:
+        try:
+            self.exporter.export(batch)
+        except Exception as e:
+            logger.warning(f"Span export failed ({len(batch)} spans): {str(e)}")
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                first = self._queue.get(timeout=self.interval)
+            except queue.Empty:
+                continue
+            self._export([first] + self._drain())
+        self.flush()
+
+    def flush(self) -> None:
+        batch = self._drain()
+        while batch:
+            self._export(batch)
+            batch = self._drain()
+
+    def shutdown(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        self._thread.join(timeout)
+        self.flush()
+        self.exporter.shutdown()
+
+
+class Tracer:
+    """
+    Crea spans y mantiene el span actual en una ContextVar, válida tanto entre
+    hilos (cada petición WSGI) como entre tareas de asyncio (modo ASGI).
+    """
+
+    enabled = True
+
+    def __init__(self, sampler: RatioSampler, processor=None, rng: Optional[random.Random] = None):
+        self.sampler = sampler
+        self.processor = processor
+        self.pid = os.getpid()
+        self._rng = rng or random.Random()
+
+    def start_span(self, name: str, kind: str = INTERNAL, attributes: Optional[Dict] = None,
+                   parent=None) -> Span:
+        """Span sin activar; parent por defecto es el span actual (Span o SpanContext)"""
+        if parent is None:
+            parent = _current_span.get()
+        if parent is not None:
+            trace_id, parent_id = parent.trace_id, parent.span_id
+        else:
+            trace_id, parent_id = f"{self._rng.getrandbits(128):032x}", None
+        sampled = self.sampler.should_sample(parent, trace_id)
+        span_id = f"{self._rng.getrandbits(64):016x}"
+        return Span(name, kind, trace_id, span_id, parent_id, sampled, self.processor, attributes)
+
+    def span(self, name: str, kind: str = INTERNAL, attributes: Optional[Dict] = None,
+             parent=None, record_exceptions: bool = True) -> "_ActiveSpan":
+        """Context manager: span actual durante el bloque, terminado al salir"""
+        return _ActiveSpan(self.start_span(name, kind, attributes, parent), record_exceptions)
+
+    def shutdown(self) -> None:
+        if self.processor is not None:
+            self.processor.shutdown()
+
+
+class _ActiveSpan:
+    __slots__ = ("span", "record_exceptions", "_token")
+
+    def __init__(self, span: Span, record_exceptions: bool):
+        self.span = span
+        self.record_exceptions = record_exceptions
+
+    def __enter__(self) -> Span:
+        self._token = _current_span.set(self.span)
+        return self.span
+
+    def __exit__(self, exc_type, exc, tb):
+        _current_span.reset(self._token)
+        if exc is not None and self.record_exceptions:
+            self.span.record_exception(exc)
+        self.span.end()
+        return False
+
+
+class _NoopTracer:
+    enabled = False
+    pid = None
+
+    def start_span(self, name, kind=INTERNAL, attributes=None, parent=None):
+        return NOOP_SPAN
+
+    def span(self, name, kind=INTERNAL, attributes=None, parent=None, record_exceptions=True):
+        return NOOP_SPAN
+
+    def shutdown(self):
+        pass
+
+
+NOOP_TRACER = _NoopTracer()
+
+
+def tracing_enabled() -> bool:
+    return os.getenv("TRACING_ENABLED", "false").lower() == "true"
+
+
+def tracer_from_env():
+    """Tracer configurado por TRACING_*, o NOOP_TRACER si TRACING_ENABLED no es true"""
+    if not tracing_enabled():
+        return NOOP_TRACER
+    service_name = os.getenv("TRACING_SERVICE_NAME", "productos")
+    exporter_name = os.getenv("TRACING_EXPORTER", "file").lower()
+    if exporter_name == "otlp":
+        exporter = OTLPHttpSpanExporter(os.getenv("TRACING_OTLP_ENDPOINT", "http://localhost:4318/v1/traces"), service_name)
+    elif exporter_name == "file":
+        exporter = FileSpanExporter(os.getenv("TRACING_FILE_PATH", "traces.jsonl"))
+    else:
+        raise ValueError(f"TRACING_EXPORTER must be 'file' or 'otlp', got '{exporter_name}'")
+    sampler = RatioSampler(float(os.getenv("TRACING_SAMPLE_RATIO", "0.1")))
+    tracer = Tracer(sampler, BatchSpanProcessor(exporter))
+    # Servidor de desarrollo; bajo gunicorn lo hace worker_exit (close_container)
+    atexit.register(tracer.shutdown)
+    return tracer
+
+
+_tracer = None
+_lock = threading.Lock()
+
+
+def get_tracer():
+    """Tracer del proceso actual (el hilo exportador no sobrevive a un fork)"""
+    global _tracer
+    tracer = _tracer
+    if tracer is None or (tracer.enabled and tracer.pid != os.getpid()):
+        with _lock:
+            if _tracer is None or (_tracer.enabled and _tracer.pid != os.getpid()):
+                _tracer = tracer_from_env()
+            tracer = _tracer
+    return tracer
+
+
+def set_tracer(tracer) -> None:
+    """Sustituye el tracer del proceso (tests, benchmarks)"""
+    global _tracer
+    _tracer = tracer
+
+
+def shutdown_tracer() -> None:
+    """Exporta los spans pendientes al terminar el proceso"""
+    global _tracer
+    tracer, _tracer = _tracer, None
+    if tracer is not None and tracer.pid == os.getpid():
+        tracer.shutdown()
+
+
+def start_as_current(name: str, kind: str = INTERNAL, attributes: Optional[Dict] = None,
+                     parent=None, record_exceptions: bool = True):
+    """Atajo de get_tracer().span(...)"""
+    return get_tracer().span(name, kind, attributes, parent, record_exceptions)
+
+
+def current_span():
+    """Span activo en este contexto o None"""
+    return _current_span.get()
+
+
+class use_span:
+    """Activa un span ya creado (p. ej. capturado en otro hilo) durante el bloque"""
+
+    __slots__ = ("span", "_token")
+
+    def __init__(self, span):
+        self.span = span
+
+    def __enter__(self):
+        self._token = _current_span.set(self.span)
+        return self.span
+
+    def __exit__(self, exc_type, exc, tb):
+        _current_span.reset(self._token)
+        return False
+
+
+async def with_span(span, awaitable):
+    """
+    Espera awaitable con span como actual. Para corrutinas que se envían a otro
+    bucle (run_coroutine_threadsafe), cuya tarea no hereda el contexto del hilo llamador.
+    """
+    with use_span(span):
+        return await awaitable
+
+
+def inject(headers: Optional[Dict] = None) -> Dict:
+    """Añade traceparent del span actual a headers (y lo devuelve)"""
+    headers = {} if headers is None else headers
+    span = _current_span.get()
+    if span is not None and span.trace_id is not None:
+        headers[TRACEPARENT] = span.traceparent()
+    return headers
+
+
+def extract(headers) -> Optional[SpanContext]:
+    """SpanContext de las cabeceras de una petición entrante"""
+    return parse_traceparent(headers.get(TRACEPARENT))
+
+
+def _traced_iter(span: Span, iterator):
+    # El span se activa solo mientras se calcula cada elemento
+    count = 0
+    try:
+        while True:
+            with use_span(span):
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+            count += 1
+            yield item
+    except Exception as e:
+        span.record_exception(e)
+        raise
+    finally:
+        span.set_attribute("items", count)
+        span.end()
+
+
+async def _traced_async_iter(span: Span, iterator):
+    count = 0
+    try:
+        while True:
+            with use_span(span):
+                try:
+                    item = await iterator.__anext__()
+                except StopAsyncIteration:
+                    return
+            count += 1
+            yield item
+    except Exception as e:
+        span.record_exception(e)
+        raise
+    finally:
+        span.set_attribute("items", count)
+        span.end()
+
+
+def traced(name: Optional[str] = None):
+    """
+    Decorador: un span por llamada con el nombre dado (por defecto el __qualname__).
+    Las funciones generadoras (síncronas o asíncronas) no activan su span, porque se
+    consumen fuera del bloque que las creó (p. ej. una respuesta en streaming): el
+    span se crea al llamarlas, con el padre de ese momento, y termina al agotarse,
+    con el número de elementos producidos.
+    """
+    def decorator(func):
+        span_name = name or func.__qualname__
+
+        if inspect.isasyncgenfunction(func):
+            @wraps(func)
+            def async_gen_wrapper(*args, **kwargs):
+                tracer = get_tracer()
+                if not tracer.enabled:
+                    return func(*args, **kwargs)
+                return _traced_async_iter(tracer.start_span(span_name), func(*args, **kwargs))
+            return async_gen_wrapper
+
+        if inspect.isgeneratorfunction(func):
+            @wraps(func)
+            def gen_wrapper(*args, **kwargs):
+                tracer = get_tracer()
+                if not tracer.enabled:
+                    return func(*args, **kwargs)
+                return _traced_iter(tracer.start_span(span_name), func(*args, **kwargs))
+            return gen_wrapper
+
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with get_tracer().span(span_name):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with get_tracer().span(span_name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def bind_context(func):
+    """
+    func envuelta para ejecutarse en una copia del contexto actual, para tareas
+    enviadas a un pool de hilos. Una copia por tarea: un mismo contexto no puede
+    estar activo en dos hilos a la vez.
+    """
+    context = contextvars.copy_context()
+    return lambda *args, **kwargs: context.run(func, *args, **kwargs)
+
@@ -0,0 +1,11 @@
+"""
+Punto de entrada WSGI para producción
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+Importar este módulo no conecta a Cassandra: cada worker abre su propia sesión
+del driver en la primera petición, después del fork (ver gunicorn.conf.py).
+"""
+from app import create_app
+
+app = create_app()